@@ -157,6 +157,7 @@ public class PaymentActivity extends AppCompatActivity {
                         if (response.isSuccessful() && response.body() != null) {
                             createdOrder = response.body();
                             Log.d(TAG, "Order created: " + createdOrder.getId());
+                            BLEConnectionManager.getInstance().setOrderId(createdOrder.getId());
                             Log.d(TAG, "Status: " + createdOrder.getStatus());
                             Log.d(TAG, "Authorized minutes: " + createdOrder.getAuthorizedMinutes());
                             
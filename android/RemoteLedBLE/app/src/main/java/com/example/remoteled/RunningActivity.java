@@ -88,6 +88,10 @@ public class RunningActivity extends AppCompatActivity {
         deviceId = intent.getStringExtra("DEVICE_ID");
         deviceLabel = intent.getStringExtra("DEVICE_LABEL");
         orderId = intent.getStringExtra("ORDER_ID");
+        BLEConnectionManager.getInstance().setOrderId(orderId);
+        BLEConnectionManager.getInstance().setAuthorization(
+                intent.getStringExtra("AUTHORIZATION_PAYLOAD"),
+                intent.getStringExtra("AUTHORIZATION_SIGNATURE"));
         serviceType = intent.getStringExtra("SERVICE_TYPE");
         authorizedMinutes = intent.getIntExtra("AUTHORIZED_MINUTES", 0);
         amountCents = intent.getIntExtra("AMOUNT_CENTS", 0);
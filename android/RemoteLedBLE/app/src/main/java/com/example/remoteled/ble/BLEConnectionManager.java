@@ -6,6 +6,7 @@ import android.os.Handler;
 import android.os.Looper;
 import android.util.Log;
 
+import org.json.JSONException;
 import org.json.JSONObject;
 
 import java.util.LinkedList;
@@ -23,6 +24,8 @@ public class BLEConnectionManager {
     private BluetoothGatt bluetoothGatt;
     private BluetoothGattCharacteristic characteristic;
     private String bleKey;
+    private String orderId;
+    private JSONObject authorization;
     private boolean isConnected = false;
 
     // Write queue to handle sequential BLE operations
@@ -180,6 +183,35 @@ public class BLEConnectionManager {
         Log.d(TAG, "BLE manager reset for new connection");
     }
 
+    /**
+     * Order the following commands belong to. Sent as "orderId" with every
+     * command so the Pi can attribute its telemetry; null for none.
+     */
+    public void setOrderId(String orderId) {
+        this.orderId = orderId;
+    }
+
+    /**
+     * Signed authorization from POST /authorizations, relayed with ON so the Pi
+     * can verify it offline. payloadJson must carry the backend's values
+     * unchanged (integers stay integers) or the signature check fails.
+     */
+    public void setAuthorization(String payloadJson, String signatureHex) {
+        if (payloadJson == null || signatureHex == null) {
+            authorization = null;
+            return;
+        }
+        try {
+            JSONObject relayed = new JSONObject();
+            relayed.put("payload", new JSONObject(payloadJson));
+            relayed.put("signature_hex", signatureHex);
+            authorization = relayed;
+        } catch (JSONException e) {
+            Log.e(TAG, "Invalid authorization payload: " + e.getMessage());
+            authorization = null;
+        }
+    }
+
     // LED Control Methods
     public void sendBlinkCommand(String color) {
         // Blink for ~6 seconds (30 times * 0.2s interval)
@@ -210,6 +242,8 @@ public class BLEConnectionManager {
             writeQueue.clear();
         }
         isWriting = false;
+        orderId = null;
+        authorization = null;
         // Send reset command
         sendCommand("RESET", "all", 0, 0, 0);
     }
@@ -225,6 +259,12 @@ public class BLEConnectionManager {
             json.put("command", command);
             json.put("color", color);
             json.put("bleKey", bleKey);
+            if (orderId != null) {
+                json.put("orderId", orderId);
+            }
+            if ("ON".equals(command) && authorization != null) {
+                json.put("authorization", authorization);
+            }
             if (times > 0) {
                 json.put("times", times);
                 json.put("interval", interval);
@@ -10,6 +10,9 @@ from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.core.admin_logger import log_admin_action
 from app.core.validators import validate_uuid
+from app.core.responses import FastJSONResponse
+from app.core.password_pool import password_pool
+from app.services.order_sweeper import order_sweeper
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
@@ -182,34 +185,54 @@ def get_device_status_distribution(cursor: RealDictCursor = Depends(get_db)):
     return cursor.fetchall()
 
 
-@router.get("/devices/all")
+# Service and order counts are aggregated per device independently and then
+# joined, so the intermediate row count stays O(devices + services + orders)
+# instead of services x orders per device (device_services is unique per
+# (device_id, service_id), so COUNT(*) matches the old COUNT(DISTINCT ...)).
+ALL_DEVICES_SQL = """
+    SELECT
+        d.id,
+        d.label,
+        d.model,
+        d.location,
+        d.gpio_pin,
+        d.status,
+        d.created_at,
+        COALESCE(svc.service_count, 0) as service_count,
+        COALESCE(svc.active_service_count, 0) as active_service_count,
+        COALESCE(ord.total_orders, 0) as total_orders,
+        COALESCE(ord.completed_orders, 0) as completed_orders
+    FROM devices d
+    LEFT JOIN (
+        SELECT
+            ds.device_id,
+            COUNT(*) as service_count,
+            COUNT(*) FILTER (WHERE s.active) as active_service_count
+        FROM device_services ds
+        JOIN services s ON ds.service_id = s.id
+        GROUP BY ds.device_id
+    ) svc ON svc.device_id = d.id
+    LEFT JOIN (
+        SELECT
+            device_id,
+            COUNT(*) as total_orders,
+            COUNT(*) FILTER (WHERE status = 'DONE') as completed_orders
+        FROM orders
+        GROUP BY device_id
+    ) ord ON ord.device_id = d.id
+    ORDER BY d.created_at DESC
+"""
+
+
+@router.get("/devices/all", response_class=FastJSONResponse)
 def get_all_devices(cursor: RealDictCursor = Depends(get_db)):
     """Get all devices with service counts and order stats"""
-    cursor.execute("""
-        SELECT 
-            d.id,
-            d.label,
-            d.model,
-            d.location,
-            d.gpio_pin,
-            d.status,
-            d.created_at,
-            COUNT(DISTINCT ds.service_id) as service_count,
-            COUNT(DISTINCT CASE WHEN s.active THEN ds.service_id END) as active_service_count,
-            COUNT(DISTINCT o.id) as total_orders,
-            COUNT(DISTINCT CASE WHEN o.status = 'DONE' THEN o.id END) as completed_orders
-        FROM devices d
-        LEFT JOIN device_services ds ON d.id = ds.device_id
-        LEFT JOIN services s ON ds.service_id = s.id
-        LEFT JOIN orders o ON d.id = o.device_id
-        GROUP BY d.id, d.label, d.model, d.location, d.gpio_pin, d.status, d.created_at
-        ORDER BY d.created_at DESC
-    """)
+    cursor.execute(ALL_DEVICES_SQL)
     
-    return cursor.fetchall()
+    return FastJSONResponse(cursor.fetchall())
 
 
-@router.get("/orders/recent")
+@router.get("/orders/recent", response_class=FastJSONResponse)
 def get_recent_orders(
     limit: int = Query(50, ge=1, le=500),
     cursor: RealDictCursor = Depends(get_db)
@@ -234,7 +257,7 @@ def get_recent_orders(
         LIMIT %s
     """, (limit,))
     
-    return cursor.fetchall()
+    return FastJSONResponse(cursor.fetchall())
 
 
 @router.get("/orders/live")
@@ -356,7 +379,25 @@ def get_realtime_order_stats(cursor: RealDictCursor = Depends(get_db)):
     }
 
 
-@router.get("/services/all")
+@router.get("/orders/sweeper/stats")
+def get_order_sweeper_stats():
+    """
+    Get order expiry sweeper metrics.
+    Reports sweep durations and how many abandoned CREATED/PAID orders were failed.
+    """
+    return order_sweeper.stats()
+
+
+@router.get("/stats/password-hashing")
+def get_password_hashing_stats():
+    """
+    Get bcrypt hashing pool metrics.
+    Reports queue wait times, queue depth and rejected login/register attempts.
+    """
+    return password_pool.stats()
+
+
+@router.get("/services/all", response_class=FastJSONResponse)
 def get_all_services(cursor: RealDictCursor = Depends(get_db)):
     """Get all global services with assigned device count"""
     cursor.execute("""
@@ -377,10 +418,10 @@ def get_all_services(cursor: RealDictCursor = Depends(get_db)):
         ORDER BY s.created_at DESC
     """)
     
-    return cursor.fetchall()
+    return FastJSONResponse(cursor.fetchall())
 
 
-@router.get("/logs/recent")
+@router.get("/logs/recent", response_class=FastJSONResponse)
 def get_recent_logs(
     limit: int = Query(100, ge=1, le=500),
     error_only: bool = Query(False),
@@ -407,7 +448,7 @@ def get_recent_logs(
     
     cursor.execute(query, (limit,))
     
-    return cursor.fetchall()
+    return FastJSONResponse(cursor.fetchall())
 
 
 @router.get("/logs/admin-actions")
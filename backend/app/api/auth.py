@@ -2,12 +2,15 @@
 Authentication API endpoints
 Handles user registration, login, and profile
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from psycopg2.extras import RealDictCursor
 from pydantic import BaseModel, EmailStr
+from starlette.concurrency import run_in_threadpool
+from app.core.client_ip import get_client_ip
 from app.core.database import get_db
 from app.core.auth import hash_password, verify_password, create_access_token, get_current_user
 from app.core.admin_logger import log_admin_action
+from app.core.password_pool import password_pool
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -35,17 +38,56 @@ class UserResponse(BaseModel):
     role: str
 
 
+def _hash_limit_keys(request: Request, email: str) -> list:
+    """Per-client and per-account keys for password hashing concurrency limits"""
+    return [f"ip:{get_client_ip(request)}", f"email:{email.lower()}"]
+
+
+def _fetch_one(cursor: RealDictCursor, query: str, params: tuple):
+    """Run a query and return its first row (blocking; run in the threadpool)"""
+    cursor.execute(query, params)
+    return cursor.fetchone()
+
+
+def _create_admin(cursor: RealDictCursor, email: str, password_hash: str) -> dict:
+    """Insert the admin, commit and log the registration (blocking; run in the threadpool)"""
+    cursor.execute(
+        """
+        INSERT INTO admins (email, password_hash, role)
+        VALUES (%s, %s, 'admin')
+        RETURNING id, email, role, created_at
+        """,
+        (email, password_hash)
+    )
+    new_admin = cursor.fetchone()
+    cursor.connection.commit()
+
+    log_admin_action(
+        admin_email=new_admin['email'],
+        action='REGISTER',
+        details=f"New admin registered: {new_admin['email']}",
+        admin_id=new_admin['id']
+    )
+    return new_admin
+
+
+# register/login are async so that a request waiting for bcrypt holds no
+# threadpool thread; their psycopg2 work goes through run_in_threadpool.
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     data: RegisterRequest,
+    request: Request,
     cursor: RealDictCursor = Depends(get_db)
 ):
     """
     Register a new admin user
     """
     # Check if user already exists
-    cursor.execute("SELECT id FROM admins WHERE email = %s", (data.email,))
-    if cursor.fetchone():
+    existing = await run_in_threadpool(
+        _fetch_one, cursor, "SELECT id FROM admins WHERE email = %s", (data.email,)
+    )
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -58,28 +100,13 @@ def register(
             detail="Password must be at least 8 characters long"
         )
     
-    # Hash password and create user
-    password_hash = hash_password(data.password)
+    # Hash password (in the bounded hashing pool) and create user
+    password_hash = await password_pool.run(
+        hash_password, data.password, keys=_hash_limit_keys(request, data.email)
+    )
     
     try:
-        cursor.execute(
-            """
-            INSERT INTO admins (email, password_hash, role)
-            VALUES (%s, %s, 'admin')
-            RETURNING id, email, role, created_at
-            """,
-            (data.email, password_hash)
-        )
-        new_admin = cursor.fetchone()
-        cursor.connection.commit()
-        
-        # Log the registration
-        log_admin_action(
-            admin_email=new_admin['email'],
-            action='REGISTER',
-            details=f"New admin registered: {new_admin['email']}",
-            admin_id=new_admin['id']
-        )
+        new_admin = await run_in_threadpool(_create_admin, cursor, data.email, password_hash)
         
         # Create access token
         access_token = create_access_token(new_admin['email'], new_admin['id'])
@@ -94,7 +121,7 @@ def register(
             }
         }
     except Exception as e:
-        cursor.connection.rollback()
+        await run_in_threadpool(cursor.connection.rollback)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create user: {str(e)}"
@@ -102,8 +129,9 @@ def register(
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     data: LoginRequest,
+    request: Request,
     cursor: RealDictCursor = Depends(get_db)
 ):
     """
@@ -111,20 +139,26 @@ def login(
     Returns JWT access token
     """
     # Find user by email
-    cursor.execute(
+    admin = await run_in_threadpool(
+        _fetch_one, cursor,
         "SELECT id, email, password_hash, role FROM admins WHERE email = %s",
         (data.email,)
     )
-    admin = cursor.fetchone()
     
-    if not admin or not verify_password(data.password, admin['password_hash']):
+    password_ok = admin is not None and await password_pool.run(
+        verify_password, data.password, admin['password_hash'],
+        keys=_hash_limit_keys(request, data.email)
+    )
+    
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
     # Log the login
-    log_admin_action(
+    await run_in_threadpool(
+        log_admin_action,
         admin_email=admin['email'],
         action='LOGIN',
         details=f"Admin logged in: {admin['email']}",
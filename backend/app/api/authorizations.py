@@ -1,20 +1,77 @@
 """
 Authorization API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Response
 from psycopg2.extras import RealDictCursor
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from app.core.cache import TTLCache
+from app.core.metrics import register_cache
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.validators import validate_uuid
 from app.models.schemas import (
     AuthorizationCreateRequest, AuthorizationResponse, 
-    AuthorizationPayload, OrderStatus
+    AuthorizationPayload, AuthorizationPublicKeyResponse, OrderStatus
 )
 from app.services.crypto import crypto_service
 
 router = APIRouter(prefix="/authorizations", tags=["authorizations"])
 
+# Authorizations are immutable once created, so serialized response bodies
+# can be served from memory until the row's own expires_at.
+# Entries are keyed by ("id", authorization_id) and ("order", order_id).
+authorization_cache = TTLCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    name="authorizations"
+)
+register_cache(authorization_cache)
+
+
+def _json_response(body: bytes, status_code: int = 200) -> Response:
+    """Wrap an already-serialized AuthorizationResponse body"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def _serialize_authorization(authorization: dict) -> bytes:
+    """Validate an authorization row and cache its serialized response body"""
+    auth_response = dict(authorization)
+    auth_response['payload'] = json.loads(str(authorization['payload_json']).replace("'", '"'))
+    body = AuthorizationResponse(**auth_response).model_dump_json().encode('utf-8')
+
+    expires_at = authorization['expires_at']
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    ttl_seconds = (expires_at - datetime.now(timezone.utc)).total_seconds()
+
+    authorization_cache.set(("id", str(authorization['id']).lower()), body, ttl_seconds)
+    authorization_cache.set(("order", str(authorization['order_id']).lower()), body, ttl_seconds)
+    return body
+
+
+@router.get("/cache/stats")
+def get_authorization_cache_stats():
+    """Hit/miss statistics for the authorization lookup cache"""
+    return authorization_cache.stats()
+
+
+@router.get("/public-key", response_model=AuthorizationPublicKeyResponse)
+def get_authorization_public_key(response: Response):
+    """
+    Public key devices use to verify authorizations offline
+
+    Devices cache it and verify `signature_hex` over
+    sha256(message_prefix + "k1=v1&k2=v2..." with keys sorted).
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return AuthorizationPublicKeyResponse(
+        key_id=crypto_service.key_id,
+        public_key_pem=crypto_service.public_key_pem,
+        public_key_hex=crypto_service.public_key_hex,
+        message_prefix=crypto_service.MESSAGE_PREFIX,
+        ephemeral=crypto_service.ephemeral
+    )
+
 
 @router.post("", response_model=AuthorizationResponse, status_code=201)
 def create_authorization(
@@ -100,13 +157,10 @@ def create_authorization(
     )
     
     authorization = cursor.fetchone()
+    cursor.connection.commit()
     
-    # Parse payload_json back to dict
-    import json
-    auth_response = dict(authorization)
-    auth_response['payload'] = json.loads(str(authorization['payload_json']).replace("'", '"'))
-    
-    return auth_response
+    # Populate the lookup cache so the app's first poll never hits Postgres
+    return _json_response(_serialize_authorization(authorization), status_code=201)
 
 
 @router.get("/{authorization_id}", response_model=AuthorizationResponse)
@@ -115,6 +169,10 @@ def get_authorization(authorization_id: str, cursor: RealDictCursor = Depends(ge
     # Validate UUID format
     validate_uuid(authorization_id, "Authorization ID")
     
+    cached = authorization_cache.get(("id", authorization_id.lower()))
+    if cached is not None:
+        return _json_response(cached)
+    
     cursor.execute(
         """
         SELECT id, order_id, device_id, payload_json, signature_hex, expires_at, created_at
@@ -128,12 +186,7 @@ def get_authorization(authorization_id: str, cursor: RealDictCursor = Depends(ge
     if not authorization:
         raise HTTPException(status_code=404, detail="Authorization not found")
     
-    # Parse payload_json
-    import json
-    auth_response = dict(authorization)
-    auth_response['payload'] = json.loads(str(authorization['payload_json']).replace("'", '"'))
-    
-    return auth_response
+    return _json_response(_serialize_authorization(authorization))
 
 
 @router.get("/order/{order_id}", response_model=AuthorizationResponse)
@@ -142,6 +195,10 @@ def get_authorization_by_order(order_id: str, cursor: RealDictCursor = Depends(g
     # Validate UUID format
     validate_uuid(order_id, "Order ID")
     
+    cached = authorization_cache.get(("order", order_id.lower()))
+    if cached is not None:
+        return _json_response(cached)
+    
     cursor.execute(
         """
         SELECT id, order_id, device_id, payload_json, signature_hex, expires_at, created_at
@@ -155,10 +212,5 @@ def get_authorization_by_order(order_id: str, cursor: RealDictCursor = Depends(g
     if not authorization:
         raise HTTPException(status_code=404, detail="Authorization not found for this order")
     
-    # Parse payload_json
-    import json
-    auth_response = dict(authorization)
-    auth_response['payload'] = json.loads(str(authorization['payload_json']).replace("'", '"'))
-    
-    return auth_response
+    return _json_response(_serialize_authorization(authorization))
 
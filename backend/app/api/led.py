@@ -5,8 +5,10 @@ import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.core import led_handler
+from app.core.logger import get_logger
 
 router = APIRouter(prefix="/led", tags=["led"])
+logger = get_logger(__name__)
 
 
 class LEDControlRequest(BaseModel):
@@ -33,11 +35,11 @@ async def control_led(request: LEDControlRequest):
         color = request.color.lower()
         mode = request.mode.lower()
 
-        print(f"\n[LED Control] Request: {color.upper()} {mode.upper()}")
+        logger.info("LED control request", extra={"color": color, "mode": mode})
 
         if mode == "blink":
-            # Continuous blink with many iterations - will stop when "off" command is sent
-            success = await led_handler.trigger_led_blink(color=color, times=100, interval=0.5)
+            # Continuous blink (times=None) - runs until the next "on"/"off" command
+            success = await led_handler.trigger_led_blink(color=color, times=None, interval=0.5)
             return {"success": success, "message": f"{color} LED blinking"}
         elif mode == "on":
             success = await led_handler.trigger_led_on(color=color)
@@ -49,7 +51,7 @@ async def control_led(request: LEDControlRequest):
             raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}")
 
     except Exception as e:
-        print(f"[LED Control] Error: {e}")
+        logger.error("LED control failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
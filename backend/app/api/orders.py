@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from psycopg2.extras import RealDictCursor
 from app.core.database import get_db
 from app.core.validators import validate_uuid
+from app.core.order_transitions import transition_order_status
 from app.models.schemas import (
     OrderCreateRequest, OrderResponse, OrderStatusUpdateRequest, OrderStatus
 )
@@ -128,48 +129,23 @@ def update_order_status(
     - CREATED -> PAID (after payment)
     - PAID -> RUNNING (device activated)
     - RUNNING -> DONE (session complete)
-    - PAID/RUNNING -> FAILED (error occurred)
+    - CREATED/PAID/RUNNING -> FAILED (error occurred)
+    
+    Returns 409 if the order is no longer in a status the transition allows.
     """
     # Validate UUID format
     validate_uuid(order_id, "Order ID")
     
-    # Get current order
-    cursor.execute("SELECT status FROM orders WHERE id = %s", (order_id,))
-    order = cursor.fetchone()
+    # Compare-and-set the status in a single statement
+    result = transition_order_status(cursor, order_id, status_update.status.value)
     
-    if not order:
+    if not result.found:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    current_status = order['status']
-    new_status = status_update.status.value
-    
-    # Validate status transition
-    valid_transitions = {
-        "CREATED": ["PAID", "FAILED"],
-        "PAID": ["RUNNING", "FAILED"],
-        "RUNNING": ["DONE", "FAILED"],
-        "DONE": [],  # Terminal state
-        "FAILED": []  # Terminal state
-    }
-    
-    if new_status not in valid_transitions.get(current_status, []):
+    if result.conflict:
         raise HTTPException(
-            status_code=400,
-            detail=f"Invalid status transition from {current_status} to {new_status}"
+            status_code=409,
+            detail=f"Invalid status transition from {result.previous_status} to {result.new_status}"
         )
     
-    # Update status
-    cursor.execute(
-        """
-        UPDATE orders
-        SET status = %s, updated_at = CURRENT_TIMESTAMP
-        WHERE id = %s
-        RETURNING id, device_id, service_id, amount_cents, authorized_minutes,
-                  status, created_at, updated_at
-        """,
-        (new_status, order_id)
-    )
-    
-    updated_order = cursor.fetchone()
-    return updated_order
-
+    return result.order
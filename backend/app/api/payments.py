@@ -5,7 +5,9 @@ import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from psycopg2.extras import RealDictCursor
 from app.core.database import get_db
+from app.core.order_transitions import transition_order_status
 from app.models.schemas import (
+    OrderStatus,
     CustomerRequest, CustomerResponse,
     StripePaymentRequest, StripePaymentResponse,
     StripePaymentTriggerRequest, StripePaymentTriggerResponse,
@@ -14,9 +16,12 @@ from app.models.schemas import (
 from app.core import payment_handler
 from app.core import led_handler
 from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import STRIPE_REQUEST_DURATION, track_external_call
 import stripe
 
 router = APIRouter(prefix="/payments", tags=["payments"])
+logger = get_logger(__name__)
 
 
 # ============================================================================
@@ -34,8 +39,7 @@ async def trigger_led_background(color: str, device_id: str, mode: str = "blink"
         mode: LED mode - "blink" for processing, "on" for running, "off" for stopped
     """
     try:
-        print(f"\n[Background LED] 🔍 Starting BLE scan for device {device_id}...")
-        print(f"[Background LED] 💡 Color: {color.upper()}, Mode: {mode.upper()}")
+        logger.info("Background LED trigger", extra={"device_id": device_id, "color": color, "mode": mode})
 
         if mode == "blink":
             # Blink for payment processing
@@ -47,15 +51,15 @@ async def trigger_led_background(color: str, device_id: str, mode: str = "blink"
             # Turn OFF for device stopped
             success = await led_handler.trigger_led_off()
         else:
-            print(f"[Background LED] ⚠️  Unknown mode: {mode}")
+            logger.warning("Unknown LED mode", extra={"mode": mode})
             return
 
         if success:
-            print(f"[Background LED] ✅ LED {mode.upper()} successful!")
+            logger.info("Background LED trigger succeeded", extra={"mode": mode})
         else:
-            print(f"[Background LED] ⚠️  LED trigger failed (Pi not found or not reachable)")
+            logger.warning("Background LED trigger failed (Pi not found or not reachable)", extra={"mode": mode})
     except Exception as e:
-        print(f"[Background LED] ❌ Error triggering LED: {e}")
+        logger.error("Error triggering LED: %s", e)
 
 
 def ensure_stripe_configured():
@@ -278,12 +282,12 @@ async def create_payment_and_trigger_led(
 
     try:
         # Step 1: Create PaymentIntent
-        print(f"\n{'='*60}")
-        print(f"[Payment+LED] STARTING PAYMENT FLOW")
-        print(f"{'='*60}")
-        print(f"[Payment+LED] Step 1: Creating Stripe PaymentIntent for ${payment_req.amount_cents/100:.2f} ({payment_req.amount_cents} cents)")
-        print(f"[Payment+LED] Customer: {payment_req.customer_id or 'None (guest)'}")
-        print(f"[Payment+LED] Device: {payment_req.device_id}")
+        logger.info("Creating PaymentIntent", extra={
+            "amount_cents": payment_req.amount_cents,
+            "customer_id": payment_req.customer_id,
+            "device_id": payment_req.device_id,
+            "order_id": payment_req.order_id
+        })
 
         # Build payment intent params
         payment_params = {
@@ -306,22 +310,26 @@ async def create_payment_and_trigger_led(
         if payment_req.customer_id:
             payment_params["customer"] = payment_req.customer_id
 
-        payment_intent = stripe.PaymentIntent.create(**payment_params)
+        with track_external_call(STRIPE_REQUEST_DURATION, "payment_intent.create"):
+            payment_intent = stripe.PaymentIntent.create(**payment_params)
 
-        print(f"[Payment+LED] Step 2: PaymentIntent created successfully!")
-        print(f"[Payment+LED] Payment ID: {payment_intent.id}")
-        print(f"[Payment+LED] Status: {payment_intent.status}")
+        logger.debug("PaymentIntent created", extra={
+            "payment_intent_id": payment_intent.id,
+            "payment_status": payment_intent.status
+        })
 
         # Step 2: For testing in sandbox, auto-confirm with test payment method
         # In production, client would confirm with actual card
         if payment_intent.status == "requires_payment_method":
-            print(f"[Payment+LED] 💳 Step 3: Auto-confirming with test card 'pm_card_visa' (Stripe test mode)")
-            payment_intent = stripe.PaymentIntent.confirm(
-                payment_intent.id,
-                payment_method="pm_card_visa"
-            )
-            print(f"[Payment+LED] Step 4: Payment confirmed!")
-            print(f"[Payment+LED] Final status: {payment_intent.status}")
+            with track_external_call(STRIPE_REQUEST_DURATION, "payment_intent.confirm"):
+                payment_intent = stripe.PaymentIntent.confirm(
+                    payment_intent.id,
+                    payment_method="pm_card_visa"
+                )
+            logger.debug("PaymentIntent confirmed with test card", extra={
+                "payment_intent_id": payment_intent.id,
+                "payment_status": payment_intent.status
+            })
 
         # Step 3: Get service type to determine LED color
         led_color = "green"  # Default
@@ -342,21 +350,20 @@ async def create_payment_and_trigger_led(
             if order_service:
                 service_type = order_service['type']
                 led_color = led_handler.get_led_color_for_service_type(service_type)
-                print(f"\n[Payment+LED] 🎨 Service Type: {service_type} → LED Color: {led_color.upper()}")
+                logger.debug("LED color for service", extra={"service_type": service_type, "led_color": led_color})
             else:
-                print(f"\n[Payment+LED] ⚠️  Could not fetch service type, using default green")
+                logger.warning("Could not fetch service type, using default green", extra={"order_id": payment_req.order_id})
 
         # Step 4: Update order status BEFORE triggering LED (payment is confirmed)
         if payment_req.order_id and payment_intent.status == "succeeded":
-            cursor.execute(
-                """
-                UPDATE orders
-                SET status = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-                """,
-                ("PAID", payment_req.order_id)
-            )
-            print(f"[Payment+LED] ✓ Order {payment_req.order_id} marked as PAID")
+            result = transition_order_status(cursor, payment_req.order_id, OrderStatus.PAID.value)
+            if result.applied:
+                logger.debug("Order marked as PAID", extra={"order_id": payment_req.order_id})
+            else:
+                logger.warning("Order not marked as PAID", extra={
+                    "order_id": payment_req.order_id,
+                    "current_status": result.previous_status
+                })
 
         # Step 5: Return response immediately (don't wait for LED)
         response = StripePaymentTriggerResponse(
@@ -371,28 +378,24 @@ async def create_payment_and_trigger_led(
         )
 
         # LED control is now handled by the app directly via /led/control endpoint
-        print(f"[Payment+LED] ✅ Payment response returned (LED controlled by app)")
-        print(f"{'='*60}\n")
+        logger.info("Payment completed", extra={
+            "payment_intent_id": payment_intent.id,
+            "payment_status": payment_intent.status,
+            "device_id": payment_req.device_id
+        })
 
         return response
 
     except stripe.StripeError as e:
-        print(f"[Payment+LED] Stripe error: {e}")
+        logger.warning("Stripe error: %s", e, extra={"order_id": payment_req.order_id})
 
         # Update order status to FAILED
         if payment_req.order_id:
-            cursor.execute(
-                """
-                UPDATE orders
-                SET status = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-                """,
-                ("FAILED", payment_req.order_id)
-            )
+            transition_order_status(cursor, payment_req.order_id, OrderStatus.FAILED.value)
 
         # LED control is now handled by the app
         raise HTTPException(status_code=400, detail=f"Stripe error: {str(e)}")
 
     except Exception as e:
-        print(f"[Payment+LED] Unexpected error: {e}")
+        logger.exception("Unexpected payment error")
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
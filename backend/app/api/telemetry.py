@@ -1,14 +1,44 @@
 """
 Telemetry/Logging API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+import zlib
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from psycopg2.extras import RealDictCursor
+from pydantic import ValidationError
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.validators import validate_uuid
-from app.models.schemas import TelemetryRequest, LogResponse, OrderStatus
+from app.core.order_transitions import transition_order_status
+from app.models.schemas import (
+    TelemetryRequest, TelemetryBatchRequest, TelemetryBatchResponse, TelemetryEvent, LogResponse, OrderStatus
+)
 from app.services.crypto import crypto_service
+from app.core.logger import get_logger
 
 router = APIRouter(prefix="/devices", tags=["telemetry"])
+logger = get_logger(__name__)
+
+# Order status each telemetry event moves the order to
+EVENT_ORDER_STATUS = {
+    TelemetryEvent.STARTED: OrderStatus.RUNNING.value,
+    TelemetryEvent.DONE: OrderStatus.DONE.value,
+    TelemetryEvent.ERROR: OrderStatus.FAILED.value,
+}
+
+# One round-trip for the whole batch; retried events hit the
+# (device_id, client_event_id) unique index and are skipped
+BATCH_INSERT_SQL = """
+    INSERT INTO logs (device_id, direction, payload_hash, ok, details, client_event_id, occurred_at)
+    SELECT %(device_id)s::uuid, 'PI_TO_SRV'::log_direction,
+           e.payload_hash, e.ok, e.details, e.client_event_id, e.occurred_at
+    FROM unnest(
+        %(client_event_ids)s::varchar[], %(payload_hashes)s::varchar[], %(oks)s::boolean[],
+        %(details)s::text[], %(occurred_at)s::timestamptz[]
+    ) AS e(client_event_id, payload_hash, ok, details, occurred_at)
+    ON CONFLICT (device_id, client_event_id) WHERE client_event_id IS NOT NULL DO NOTHING
+    RETURNING client_event_id
+"""
 
 
 @router.post("/{device_id}/telemetry", response_model=dict, status_code=201)
@@ -38,7 +68,7 @@ def create_telemetry_log(
         raise HTTPException(status_code=404, detail="Device not found")
     
     # Determine if event was successful
-    ok = telemetry.event in ["STARTED", "DONE"]
+    ok = telemetry.event != TelemetryEvent.ERROR
     
     # Create hash if not provided
     payload_hash = telemetry.payload_hash
@@ -58,44 +88,167 @@ def create_telemetry_log(
     
     log = cursor.fetchone()
     
-    # Update order status based on event and trigger LED
+    # Update order status based on event
+    order_status_updated = False
     if telemetry.order_id:
-        new_status = None
-
-        if telemetry.event == "STARTED":
-            new_status = OrderStatus.RUNNING.value
-        elif telemetry.event == "DONE":
-            new_status = OrderStatus.DONE.value
-        elif telemetry.event == "ERROR":
-            new_status = OrderStatus.FAILED.value
+        new_status = EVENT_ORDER_STATUS.get(telemetry.event)
 
         if new_status:
-            cursor.execute(
-                """
-                UPDATE orders
-                SET status = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s AND device_id = %s
-                """,
-                (new_status, telemetry.order_id, device_id)
+            result = transition_order_status(
+                cursor, telemetry.order_id, new_status, device_id=device_id
             )
+            order_status_updated = result.applied
 
             # COMMIT THE TRANSACTION
             cursor.connection.commit()
 
             # LED control is handled by Android app via BLE
             # Backend just logs the status change
-            if telemetry.event == "STARTED":
-                print(f"[Telemetry] Device STARTED → Status updated to {new_status} (LED controlled by app)")
-            elif telemetry.event == "DONE":
-                print(f"[Telemetry] Device DONE → Status updated to {new_status} (LED controlled by app)")
+            if result.applied:
+                logger.info("Order status updated from telemetry", extra={
+                    "device_id": device_id,
+                    "order_id": telemetry.order_id,
+                    "event": telemetry.event.value,
+                    "new_status": new_status
+                })
+            elif result.conflict:
+                logger.warning("Telemetry event ignored for order status", extra={
+                    "device_id": device_id,
+                    "order_id": telemetry.order_id,
+                    "event": telemetry.event.value,
+                    "current_status": result.previous_status,
+                    "new_status": new_status
+                })
 
     return {
         "success": True,
         "log_id": log['id'],
+        "order_status_updated": order_status_updated,
         "message": f"Telemetry event {telemetry.event} logged successfully"
     }
 
 
+async def read_telemetry_batch(request: Request) -> TelemetryBatchRequest:
+    """Parse a batch body, gzip-compressed or not, within the configured size limits"""
+    limit = settings.TELEMETRY_BATCH_MAX_BYTES
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail="Telemetry batch too large")
+
+    body = await request.body()
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        try:
+            body = decompressor.decompress(body, limit + 1)
+        except zlib.error:
+            raise HTTPException(status_code=400, detail="Invalid gzip body")
+        if decompressor.unconsumed_tail:
+            raise HTTPException(status_code=413, detail="Telemetry batch too large")
+    elif encoding != "identity":
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+    if len(body) > limit:
+        raise HTTPException(status_code=413, detail="Telemetry batch too large")
+
+    try:
+        batch = TelemetryBatchRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    if len(batch.events) > settings.TELEMETRY_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.TELEMETRY_BATCH_MAX_EVENTS} events per batch"
+        )
+    return batch
+
+
+@router.post("/{device_id}/telemetry/batch", response_model=TelemetryBatchResponse)
+def create_telemetry_batch(
+    device_id: str,
+    batch: TelemetryBatchRequest = Depends(read_telemetry_batch),
+    cursor: RealDictCursor = Depends(get_db)
+):
+    """
+    Store a batch of events uploaded by the device itself (store-and-forward)
+
+    The body is `{"events": [...]}` and may be gzip-compressed
+    (`Content-Encoding: gzip`). Each event carries a `client_event_id`;
+    re-sent events are acknowledged without being stored twice, so the device
+    can retry a batch until it receives the response. STARTED/DONE/ERROR events
+    with an order_id update the order status like the single-event endpoint.
+
+    Every id in `acked` may be removed from the device journal.
+    """
+    validate_uuid(device_id, "Device ID")
+
+    cursor.execute("SELECT id FROM devices WHERE id = %s", (device_id,))
+    if not cursor.fetchone():
+        raise HTTPException(status_code=404, detail="Device not found")
+
+    events, rejected, acked = [], [], []
+    seen = set()
+    for event in batch.events:
+        if event.client_event_id in seen:
+            continue
+        seen.add(event.client_event_id)
+        acked.append(event.client_event_id)
+        if event.order_id:
+            try:
+                validate_uuid(event.order_id, "Order ID")
+            except HTTPException:
+                rejected.append(event.client_event_id)
+                continue
+        events.append(event)
+
+    stored = set()
+    if events:
+        cursor.execute(BATCH_INSERT_SQL, {
+            "device_id": device_id,
+            "client_event_ids": [e.client_event_id for e in events],
+            "payload_hashes": [e.payload_hash for e in events],
+            "oks": [e.event != TelemetryEvent.ERROR for e in events],
+            "details": [e.details or f"{e.event.value} event received" for e in events],
+            "occurred_at": [e.occurred_at for e in events],
+        })
+        stored = {row["client_event_id"] for row in cursor.fetchall()}
+
+    # Apply order transitions in device order, only for events stored just now
+    order_status_updates = 0
+    for event in events:
+        new_status = EVENT_ORDER_STATUS.get(event.event)
+        if not event.order_id or not new_status or event.client_event_id not in stored:
+            continue
+        result = transition_order_status(cursor, event.order_id, new_status, device_id=device_id)
+        if result.applied:
+            order_status_updates += 1
+        elif result.conflict:
+            logger.warning("Telemetry event ignored for order status", extra={
+                "device_id": device_id,
+                "order_id": event.order_id,
+                "event": event.event.value,
+                "current_status": result.previous_status,
+                "new_status": new_status
+            })
+
+    cursor.connection.commit()
+
+    logger.info("Telemetry batch stored", extra={
+        "device_id": device_id,
+        "accepted": len(stored),
+        "duplicates": len(events) - len(stored),
+        "rejected": len(rejected),
+        "order_status_updates": order_status_updates
+    })
+
+    return TelemetryBatchResponse(
+        accepted=len(stored),
+        duplicates=len(events) - len(stored),
+        rejected=rejected,
+        acked=acked,
+        order_status_updates=order_status_updates
+    )
+
+
 @router.get("/{device_id}/logs", response_model=list)
 def get_device_logs(
     device_id: str,
@@ -2,14 +2,19 @@
 Authentication utilities for JWT tokens and password hashing
 Simple PostgreSQL-based authentication (no Firebase)
 """
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 import bcrypt
-from psycopg2.extras import RealDictCursor
-from app.core.database import get_db
+from app.core.cache import TTLCache
+from app.core.metrics import register_cache
+from app.core.config import settings
+from app.core.database import db
 
 # Security configuration
 SECRET_KEY = "remoteled-secret-key-2024-change-in-production"
@@ -19,6 +24,16 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days for demo
 # HTTP Bearer token scheme
 security = HTTPBearer(auto_error=False)  # Don't auto-error, we'll handle it
 
+# Verified token claims, keyed by SHA-256 of the raw token. A token's signature
+# never changes, so entries live until its exp (capped by the TTL setting).
+_token_cache = TTLCache(max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES, name="auth_tokens")
+
+# Admin rows keyed by admin id. The short TTL bounds how long a deleted or
+# changed admin keeps access; invalidate_admin_cache() drops entries immediately.
+_admin_cache = TTLCache(max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES, name="auth_admins")
+register_cache(_token_cache)
+register_cache(_admin_cache)
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
@@ -56,12 +71,86 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def _token_claims(token: str) -> Optional[tuple]:
+    """Return (admin_id, email) for a valid token, verifying the JWT at most once per TTL"""
+    token_key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    claims = _token_cache.get(token_key)
+    if claims is not None:
+        return claims
+
+    payload = verify_token(token)
+    if not payload:
+        return None
+
+    email: str = payload.get("sub")
+    admin_id: str = payload.get("id")
+
+    if email is None or admin_id is None:
+        return None
+
+    claims = (admin_id, email)
+    ttl_seconds = settings.AUTH_TOKEN_CACHE_TTL_SECONDS
+    if payload.get("exp"):
+        ttl_seconds = min(ttl_seconds, payload["exp"] - time.time())
+    _token_cache.set(token_key, claims, ttl_seconds)
+    return claims
+
+
+def _fetch_admin(admin_id: str) -> Optional[dict]:
+    """Load an admin row and cache it (blocking; run in the threadpool)"""
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            "SELECT id, email, role FROM admins WHERE id = %s",
+            (admin_id,)
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+
+    user = dict(row)
+    _admin_cache.set(admin_id, user, settings.AUTH_ADMIN_CACHE_TTL_SECONDS)
+    return user
+
+
+async def _lookup_admin(admin_id: str, email: str) -> Optional[dict]:
+    """Return the admin row for a token's claims, using the short-lived admin cache"""
+    user = _admin_cache.get(admin_id)
+    if user is None:
+        # Cache miss: the psycopg2 query must not block the event loop
+        user = await run_in_threadpool(_fetch_admin, admin_id)
+        if user is None:
+            return None
+
+    if user['email'] != email:
+        return None
+
+    return dict(user)
+
+
+def invalidate_admin_cache(admin_id: Optional[str] = None) -> None:
+    """Drop cached admin rows (all of them when admin_id is None)"""
+    if admin_id is None:
+        _admin_cache.clear()
+    else:
+        _admin_cache.delete(str(admin_id))
+
+
+def auth_cache_stats() -> dict:
+    """Hit/miss statistics for the token and admin caches"""
+    return {
+        "tokens": _token_cache.stats(),
+        "admins": _admin_cache.stats()
+    }
+
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    cursor: RealDictCursor = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
     """
     Get the current authenticated user from JWT token.
+    Token verification and the admin lookup are cached, so a warm request
+    costs a hash and two dictionary lookups.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,35 +161,21 @@ async def get_current_user(
     if not credentials:
         raise credentials_exception
     
-    token = credentials.credentials
-    
-    # Verify JWT token
-    payload = verify_token(token)
-    if not payload:
+    claims = _token_claims(credentials.credentials)
+    if claims is None:
         raise credentials_exception
     
-    email: str = payload.get("sub")
-    admin_id: str = payload.get("id")
-    
-    if email is None or admin_id is None:
-        raise credentials_exception
-    
-    # Verify user exists in database
-    cursor.execute(
-        "SELECT id, email, role FROM admins WHERE id = %s AND email = %s",
-        (admin_id, email)
-    )
-    user = cursor.fetchone()
+    # Verify user exists in database (cached for AUTH_ADMIN_CACHE_TTL_SECONDS)
+    user = await _lookup_admin(*claims)
     
     if user is None:
         raise credentials_exception
     
-    return dict(user)
+    return user
 
 
 async def get_current_user_optional(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    cursor: RealDictCursor = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Optional[dict]:
     """
     Get the current user if authenticated, or None if not.
@@ -109,22 +184,8 @@ async def get_current_user_optional(
     if not credentials:
         return None
     
-    token = credentials.credentials
-    payload = verify_token(token)
-    
-    if not payload:
+    claims = _token_claims(credentials.credentials)
+    if claims is None:
         return None
     
-    email: str = payload.get("sub")
-    admin_id: str = payload.get("id")
-    
-    if email is None or admin_id is None:
-        return None
-    
-    cursor.execute(
-        "SELECT id, email, role FROM admins WHERE id = %s AND email = %s",
-        (admin_id, email)
-    )
-    user = cursor.fetchone()
-    
-    return dict(user) if user else None
+    return await _lookup_admin(*claims)
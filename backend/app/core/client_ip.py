@@ -0,0 +1,63 @@
+"""
+Client address of a request, seen through trusted reverse proxies
+The admin console reaches the API through nginx, so request.client is the
+proxy; its X-Forwarded-For / X-Real-IP headers are only believed when the
+direct peer is listed in TRUSTED_PROXY_IPS.
+"""
+import ipaddress
+from functools import lru_cache
+from typing import Optional, Tuple
+from fastapi import Request
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(value: str) -> Tuple:
+    networks = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid TRUSTED_PROXY_IPS entry: {entry}")
+    return tuple(networks)
+
+
+def _is_trusted(host: Optional[str]) -> bool:
+    if not host:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_networks(settings.TRUSTED_PROXY_IPS))
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Address of the client that sent the request.
+
+    X-Forwarded-For is read right to left and the first hop that is not a
+    trusted proxy wins, so entries a client put in the header itself are
+    ignored. Falls back to X-Real-IP, then to the direct peer.
+    """
+    peer = request.client.host if request.client else None
+    if not _is_trusted(peer):
+        return peer or "unknown"
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop):
+                return hop
+        if hops:
+            return hops[0]
+
+    real_ip = request.headers.get("x-real-ip", "").strip()
+    return real_ip or peer
@@ -0,0 +1,205 @@
+"""
+Response compression
+ASGI middleware negotiating brotli/gzip for large responses; big bodies are
+compressed on a worker thread and streamed responses chunk by chunk
+"""
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+
+# Content types worth compressing (JSON, text, JS, XML, SVG)
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}, dropping q=0 entries"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            codings[coding] = q
+    return codings
+
+
+def choose_encoding(header: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (br wins ties)"""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates: List[Tuple[float, int, str]] = []
+    if brotli_available:
+        candidates.append((codings.get("br", wildcard), 1, "br"))
+    candidates.append((codings.get("gzip", wildcard), 0, "gzip"))
+    q, _, coding = max(candidates)
+    return coding if q > 0 else None
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+class _StreamCompressor:
+    """Incremental compressor with the same interface for gzip and brotli"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._compressor.process
+            self._finish = self._compressor.finish
+        else:
+            # wbits=31 -> gzip container
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._finish = self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses the client accepts as br or gzip.
+
+    - Bodies under minimum_size, non-text content types and responses that
+      already carry a Content-Encoding are passed through untouched
+    - Single-chunk bodies of offload_size bytes or more are compressed on a
+      worker thread so the event loop keeps serving other requests
+    - Streamed responses (more_body=True) are compressed incrementally and
+      sent without Content-Length
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        """Compress a complete body in one call"""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def compress_offloaded(self, func, data: bytes) -> bytes:
+        """Run func(data) on a worker thread when data is large, inline otherwise"""
+        if len(data) >= self.offload_size:
+            return await anyio.to_thread.run_sync(func, data)
+        return func(data)
+
+
+class _CompressionResponder:
+    """Per-request send() wrapper holding the start message until the body is seen"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start_message = None
+        self._passthrough = False
+        self._stream: Optional[_StreamCompressor] = None
+
+    async def send(self, message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self._start_message = message
+            headers = Headers(raw=message["headers"])
+            self._passthrough = "content-encoding" in headers or not _is_compressible(headers)
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._passthrough:
+            if self._start_message is not None:
+                await self._send(self._start_message)
+                self._start_message = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._stream is None and self._start_message is not None:
+            if not more_body:
+                await self._send_whole(body)
+                return
+            self._begin_stream()
+            await self._send(self._start_message)
+            self._start_message = None
+
+        chunk = await self.middleware.compress_offloaded(self._stream.compress, body) if body else b""
+        if not more_body:
+            chunk += self._stream.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = MutableHeaders(raw=self._start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if len(body) < self.middleware.minimum_size:
+            await self._send(self._start_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        compressed = await self.middleware.compress_offloaded(
+            lambda data: self.middleware.compress(self.encoding, data), body
+        )
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self._start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _begin_stream(self) -> None:
+        headers = MutableHeaders(raw=self._start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        headers["Content-Encoding"] = self.encoding
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self._stream = _StreamCompressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
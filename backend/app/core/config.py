@@ -37,6 +37,54 @@ class Settings(BaseSettings):
 
     # Authorization
     AUTH_EXPIRY_MINUTES: int = 5
+    # secp256k1 signing key (PEM or 64-char hex). Devices cache the public key from
+    # GET /authorizations/public-key, so it must survive restarts; empty = ephemeral key
+    AUTH_SIGNING_KEY: str = ""
+    AUTH_SIGNING_KEY_FILE: str = ""  # Path to a PEM/hex key file, used when AUTH_SIGNING_KEY is empty
+    AUTH_CACHE_MAX_ENTRIES: int = 2048  # Serialized authorization bodies kept in memory
+
+    # Admin JWT verification caches
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 4096
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300  # Verified token claims (never beyond token exp)
+    AUTH_ADMIN_CACHE_TTL_SECONDS: int = 30  # How long a deleted/changed admin may stay authorized
+
+    # bcrypt hashing pool (login/register)
+    PASSWORD_HASH_WORKERS: int = 2  # Concurrent bcrypt calls
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Waiting calls before 503
+    PASSWORD_HASH_PER_KEY_LIMIT: int = 2  # Concurrent calls per client IP / email before 429
+    # Reverse proxies (IPs or CIDRs, comma-separated) whose X-Forwarded-For / X-Real-IP
+    # give the client address, e.g. the admin console's nginx container
+    TRUSTED_PROXY_IPS: str = "127.0.0.1,::1"
+
+    # Order expiry sweeper (abandoned CREATED/PAID orders -> FAILED)
+    ORDER_SWEEP_ENABLED: bool = True
+    ORDER_SWEEP_INTERVAL_SECONDS: int = 60
+    ORDER_SWEEP_BATCH_SIZE: int = 500
+    ORDER_SWEEP_MAX_BATCHES: int = 20  # Upper bound on batches per status per sweep
+    ORDER_TIMEOUT_CREATED_MINUTES: int = 30  # 0 disables sweeping CREATED orders
+    ORDER_TIMEOUT_PAID_MINUTES: int = 60  # 0 disables sweeping PAID orders
+
+    # Batched device telemetry (POST /devices/{id}/telemetry/batch, gzip bodies allowed)
+    TELEMETRY_BATCH_MAX_EVENTS: int = 500
+    TELEMETRY_BATCH_MAX_BYTES: int = 1048576  # Limit on the (decompressed) request body
+
+    # Health checks (background dependency probes behind /health/ready)
+    HEALTH_CHECK_INTERVAL_SECONDS: int = 10
+    HEALTH_CHECK_TIMEOUT_SECONDS: int = 3  # Per-check connect timeout
+
+    # Logging
+    LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR
+    LOG_FORMAT: str = "text"  # "json" for one JSON object per line
+
+    # Response compression (br when the brotli package is installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Smaller bodies are sent as-is
+    COMPRESSION_OFFLOAD_SIZE: int = 65536  # Compress bodies this large on a worker thread
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Metrics (/metrics, Prometheus text format)
+    METRICS_ENABLED: bool = True  # Per-route request counts and latency histograms
 
     # Mock Payment
     ENABLE_MOCK_PAYMENT: bool = True
@@ -44,6 +92,7 @@ class Settings(BaseSettings):
     # Stripe Configuration
     STRIPE_SECRET_KEY: str = ""  # Must be set to your Stripe secret key (sk_test...)
     STRIPE_PUBLISHABLE_KEY: str = ""  # Optional publishable key (pk_test...) for clients
+    STRIPE_API_BASE: str = ""  # Override the Stripe API URL (e.g. the load-test stand-in); empty = api.stripe.com
 
     # LED GPIO Configuration (BCM numbering)
     # Unified pin mapping for all LED control implementations
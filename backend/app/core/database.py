@@ -1,11 +1,38 @@
 """
 Database connection and session management
 """
+import time
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 from app.core.config import settings
+from app.core.metrics import DB_CONNECT_DURATION, DB_QUERY_DURATION
+
+
+# Statement kinds used as the db_query_duration_seconds label
+_QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _query_operation(query) -> str:
+    """Return the leading SQL keyword of a statement (bounded label values)"""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "ignore")
+    if not isinstance(query, str):
+        return "OTHER"
+    keyword = query.lstrip()[:7].split(None, 1)[0].upper() if query.strip() else ""
+    return keyword if keyword in _QUERY_OPERATIONS else "OTHER"
+
+
+class TimedCursor(RealDictCursor):
+    """RealDictCursor that records statement execution time"""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, operation=_query_operation(query))
 
 
 class Database:
@@ -15,14 +42,17 @@ class Database:
         self.connection_string = settings.DATABASE_URL
     
     @contextmanager
-    def get_connection(self) -> Generator:
+    def get_connection(self, connect_timeout: Optional[int] = None) -> Generator:
         """Get a database connection with automatic cleanup"""
         conn = None
+        options = {"connect_timeout": connect_timeout} if connect_timeout else {}
         try:
-            conn = psycopg2.connect(
-                self.connection_string,
-                cursor_factory=RealDictCursor
-            )
+            with DB_CONNECT_DURATION.time():
+                conn = psycopg2.connect(
+                    self.connection_string,
+                    cursor_factory=TimedCursor,
+                    **options
+                )
             yield conn
             conn.commit()
         except Exception as e:
@@ -34,9 +64,9 @@ class Database:
                 conn.close()
     
     @contextmanager
-    def get_cursor(self) -> Generator:
+    def get_cursor(self, connect_timeout: Optional[int] = None) -> Generator:
         """Get a database cursor with automatic cleanup"""
-        with self.get_connection() as conn:
+        with self.get_connection(connect_timeout) as conn:
             cursor = conn.cursor()
             try:
                 yield cursor
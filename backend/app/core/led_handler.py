@@ -3,10 +3,16 @@ LED Handler - BLE communication for controlling Pi LEDs
 """
 import asyncio
 import json
+import logging
+from typing import Optional
 from bleak import BleakClient, BleakScanner
 from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import BLE_OPERATION_DURATION, track_external_call
 
 
+logger = get_logger(__name__)
+
 # Cache Pi address after first successful connection
 _cached_pi_address = None
 
@@ -17,50 +23,67 @@ async def find_pi_device(force_scan=False):
 
     # Use cached address if available (unless force scan)
     if _cached_pi_address and not force_scan:
-        print(f"[BLE] ✓ Using cached Pi address: {_cached_pi_address}")
+        logger.debug("Using cached Pi address", extra={"address": _cached_pi_address})
         return _cached_pi_address
 
-    print(f"[BLE] 🔍 Starting BLE scan for device with service UUID: {settings.BLE_SERVICE_UUID}")
-    print(f"[BLE] 🔍 Scan timeout: 10 seconds...")
-    devices = await BleakScanner.discover(timeout=10.0, return_adv=True)
+    logger.info("Starting BLE scan", extra={"service_uuid": settings.BLE_SERVICE_UUID, "timeout_s": 10})
+    with track_external_call(BLE_OPERATION_DURATION, "scan"):
+        devices = await BleakScanner.discover(timeout=10.0, return_adv=True)
 
-    print(f"[BLE] 📡 Found {len(devices)} BLE devices total, checking for our service...")
+    logger.debug("BLE scan finished", extra={"devices": len(devices)})
 
     # Try connecting to each device to check if it has our service
     for address, (device, adv_data) in devices.items():
         # Check if our service UUID is advertised
         if settings.BLE_SERVICE_UUID.lower() in [str(uuid).lower() for uuid in adv_data.service_uuids]:
-            print(f"[BLE] ✓ Found Pi at {address} (advertised service matches)")
+            logger.info("Found Pi (advertised service)", extra={"address": address})
             _cached_pi_address = address  # Cache it
             return address
 
     # Fallback: try devices with no name (Pi might be one of them)
-    print(f"[BLE] ⚠️  Service not advertised, trying unnamed devices...")
+    logger.warning("Service not advertised, probing unnamed devices")
     for address, (device, adv_data) in devices.items():
         if device.name is None or device.name == "":
-            print(f"[BLE] 🔍 Trying unnamed device: {address}")
+            logger.debug("Probing unnamed device", extra={"address": address})
             try:
                 async with BleakClient(address, timeout=5.0) as client:
                     services = await client.get_services()
                     for service in services:
                         if service.uuid.lower() == settings.BLE_SERVICE_UUID.lower():
-                            print(f"[BLE] ✓ Found Pi at {address} (service discovered after connect)")
+                            logger.info("Found Pi (service discovered after connect)", extra={"address": address})
                             _cached_pi_address = address  # Cache it
                             return address
             except Exception as e:
                 continue
 
-    print(f"[BLE] ❌ Pi not found in scan results (no matching device)")
+    logger.warning("Pi not found in scan results")
     return None
 
 
-async def trigger_led_blink(color: str, times: int = 5, interval: float = 0.5):
+async def _send_command(device_address: str, payload: dict) -> None:
+    """Connect to the Pi and write one JSON command, timing connect and write"""
+    client = BleakClient(device_address, timeout=10.0)
+    with track_external_call(BLE_OPERATION_DURATION, "connect"):
+        await client.connect()
+    try:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending BLE command", extra={
+                "command": payload["command"],
+                "payload": {k: v for k, v in payload.items() if k != "bleKey"}
+            })
+        with track_external_call(BLE_OPERATION_DURATION, "write"):
+            await client.write_gatt_char(settings.BLE_CHAR_UUID, json.dumps(payload).encode('utf-8'))
+    finally:
+        await client.disconnect()
+
+
+async def trigger_led_blink(color: str, times: Optional[int] = 5, interval: float = 0.5):
     """
     Send BLE command to Pi to BLINK LED (for processing state)
 
     Args:
         color: LED color (green, red, yellow)
-        times: Number of blinks
+        times: Number of blinks, None to blink until the next command
         interval: Time between blinks in seconds
 
     Returns:
@@ -68,37 +91,29 @@ async def trigger_led_blink(color: str, times: int = 5, interval: float = 0.5):
     """
     global _cached_pi_address
 
-    print(f"\n{'='*60}")
-    print(f"[BLE] ⚡ BLINKING LED: color={color.upper()}, times={times}, interval={interval}s")
-    print(f"{'='*60}")
+    logger.info("LED blink requested", extra={"color": color, "times": times, "interval": interval})
 
     try:
         # Try to find device (uses cache if available)
-        print("[BLE] 🔍 Looking for Pi device...")
         device_address = await find_pi_device()
         if not device_address:
-            print("[BLE] ❌ Pi not found!")
+            logger.warning("Pi not found, LED command not sent")
             return False
 
-        print(f"[BLE] ✓ Found Pi at {device_address}")
-        print(f"[BLE] 🔌 Connecting to Pi...")
-
-        async with BleakClient(device_address, timeout=10.0) as client:
-            # Send BLINK command
-            payload = {
-                "command": "BLINK",
-                "color": color.lower(),
-                "times": times,
-                "interval": interval,
-                "bleKey": settings.BLE_KEY
-            }
-            print(f"[BLE] 📤 Sending BLINK command: {payload}")
-            await client.write_gatt_char(settings.BLE_CHAR_UUID, json.dumps(payload).encode('utf-8'))
-            print(f"[BLE] ✅ {color.upper()} LED BLINKING (processing)")
-            return True
+        # Send BLINK command
+        payload = {
+            "command": "BLINK",
+            "color": color.lower(),
+            "times": times,
+            "interval": interval,
+            "bleKey": settings.BLE_KEY
+        }
+        await _send_command(device_address, payload)
+        logger.info("LED blinking", extra={"color": color, "address": device_address})
+        return True
 
     except Exception as e:
-        print(f"[BLE] ❌ ERROR: {e}")
+        logger.error("BLE command failed: %s", e)
         if _cached_pi_address:
             _cached_pi_address = None
         return False
@@ -116,34 +131,26 @@ async def trigger_led_on(color: str):
     """
     global _cached_pi_address
 
-    print(f"\n{'='*60}")
-    print(f"[BLE] 💡 LED SOLID ON: color={color.upper()}")
-    print(f"{'='*60}")
+    logger.info("LED on requested", extra={"color": color})
 
     try:
-        print("[BLE] 🔍 Looking for Pi device...")
         device_address = await find_pi_device()
         if not device_address:
-            print("[BLE] ❌ Pi not found!")
+            logger.warning("Pi not found, LED command not sent")
             return False
 
-        print(f"[BLE] ✓ Found Pi at {device_address}")
-        print(f"[BLE] 🔌 Connecting to Pi...")
-
-        async with BleakClient(device_address, timeout=10.0) as client:
-            # Send ON command
-            payload = {
-                "command": "ON",
-                "color": color.lower(),
-                "bleKey": settings.BLE_KEY
-            }
-            print(f"[BLE] 📤 Sending ON command: {payload}")
-            await client.write_gatt_char(settings.BLE_CHAR_UUID, json.dumps(payload).encode('utf-8'))
-            print(f"[BLE] ✅ {color.upper()} LED SOLID ON (device running)")
-            return True
+        # Send ON command
+        payload = {
+            "command": "ON",
+            "color": color.lower(),
+            "bleKey": settings.BLE_KEY
+        }
+        await _send_command(device_address, payload)
+        logger.info("LED on", extra={"color": color, "address": device_address})
+        return True
 
     except Exception as e:
-        print(f"[BLE] ❌ ERROR: {e}")
+        logger.error("BLE command failed: %s", e)
         if _cached_pi_address:
             _cached_pi_address = None
         return False
@@ -158,33 +165,25 @@ async def trigger_led_off():
     """
     global _cached_pi_address
 
-    print(f"\n{'='*60}")
-    print(f"[BLE] 🔴 LED OFF (device stopped)")
-    print(f"{'='*60}")
+    logger.info("LED off requested")
 
     try:
-        print("[BLE] 🔍 Looking for Pi device...")
         device_address = await find_pi_device()
         if not device_address:
-            print("[BLE] ❌ Pi not found!")
+            logger.warning("Pi not found, LED command not sent")
             return False
 
-        print(f"[BLE] ✓ Found Pi at {device_address}")
-        print(f"[BLE] 🔌 Connecting to Pi...")
-
-        async with BleakClient(device_address, timeout=10.0) as client:
-            # Send OFF command
-            payload = {
-                "command": "OFF",
-                "bleKey": settings.BLE_KEY
-            }
-            print(f"[BLE] 📤 Sending OFF command: {payload}")
-            await client.write_gatt_char(settings.BLE_CHAR_UUID, json.dumps(payload).encode('utf-8'))
-            print(f"[BLE] ✅ All LEDs turned OFF")
-            return True
+        # Send OFF command
+        payload = {
+            "command": "OFF",
+            "bleKey": settings.BLE_KEY
+        }
+        await _send_command(device_address, payload)
+        logger.info("LEDs off", extra={"address": device_address})
+        return True
 
     except Exception as e:
-        print(f"[BLE] ❌ ERROR: {e}")
+        logger.error("BLE command failed: %s", e)
         if _cached_pi_address:
             _cached_pi_address = None
         return False
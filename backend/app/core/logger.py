@@ -0,0 +1,118 @@
+"""
+Structured logging
+Levels, JSON or text output, and a queue handler so log calls on request
+paths never block on stdout
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg plus any `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable line with `extra=` fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [
+            f"{key}={value}" for key, value in record.__dict__.items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        ]
+        if fields:
+            head, sep, tail = line.partition("\n")
+            line = f"{head} {' '.join(fields)}{sep}{tail}"
+        return line
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback separate from the message"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = "INFO", fmt: str = "text", logger_name: str = "app") -> logging.Logger:
+    """
+    Route `logger_name` (and its children) through a background queue listener.
+
+    Args:
+        level: Minimum level (DEBUG, INFO, WARNING, ERROR)
+        fmt: "json" for one JSON object per line, anything else for text
+        logger_name: Logger namespace to configure
+
+    Returns:
+        logging.Logger: The configured logger (safe to call more than once)
+    """
+    global _listener
+
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+    if _listener is not None:
+        _listener.handlers[0].setFormatter(JSONFormatter() if fmt.lower() == "json" else TextFormatter())
+        return logger
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JSONFormatter() if fmt.lower() == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.handlers = [_NonBlockingQueueHandler(log_queue)]
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a module logger (use __name__ so it falls under the app namespace)"""
+    return logging.getLogger(name)
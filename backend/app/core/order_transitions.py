@@ -0,0 +1,117 @@
+"""
+Order status transitions
+Compare-and-set primitive used by every per-order writer of orders.status.
+The order sweeper fails stale orders in bulk with its own statement, but
+applies the same VALID_TRANSITIONS rule through allowed_previous_statuses.
+"""
+from typing import Dict, List, NamedTuple, Optional
+from psycopg2.extras import RealDictCursor
+from app.models.schemas import OrderStatus
+
+
+# Order lifecycle: current status -> statuses it may move to
+VALID_TRANSITIONS: Dict[str, List[str]] = {
+    OrderStatus.CREATED.value: [OrderStatus.PAID.value, OrderStatus.FAILED.value],
+    OrderStatus.PAID.value: [OrderStatus.RUNNING.value, OrderStatus.FAILED.value],
+    OrderStatus.RUNNING.value: [OrderStatus.DONE.value, OrderStatus.FAILED.value],
+    OrderStatus.DONE.value: [],  # Terminal state
+    OrderStatus.FAILED.value: [],  # Terminal state
+}
+
+ORDER_COLUMNS = (
+    "id, device_id, service_id, amount_cents, authorized_minutes, "
+    "status, created_at, updated_at"
+)
+
+# One round-trip: the UPDATE only matches when the row is still in an allowed
+# status (re-checked after the row lock, so concurrent writers cannot both win),
+# and the `target` CTE reports what the status was when it did not match.
+TRANSITION_SQL = """
+    WITH target AS (
+        SELECT status
+        FROM orders
+        WHERE id = %(order_id)s {device_filter}
+    ),
+    updated AS (
+        UPDATE orders
+        SET status = %(new_status)s, updated_at = CURRENT_TIMESTAMP
+        WHERE id = %(order_id)s {device_filter}
+          AND status = ANY(%(allowed)s::order_status[])
+        RETURNING {columns}
+    )
+    SELECT target.status AS previous_status, updated.*
+    FROM target
+    LEFT JOIN updated ON true
+"""
+
+
+class TransitionResult(NamedTuple):
+    """Outcome of transition_order_status"""
+    order: Optional[dict]  # Updated order row when the transition was applied
+    previous_status: Optional[str]  # Status observed before the update (None if not found)
+    new_status: str
+
+    @property
+    def found(self) -> bool:
+        return self.previous_status is not None
+
+    @property
+    def applied(self) -> bool:
+        return self.order is not None
+
+    @property
+    def conflict(self) -> bool:
+        return self.found and not self.applied
+
+
+def allowed_previous_statuses(new_status: str) -> List[str]:
+    """Return the statuses from which new_status may be reached"""
+    return [
+        current for current, targets in VALID_TRANSITIONS.items()
+        if new_status in targets
+    ]
+
+
+def transition_order_status(
+    cursor: RealDictCursor,
+    order_id: str,
+    new_status: str,
+    device_id: Optional[str] = None
+) -> TransitionResult:
+    """
+    Atomically move an order to new_status if its current status allows it.
+
+    Args:
+        cursor: Database cursor
+        order_id: Order UUID
+        new_status: Target OrderStatus value
+        device_id: When given, the order must also belong to this device
+
+    Returns:
+        TransitionResult: applied (order set), conflict (found but status not
+        allowed) or not found (previous_status is None)
+    """
+    new_status = OrderStatus(new_status).value
+    params = {
+        "order_id": order_id,
+        "new_status": new_status,
+        "allowed": allowed_previous_statuses(new_status),
+    }
+    device_filter = ""
+    if device_id is not None:
+        device_filter = "AND device_id = %(device_id)s"
+        params["device_id"] = device_id
+
+    cursor.execute(
+        TRANSITION_SQL.format(device_filter=device_filter, columns=ORDER_COLUMNS),
+        params
+    )
+    row = cursor.fetchone()
+
+    if row is None:
+        return TransitionResult(order=None, previous_status=None, new_status=new_status)
+
+    row = dict(row)
+    previous_status = row.pop("previous_status")
+    order = row if row.get("id") is not None else None
+    return TransitionResult(order=order, previous_status=previous_status, new_status=new_status)
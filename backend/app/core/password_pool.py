@@ -0,0 +1,146 @@
+"""
+Bounded worker pool for bcrypt password hashing
+Keeps login/register bursts from starving the request workers
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt hash/verify calls on a dedicated, size-limited executor.
+
+    - At most PASSWORD_HASH_WORKERS hashes run at once
+    - At most PASSWORD_HASH_MAX_QUEUE more may wait; beyond that callers get 503
+    - Each key (client IP, email) may have PASSWORD_HASH_PER_KEY_LIMIT calls
+      in flight; beyond that callers get 429
+
+    Callers await run() from async handlers, so a request waiting for a
+    hashing worker holds no threadpool thread.
+
+    Usage:
+        ok = await password_pool.run(verify_password, plain, hashed, keys=["ip:1.2.3.4"])
+    """
+
+    def __init__(self):
+        self.workers = settings.PASSWORD_HASH_WORKERS
+        self.max_queue = settings.PASSWORD_HASH_MAX_QUEUE
+        self.per_key_limit = settings.PASSWORD_HASH_PER_KEY_LIMIT
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._in_flight_by_key: Dict[str, int] = {}
+        self._stats = {
+            "completed": 0,
+            "rejected_queue_full": 0,
+            "rejected_rate_limited": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "hash_ms_total": 0.0,
+        }
+
+    def _acquire(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._stats["rejected_queue_full"] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+
+            if any(self._in_flight_by_key.get(key, 0) >= self.per_key_limit for key in keys):
+                self._stats["rejected_rate_limited"] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many concurrent login attempts",
+                    headers={"Retry-After": "1"}
+                )
+
+            self._pending += 1
+            for key in keys:
+                self._in_flight_by_key[key] = self._in_flight_by_key.get(key, 0) + 1
+
+    def _release(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._pending -= 1
+            for key in keys:
+                remaining = self._in_flight_by_key.get(key, 0) - 1
+                if remaining > 0:
+                    self._in_flight_by_key[key] = remaining
+                else:
+                    self._in_flight_by_key.pop(key, None)
+
+    def _record(self, wait_ms: float, hash_ms: float) -> None:
+        with self._lock:
+            self._stats["completed"] += 1
+            self._stats["queue_wait_ms_total"] += wait_ms
+            self._stats["queue_wait_ms_max"] = max(self._stats["queue_wait_ms_max"], wait_ms)
+            self._stats["hash_ms_total"] += hash_ms
+
+    def _timed(self, func: Callable[..., Any], args: tuple) -> Callable[[], Any]:
+        submitted = time.perf_counter()
+
+        def timed_call():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self._record(
+                    wait_ms=(started - submitted) * 1000,
+                    hash_ms=(time.perf_counter() - started) * 1000
+                )
+
+        return timed_call
+
+    async def run(self, func: Callable[..., Any], *args: Any, keys: Iterable[str] = ()) -> Any:
+        """Run func(*args) on the hashing executor, enforcing queue and per-key limits"""
+        keys = [key for key in keys if key]
+        self._acquire(keys)
+        try:
+            return await asyncio.wrap_future(self._executor.submit(self._timed(func, args)))
+        finally:
+            self._release(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, rejection counters and queue wait times"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+            stats["active_keys"] = len(self._in_flight_by_key)
+        completed = stats["completed"]
+        stats["queue_wait_ms_avg"] = round(stats["queue_wait_ms_total"] / completed, 2) if completed else 0.0
+        stats["hash_ms_avg"] = round(stats["hash_ms_total"] / completed, 2) if completed else 0.0
+        stats["workers"] = self.workers
+        stats["max_queue"] = self.max_queue
+        stats["per_key_limit"] = self.per_key_limit
+        return stats
+
+    def collect_metrics(self):
+        """Expose pool counters on /metrics"""
+        stats = self.stats()
+        return [
+            ("password_hash_completed_total", "counter", "bcrypt hash/verify calls completed",
+             [({}, stats["completed"])]),
+            ("password_hash_rejected_total", "counter", "bcrypt calls rejected before queueing",
+             [({"reason": "queue_full"}, stats["rejected_queue_full"]),
+              ({"reason": "rate_limited"}, stats["rejected_rate_limited"])]),
+            ("password_hash_queue_wait_seconds_total", "counter", "Total time spent waiting for a hashing worker",
+             [({}, stats["queue_wait_ms_total"] / 1000)]),
+            ("password_hash_pending", "gauge", "bcrypt calls running or queued",
+             [({}, stats["pending"])]),
+        ]
+
+
+# Global password hashing pool
+password_pool = PasswordHashPool()
+registry.register_collector(password_pool.collect_metrics)
@@ -6,10 +6,13 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from psycopg2.extras import RealDictCursor
 from app.core.config import settings
+from app.core.metrics import STRIPE_REQUEST_DURATION, track_external_call
 
 
 # Initialize Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
+if settings.STRIPE_API_BASE:
+    stripe.api_base = settings.STRIPE_API_BASE
 
 
 # ============================================================================
@@ -18,10 +21,11 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 
 def create_customer(email: str, name: str) -> Dict[str, Any]:
     """Create a Stripe customer"""
-    customer = stripe.Customer.create(
-        email=email,
-        name=name
-    )
+    with track_external_call(STRIPE_REQUEST_DURATION, "customer.create"):
+        customer = stripe.Customer.create(
+            email=email,
+            name=name
+        )
     return {
         "customer_id": customer.id,
         "email": customer.email,
@@ -32,7 +36,8 @@ def create_customer(email: str, name: str) -> Dict[str, Any]:
 
 def get_customer(customer_id: str) -> Dict[str, Any]:
     """Get Stripe customer details"""
-    customer = stripe.Customer.retrieve(customer_id)
+    with track_external_call(STRIPE_REQUEST_DURATION, "customer.retrieve"):
+        customer = stripe.Customer.retrieve(customer_id)
     return {
         "customer_id": customer.id,
         "email": customer.email,
@@ -49,7 +54,8 @@ def update_customer(customer_id: str, email: Optional[str] = None, name: Optiona
     if name:
         update_data["name"] = name
 
-    customer = stripe.Customer.modify(customer_id, **update_data)
+    with track_external_call(STRIPE_REQUEST_DURATION, "customer.update"):
+        customer = stripe.Customer.modify(customer_id, **update_data)
     return {
         "customer_id": customer.id,
         "email": customer.email,
@@ -60,7 +66,8 @@ def update_customer(customer_id: str, email: Optional[str] = None, name: Optiona
 
 def delete_customer(customer_id: str) -> Dict[str, Any]:
     """Delete Stripe customer"""
-    result = stripe.Customer.delete(customer_id)
+    with track_external_call(STRIPE_REQUEST_DURATION, "customer.delete"):
+        result = stripe.Customer.delete(customer_id)
     return {
         "customer_id": result.id,
         "deleted": result.deleted
@@ -78,14 +85,15 @@ def create_payment(
     metadata: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """Create a Stripe PaymentIntent"""
-    payment_intent = stripe.PaymentIntent.create(
-        amount=amount_cents,
-        currency="usd",
-        customer=customer_id,
-        description=description,
-        metadata=metadata or {},
-        automatic_payment_methods={"enabled": True}
-    )
+    with track_external_call(STRIPE_REQUEST_DURATION, "payment_intent.create"):
+        payment_intent = stripe.PaymentIntent.create(
+            amount=amount_cents,
+            currency="usd",
+            customer=customer_id,
+            description=description,
+            metadata=metadata or {},
+            automatic_payment_methods={"enabled": True}
+        )
     return {
         "payment_intent_id": payment_intent.id,
         "amount_cents": payment_intent.amount,
@@ -97,7 +105,8 @@ def create_payment(
 
 def get_payment(payment_intent_id: str) -> Dict[str, Any]:
     """Get PaymentIntent status"""
-    payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
+    with track_external_call(STRIPE_REQUEST_DURATION, "payment_intent.retrieve"):
+        payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
     return {
         "payment_intent_id": payment_intent.id,
         "amount_cents": payment_intent.amount,
@@ -109,7 +118,8 @@ def get_payment(payment_intent_id: str) -> Dict[str, Any]:
 
 def confirm_payment(payment_intent_id: str) -> Dict[str, Any]:
     """Confirm a PaymentIntent"""
-    payment_intent = stripe.PaymentIntent.confirm(payment_intent_id)
+    with track_external_call(STRIPE_REQUEST_DURATION, "payment_intent.confirm"):
+        payment_intent = stripe.PaymentIntent.confirm(payment_intent_id)
     return {
         "payment_intent_id": payment_intent.id,
         "amount_cents": payment_intent.amount,
@@ -121,7 +131,8 @@ def confirm_payment(payment_intent_id: str) -> Dict[str, Any]:
 
 def cancel_payment(payment_intent_id: str) -> Dict[str, Any]:
     """Cancel a PaymentIntent"""
-    payment_intent = stripe.PaymentIntent.cancel(payment_intent_id)
+    with track_external_call(STRIPE_REQUEST_DURATION, "payment_intent.cancel"):
+        payment_intent = stripe.PaymentIntent.cancel(payment_intent_id)
     return {
         "payment_intent_id": payment_intent.id,
         "status": payment_intent.status
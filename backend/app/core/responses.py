@@ -0,0 +1,71 @@
+"""
+Fast JSON responses
+Renders large row lists with orjson (C-accelerated) instead of
+jsonable_encoder + stdlib json
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback keeps the API working without orjson
+    orjson = None
+
+
+def _encode_decimal(value: Decimal):
+    """Match FastAPI's decimal_encoder: integral values stay ints"""
+    if value.as_tuple().exponent >= 0:
+        return int(value)
+    return float(value)
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not serialize natively"""
+    if isinstance(obj, Decimal):
+        return _encode_decimal(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (bytes, memoryview)):
+        return bytes(obj).decode("utf-8", "replace")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    """Fallback encoder covering what orjson handles natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    return _default(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize rows (dicts, RealDictRows, lists) to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_stdlib_default,
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+
+    Return an instance directly from the route (FastAPI then skips
+    jsonable_encoder) and declare it as response_class for the docs:
+
+        @router.get("/devices/all", response_class=FastJSONResponse)
+        def get_all_devices(...):
+            return FastJSONResponse(cursor.fetchall())
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
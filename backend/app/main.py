@@ -3,14 +3,21 @@ RemoteLED Backend API - Main Application
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from datetime import datetime
-import psycopg2
+import time
 
 from app.core.config import settings
-from app.core.database import db
+from app.core.logger import setup_logging
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.compression import CompressionMiddleware
+from app.services.order_sweeper import order_sweeper
+from app.services.health import health_checker
 from app.api import devices, orders, authorizations, payments, telemetry, admin, auth, device_models, locations, service_types, reference, led
 
+# Structured logging for the app.* loggers (queued, written by a background thread)
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.API_TITLE,
@@ -28,6 +35,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (admin lists) for clients that accept br/gzip
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+    )
+
+# Record per-route request counts and latency (exposed on /metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(devices.router)
@@ -41,6 +62,20 @@ app.include_router(led.router)
 app.include_router(reference.router)
 
 
+@app.on_event("startup")
+def start_background_workers():
+    """Start background maintenance workers"""
+    health_checker.start()
+    order_sweeper.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    """Stop background maintenance workers"""
+    order_sweeper.stop()
+    health_checker.stop()
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
@@ -55,23 +90,53 @@ def root():
 
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
-    # Check database connection
-    db_status = "healthy"
-    try:
-        with db.get_cursor() as cursor:
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-    except psycopg2.Error as e:
-        db_status = f"unhealthy: {str(e)}"
-    
+    """Health summary from the cached background checks (never touches the database)"""
+    snapshot = health_checker.snapshot()
+    database = snapshot["checks"].get("database")
+    if database is None:
+        db_status = snapshot["status"]
+    elif database["healthy"]:
+        db_status = "healthy"
+    else:
+        db_status = f"unhealthy: {database['detail']}"
+
     return {
-        "status": "healthy" if db_status == "healthy" else "degraded",
+        "status": "healthy" if snapshot["status"] == "healthy" else "degraded",
         "database": db_status,
+        "checks": snapshot["checks"],
+        "checked_at": snapshot["checked_at"],
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
+@app.get("/health/live")
+def liveness_probe():
+    """Liveness probe: the process is up and serving requests"""
+    return {
+        "status": "alive",
+        "uptime_seconds": round(time.time() - health_checker.started_at, 1)
+    }
+
+
+@app.get("/health/ready")
+def readiness_probe():
+    """Readiness probe: 503 until the cached critical checks (database) pass"""
+    snapshot = health_checker.snapshot()
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content=snapshot
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
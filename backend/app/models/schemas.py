@@ -106,11 +106,21 @@ class AuthorizationCreateRequest(BaseModel):
     order_id: str
 
 
+class AuthorizationPublicKeyResponse(BaseModel):
+    curve: Literal["secp256k1"] = "secp256k1"
+    key_id: str  # First 16 hex chars of sha256(uncompressed public key)
+    public_key_pem: str
+    public_key_hex: str  # Uncompressed SEC1 point (04 || X || Y)
+    message_prefix: str  # Signed message: sha256(message_prefix + canonical payload)
+    ephemeral: bool  # True when the key changes on every backend restart
+
+
 # Telemetry/Log Models
 class TelemetryEvent(str, Enum):
     STARTED = "STARTED"
     DONE = "DONE"
     ERROR = "ERROR"
+    INFO = "INFO"  # Device journal entries (BLE commands, LED states); no order change
 
 
 class TelemetryRequest(BaseModel):
@@ -120,6 +130,23 @@ class TelemetryRequest(BaseModel):
     payload_hash: Optional[str] = None
 
 
+class TelemetryBatchEvent(TelemetryRequest):
+    client_event_id: str = Field(..., min_length=1, max_length=64)  # Unique per device; retries are deduplicated on it
+    occurred_at: Optional[datetime] = None  # Device clock time of the event
+
+
+class TelemetryBatchRequest(BaseModel):
+    events: List[TelemetryBatchEvent]
+
+
+class TelemetryBatchResponse(BaseModel):
+    accepted: int  # Newly stored events
+    duplicates: int  # Already stored by an earlier attempt
+    rejected: List[str]  # client_event_ids that can never be stored (e.g. malformed order_id)
+    acked: List[str]  # Every client_event_id the device may drop from its journal
+    order_status_updates: int
+
+
 class LogResponse(BaseModel):
     id: str
     device_id: str
@@ -6,19 +6,51 @@ import secrets
 import time
 from ecdsa import SigningKey, SECP256k1
 from ecdsa.util import sigencode_der
-from typing import Dict
-from datetime import datetime, timedelta
+from typing import Dict, Optional
 from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import SIGNING_DURATION
+
+logger = get_logger(__name__)
+
+
+def load_signing_key(key: str = "", key_file: str = "") -> Optional[SigningKey]:
+    """
+    Load the secp256k1 signing key from a PEM/hex string or file.
+
+    Returns None when neither is configured.
+    """
+    if not key and key_file:
+        with open(key_file) as f:
+            key = f.read()
+    key = key.strip()
+    if not key:
+        return None
+    if key.startswith("-----BEGIN"):
+        return SigningKey.from_pem(key)
+    return SigningKey.from_string(bytes.fromhex(key), curve=SECP256k1)
 
 
 class CryptoService:
     """Handle ECDSA signing for device authorizations"""
+
+    # Domain separation for signed authorization payloads
+    MESSAGE_PREFIX = "RemoteLED:Authorization:"
     
-    def __init__(self):
-        # For now, generate a new key each time
-        # In production, load from environment or key management service
-        self.private_key = SigningKey.generate(curve=SECP256k1)
+    def __init__(self, signing_key: Optional[SigningKey] = None):
+        if signing_key is None:
+            signing_key = load_signing_key(settings.AUTH_SIGNING_KEY, settings.AUTH_SIGNING_KEY_FILE)
+        # Without a configured key, signatures only verify until the next restart
+        self.ephemeral = signing_key is None
+        if self.ephemeral:
+            logger.warning("AUTH_SIGNING_KEY not set, using an ephemeral signing key")
+            signing_key = SigningKey.generate(curve=SECP256k1)
+        self.private_key = signing_key
         self.public_key = self.private_key.get_verifying_key()
+        self.public_key_pem = self.public_key.to_pem().decode("ascii")
+        self.public_key_hex = self.public_key.to_string("uncompressed").hex()
+        # Short fingerprint so devices can tell when their cached key is stale
+        self.key_id = hashlib.sha256(bytes.fromhex(self.public_key_hex)).hexdigest()[:16]
     
     def generate_nonce(self, length: int = 12) -> str:
         """Generate a cryptographically secure random nonce"""
@@ -33,7 +65,9 @@ class CryptoService:
     ) -> Dict:
         """Create authorization payload"""
         nonce = self.generate_nonce()
-        expiry_time = datetime.utcnow() + timedelta(minutes=settings.AUTH_EXPIRY_MINUTES)
+        # Epoch seconds straight from time.time(): a naive utcnow() would be
+        # read as local time by .timestamp() and be off by the UTC offset
+        expires_at = int(time.time()) + settings.AUTH_EXPIRY_MINUTES * 60
         
         payload = {
             "deviceId": device_id,
@@ -41,7 +75,7 @@ class CryptoService:
             "type": service_type,
             "seconds": authorized_seconds,
             "nonce": nonce,
-            "exp": int(expiry_time.timestamp())
+            "exp": expires_at
         }
         
         return payload
@@ -52,17 +86,18 @@ class CryptoService:
         payload_str = self._serialize_payload(payload)
         
         # Add domain separation
-        message = f"RemoteLED:Authorization:{payload_str}"
+        message = f"{self.MESSAGE_PREFIX}{payload_str}"
         message_bytes = message.encode('utf-8')
         
         # Create hash
         message_hash = hashlib.sha256(message_bytes).digest()
         
         # Sign with ECDSA
-        signature = self.private_key.sign_digest(
-            message_hash,
-            sigencode=sigencode_der
-        )
+        with SIGNING_DURATION.time():
+            signature = self.private_key.sign_digest(
+                message_hash,
+                sigencode=sigencode_der
+            )
         
         # Return hex-encoded signature
         return signature.hex()
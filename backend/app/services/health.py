@@ -0,0 +1,185 @@
+"""
+Dependency health checker
+Background worker that probes the database, Stripe and the BLE adapter and
+caches the result, so /health probes never open a connection themselves
+"""
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+import stripe
+from app.core.config import settings
+from app.core.database import db
+from app.core.logger import get_logger
+from app.core.metrics import registry
+
+
+logger = get_logger(__name__)
+
+BLUETOOTH_SYSFS = "/sys/class/bluetooth"
+
+
+def check_database() -> Tuple[bool, str]:
+    """Round-trip SELECT 1 on a fresh connection (bounded by the check timeout)"""
+    with db.get_cursor(connect_timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS) as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return True, "ok"
+
+
+def check_stripe() -> Optional[Tuple[bool, str]]:
+    """TCP reachability of the Stripe API host (skipped when Stripe is not configured)"""
+    if not settings.STRIPE_SECRET_KEY:
+        return None
+    api_base = getattr(stripe, "api_base", None) or "https://api.stripe.com"
+    parsed = urlparse(api_base)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    with socket.create_connection((parsed.hostname, port), timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+        pass
+    return True, f"{parsed.hostname}:{port} reachable"
+
+
+def check_ble_adapter() -> Optional[Tuple[bool, str]]:
+    """Presence of a local Bluetooth controller (Linux only, skipped elsewhere)"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        adapters = sorted(os.listdir(BLUETOOTH_SYSFS))
+    except FileNotFoundError:
+        adapters = []
+    if not adapters:
+        return False, "no Bluetooth adapter found"
+    return True, ", ".join(adapters)
+
+
+class HealthChecker:
+    """
+    Periodically runs dependency checks and caches their results.
+
+    Only "critical" checks (the database) decide readiness; Stripe and BLE
+    failures mark the service degraded but keep it in rotation, since most
+    routes do not need them. Results older than three intervals (checker
+    thread stuck or dead) count as not ready.
+
+    Usage:
+        health_checker.start()      # on application startup
+        health_checker.snapshot()   # O(1) cached status for probes
+        health_checker.stop()       # on application shutdown
+    """
+
+    def __init__(self):
+        self.interval_seconds = settings.HEALTH_CHECK_INTERVAL_SECONDS
+        self.checks: Dict[str, Tuple[Callable[[], Optional[Tuple[bool, str]]], bool]] = {
+            "database": (check_database, True),
+            "stripe": (check_stripe, False),
+            "ble_adapter": (check_ble_adapter, False),
+        }
+        self.started_at = time.time()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict] = {}
+        self._checked_at: Optional[float] = None
+
+    def run_checks(self) -> Dict[str, Dict]:
+        """Run every check once and cache the results"""
+        results = {}
+        for name, (check, critical) in self.checks.items():
+            started = time.perf_counter()
+            try:
+                outcome = check()
+            except Exception as e:
+                outcome = (False, str(e))
+            if outcome is None:
+                continue
+            healthy, detail = outcome
+            results[name] = {
+                "healthy": healthy,
+                "critical": critical,
+                "detail": detail,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+
+        with self._lock:
+            previous = self._results
+            self._results = results
+            self._checked_at = time.time()
+
+        for name, result in results.items():
+            was_healthy = previous.get(name, {}).get("healthy")
+            if was_healthy is not None and was_healthy != result["healthy"]:
+                logger.warning(
+                    "Dependency %s is now %s", name, "healthy" if result["healthy"] else "unhealthy",
+                    extra={"detail": result["detail"]}
+                )
+        return results
+
+    def _run(self) -> None:
+        self.run_checks()
+        while not self._stop_event.wait(self.interval_seconds):
+            self.run_checks()
+
+    def start(self) -> None:
+        """Start the background checker thread (no-op if running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="health-checker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the checker thread to exit and wait briefly for it"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def snapshot(self) -> Dict:
+        """Cached readiness state; never performs I/O"""
+        with self._lock:
+            results = {name: dict(result) for name, result in self._results.items()}
+            checked_at = self._checked_at
+
+        if checked_at is None:
+            return {"ready": False, "status": "starting", "checks": {}, "checked_at": None, "age_seconds": None}
+
+        age = time.time() - checked_at
+        stale = age > self.interval_seconds * 3
+        critical_ok = all(r["healthy"] for r in results.values() if r["critical"])
+        all_ok = all(r["healthy"] for r in results.values())
+
+        if stale:
+            status = "stale"
+        elif not critical_ok:
+            status = "unhealthy"
+        elif not all_ok:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {
+            "ready": critical_ok and not stale,
+            "status": status,
+            "checks": results,
+            "checked_at": datetime.utcfromtimestamp(checked_at).isoformat(),
+            "age_seconds": round(age, 2),
+        }
+
+    def collect_metrics(self):
+        """Expose cached check results on /metrics"""
+        snapshot = self.snapshot()
+        return [
+            ("health_check_up", "gauge", "1 if the last dependency check passed",
+             [({"check": name}, int(result["healthy"])) for name, result in snapshot["checks"].items()]),
+            ("health_ready", "gauge", "1 if the service reports ready",
+             [({}, int(snapshot["ready"]))]),
+        ]
+
+
+# Global health checker instance
+health_checker = HealthChecker()
+registry.register_collector(health_checker.collect_metrics)
@@ -0,0 +1,182 @@
+"""
+Order expiry sweeper
+Background worker that fails orders abandoned in CREATED/PAID
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.database import db
+from app.core.logger import get_logger
+from app.core.metrics import registry
+from app.core.order_transitions import allowed_previous_statuses
+from app.models.schemas import OrderStatus
+
+
+logger = get_logger(__name__)
+
+# Lock a bounded batch of stale orders, skipping rows another transaction
+# (payment, telemetry) currently holds, and fail them in the same statement.
+# Like transition_order_status, the UPDATE only matches rows whose status may
+# still move to the target (VALID_TRANSITIONS), re-checked after the row lock.
+EXPIRE_BATCH_SQL = """
+    WITH stale AS (
+        SELECT id
+        FROM orders
+        WHERE status = %s
+          AND updated_at < NOW() - make_interval(mins => %s)
+        ORDER BY updated_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE orders o
+    SET status = %s, updated_at = CURRENT_TIMESTAMP
+    FROM stale
+    WHERE o.id = stale.id
+      AND o.status = ANY(%s::order_status[])
+    RETURNING o.id
+"""
+
+
+class OrderSweeper:
+    """
+    Periodically transitions stale CREATED/PAID orders to FAILED.
+
+    Usage:
+        order_sweeper.start()   # on application startup
+        order_sweeper.sweep()   # run one pass synchronously
+        order_sweeper.stats()   # sweep duration and count metrics
+        order_sweeper.stop()    # on application shutdown
+    """
+
+    def __init__(self):
+        self.interval_seconds = settings.ORDER_SWEEP_INTERVAL_SECONDS
+        self.batch_size = settings.ORDER_SWEEP_BATCH_SIZE
+        self.max_batches = settings.ORDER_SWEEP_MAX_BATCHES
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "runs": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_duration_ms": 0.0,
+            "total_duration_ms": 0.0,
+            "last_expired": {},
+            "total_expired": {},
+            "last_error": None,
+        }
+
+    @property
+    def timeouts(self) -> Dict[str, int]:
+        """Per-status timeouts in minutes (0 disables sweeping that status)"""
+        return {
+            OrderStatus.CREATED.value: settings.ORDER_TIMEOUT_CREATED_MINUTES,
+            OrderStatus.PAID.value: settings.ORDER_TIMEOUT_PAID_MINUTES,
+        }
+
+    def _expire_status(self, status: str, timeout_minutes: int) -> int:
+        """Fail stale orders of one status in bounded batches"""
+        allowed = allowed_previous_statuses(OrderStatus.FAILED.value)
+        if status not in allowed:
+            raise ValueError(f"Orders in {status} cannot be failed")
+
+        expired = 0
+        for _ in range(self.max_batches):
+            with db.get_cursor() as cursor:
+                cursor.execute(
+                    EXPIRE_BATCH_SQL,
+                    (status, timeout_minutes, self.batch_size, OrderStatus.FAILED.value, allowed)
+                )
+                count = len(cursor.fetchall())
+            expired += count
+            if count < self.batch_size or self._stop_event.is_set():
+                break
+        return expired
+
+    def sweep(self) -> Dict[str, int]:
+        """Run one sweep pass and return the number of orders failed per status"""
+        started = time.perf_counter()
+        expired: Dict[str, int] = {}
+        error = None
+
+        try:
+            for status, timeout_minutes in self.timeouts.items():
+                if timeout_minutes > 0:
+                    expired[status] = self._expire_status(status, timeout_minutes)
+        except Exception as e:
+            error = str(e)
+            logger.error("Order sweep failed: %s", e)
+
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        with self._stats_lock:
+            self._stats["runs"] += 1
+            self._stats["last_run_at"] = datetime.utcnow().isoformat()
+            self._stats["last_duration_ms"] = round(duration_ms, 2)
+            self._stats["total_duration_ms"] = round(self._stats["total_duration_ms"] + duration_ms, 2)
+            self._stats["last_expired"] = expired
+            for status, count in expired.items():
+                self._stats["total_expired"][status] = self._stats["total_expired"].get(status, 0) + count
+            if error:
+                self._stats["errors"] += 1
+                self._stats["last_error"] = error
+
+        if any(expired.values()):
+            logger.info("Expired stale orders", extra={"expired": expired, "duration_ms": round(duration_ms, 1)})
+
+        return expired
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.sweep()
+
+    def start(self) -> None:
+        """Start the background sweeper thread (no-op if disabled or running)"""
+        if not settings.ORDER_SWEEP_ENABLED:
+            return
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="order-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the sweeper thread to exit and wait briefly for it"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def stats(self) -> Dict:
+        """Return sweep duration and expiry counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["last_expired"] = dict(self._stats["last_expired"])
+            stats["total_expired"] = dict(self._stats["total_expired"])
+        stats["running"] = bool(self._thread and self._thread.is_alive())
+        stats["interval_seconds"] = self.interval_seconds
+        stats["batch_size"] = self.batch_size
+        stats["timeouts_minutes"] = self.timeouts
+        return stats
+
+    def collect_metrics(self):
+        """Expose sweep counters on /metrics"""
+        stats = self.stats()
+        return [
+            ("order_sweeper_runs_total", "counter", "Order sweeper passes",
+             [({}, stats["runs"])]),
+            ("order_sweeper_errors_total", "counter", "Order sweeper passes that failed",
+             [({}, stats["errors"])]),
+            ("order_sweeper_duration_seconds_total", "counter", "Total time spent sweeping",
+             [({}, stats["total_duration_ms"] / 1000)]),
+            ("order_sweeper_expired_total", "counter", "Orders failed by the sweeper by previous status",
+             [({"status": status}, count) for status, count in stats["total_expired"].items()]),
+        ]
+
+
+# Global sweeper instance
+order_sweeper = OrderSweeper()
+registry.register_collector(order_sweeper.collect_metrics)
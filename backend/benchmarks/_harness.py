@@ -0,0 +1,51 @@
+"""
+Shared helpers for the backend benchmark scripts
+
+Benchmarks are plain scripts (bench_*.py, not collected by pytest):
+
+    cd backend
+    python -m benchmarks.bench_json_responses
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+
+def measure(func: Callable[[], object], repeat: int = 7, number: int = 20) -> Dict[str, float]:
+    """
+    Time func() `number` times per round over `repeat` rounds.
+
+    Returns:
+        dict: best/median/mean milliseconds per call
+    """
+    func()  # warm-up (imports, caches, JIT-free but allocator warm)
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) * 1000 / number)
+    return {
+        "best_ms": min(per_call),
+        "median_ms": statistics.median(per_call),
+        "mean_ms": statistics.fmean(per_call),
+    }
+
+
+def print_table(title: str, columns: List[str], rows: List[List[object]]) -> None:
+    """Print an aligned plain-text table"""
+    cells = [[str(c) for c in columns]] + [
+        [f"{v:.3f}" if isinstance(v, float) else str(v) for v in row] for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+    print(f"\n{title}")
+    print("  ".join(c.ljust(w) for c, w in zip(cells[0], widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in cells[1:]:
+        print("  ".join(c.ljust(w) for c, w in zip(row, widths)))
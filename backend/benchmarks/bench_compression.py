@@ -0,0 +1,92 @@
+"""
+Benchmark: compression ratio and CPU cost for admin list payloads
+
+Compresses the 500-row payloads from bench_json_responses with gzip and
+(when installed) brotli at a few levels, and reports the ratio and
+milliseconds per response. Also times a full request through
+CompressionMiddleware so per-request overhead is visible.
+
+    cd backend
+    python -m benchmarks.bench_compression [--rows 500]
+"""
+import argparse
+import gzip
+
+from benchmarks._harness import measure, print_table
+from benchmarks.bench_json_responses import make_payloads
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, brotli
+from app.core.responses import FastJSONResponse
+
+
+def codecs():
+    yield "gzip-1", lambda body: gzip.compress(body, compresslevel=1, mtime=0)
+    yield "gzip-6", lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    yield "gzip-9", lambda body: gzip.compress(body, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield "br-1", lambda body: brotli.compress(body, quality=1)
+        yield "br-4", lambda body: brotli.compress(body, quality=4)
+        yield "br-11", lambda body: brotli.compress(body, quality=11)
+
+
+def bench_codecs(payloads) -> None:
+    table = []
+    for name, rows in payloads.items():
+        body = FastJSONResponse(rows).body
+        for codec, compress in codecs():
+            compressed = compress(body)
+            timing = measure(lambda: compress(body), repeat=5, number=10)
+            table.append([
+                f"/admin/{name}", codec, len(body), len(compressed),
+                f"{len(body) / len(compressed):.1f}x", timing["median_ms"],
+            ])
+    print_table(
+        "Compression ratio and CPU cost (median ms per response)",
+        ["endpoint", "codec", "raw_bytes", "compressed_bytes", "ratio", "compress_ms"],
+        table,
+    )
+
+
+def bench_middleware(payloads) -> None:
+    rows = payloads["orders/recent"]
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/orders")
+    def orders():
+        return FastJSONResponse(rows)
+
+    table = []
+    with TestClient(app) as client:
+        encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+        for encoding in encodings:
+            headers = {"Accept-Encoding": encoding}
+            response = client.get("/orders", headers=headers)
+            timing = measure(lambda: client.get("/orders", headers=headers), repeat=5, number=10)
+            table.append([encoding, len(response.content), response.num_bytes_downloaded, timing["median_ms"]])
+
+    print_table(
+        "End-to-end request through CompressionMiddleware (/admin/orders/recent shape)",
+        ["accept_encoding", "json_bytes", "wire_bytes", "request_ms"],
+        table,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed; only gzip is measured")
+
+    payloads = make_payloads(args.rows)
+    bench_codecs(payloads)
+    bench_middleware(payloads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark: /admin/devices/all fan-out join vs per-device aggregates
+
+Seeds a scratch schema (devices, services, device_services, orders) with
+server-side generate_series, then times the previous COUNT(DISTINCT) query
+against the current ALL_DEVICES_SQL and checks both return the same rows.
+The scratch schema is dropped afterwards unless --keep is given.
+
+    cd backend
+    python -m benchmarks.bench_devices_query --devices 1000 --orders-per-device 10000
+
+Needs PostgreSQL 13+ (gen_random_uuid) and DATABASE_URL or --dsn.
+"""
+import argparse
+import json
+import time
+
+from benchmarks._harness import print_table
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.core.config import settings
+
+SCHEMA = "bench_devices_query"
+
+# Query used by get_all_devices before the per-device aggregate rewrite
+FANOUT_SQL = """
+    SELECT
+        d.id,
+        d.label,
+        d.model,
+        d.location,
+        d.gpio_pin,
+        d.status,
+        d.created_at,
+        COUNT(DISTINCT ds.service_id) as service_count,
+        COUNT(DISTINCT CASE WHEN s.active THEN ds.service_id END) as active_service_count,
+        COUNT(DISTINCT o.id) as total_orders,
+        COUNT(DISTINCT CASE WHEN o.status = 'DONE' THEN o.id END) as completed_orders
+    FROM devices d
+    LEFT JOIN device_services ds ON d.id = ds.device_id
+    LEFT JOIN services s ON ds.service_id = s.id
+    LEFT JOIN orders o ON d.id = o.device_id
+    GROUP BY d.id, d.label, d.model, d.location, d.gpio_pin, d.status, d.created_at
+    ORDER BY d.created_at DESC
+"""
+
+SEED_SQL = """
+    DROP SCHEMA IF EXISTS {schema} CASCADE;
+    CREATE SCHEMA {schema};
+    SET search_path TO {schema};
+
+    CREATE TABLE devices (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        label VARCHAR(255) NOT NULL,
+        model VARCHAR(100),
+        location VARCHAR(255),
+        gpio_pin INTEGER,
+        status VARCHAR(20) DEFAULT 'active',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE services (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        active BOOLEAN DEFAULT true
+    );
+    CREATE TABLE device_services (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        device_id UUID NOT NULL REFERENCES devices(id),
+        service_id UUID NOT NULL REFERENCES services(id),
+        CONSTRAINT unique_device_service UNIQUE (device_id, service_id)
+    );
+    CREATE TABLE orders (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        device_id UUID NOT NULL REFERENCES devices(id),
+        status TEXT NOT NULL
+    );
+
+    INSERT INTO devices (label, model, location, gpio_pin, created_at)
+    SELECT 'Device ' || i, 'RL-100', 'Site ' || (i %% 50), 17, NOW() - i * INTERVAL '1 minute'
+    FROM generate_series(1, %(devices)s) AS i;
+
+    INSERT INTO services (active)
+    SELECT i %% 4 <> 0 FROM generate_series(1, %(services)s) AS i;
+
+    INSERT INTO device_services (device_id, service_id)
+    SELECT d.id, s.id
+    FROM devices d
+    CROSS JOIN LATERAL (
+        SELECT id FROM services ORDER BY md5(d.id::text || services.id::text) LIMIT %(services_per_device)s
+    ) s;
+
+    INSERT INTO orders (device_id, status)
+    SELECT d.id, (ARRAY['CREATED','PAID','RUNNING','DONE','DONE','DONE','DONE','FAILED'])[1 + (n %% 8)]
+    FROM devices d
+    CROSS JOIN generate_series(1, %(orders_per_device)s) AS n;
+
+    CREATE INDEX idx_device_services_device_id ON device_services(device_id);
+    CREATE INDEX idx_orders_device_status ON orders(device_id, status);
+    ANALYZE;
+"""
+
+
+def time_query(cursor, sql: str, runs: int):
+    timings = []
+    rows = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2], min(timings), rows
+
+
+def plan_rows(cursor, sql: str) -> int:
+    """Largest row count produced by any node in the executed plan"""
+    cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + sql)
+    plan = cursor.fetchone()["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    def walk(node):
+        yield node.get("Actual Rows", 0) * node.get("Actual Loops", 1)
+        for child in node.get("Plans", []):
+            yield from walk(child)
+
+    return max(walk(plan[0]["Plan"]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=settings.DATABASE_URL)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--orders-per-device", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--services-per-device", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-old", action="store_true", help="Only time the new query (old one can take minutes)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+
+    # Imported late: app.api.admin pulls in the whole API stack
+    from app.api.admin import ALL_DEVICES_SQL
+
+    conn = psycopg2.connect(args.dsn, cursor_factory=RealDictCursor)
+    conn.autocommit = True
+    cursor = conn.cursor()
+
+    try:
+        print(f"Seeding {args.devices} devices x {args.orders_per_device} orders "
+              f"({args.services_per_device} services each) into schema {SCHEMA}...")
+        started = time.perf_counter()
+        cursor.execute(SEED_SQL.format(schema=SCHEMA), {
+            "devices": args.devices,
+            "services": args.services,
+            "services_per_device": args.services_per_device,
+            "orders_per_device": args.orders_per_device,
+        })
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+        queries = [("per-device aggregates", ALL_DEVICES_SQL)]
+        if not args.skip_old:
+            queries.insert(0, ("fan-out COUNT(DISTINCT)", FANOUT_SQL))
+
+        table = []
+        results = {}
+        for name, sql in queries:
+            median_ms, best_ms, rows = time_query(cursor, sql, args.runs)
+            results[name] = rows
+            table.append([name, median_ms, best_ms, plan_rows(cursor, sql), len(rows)])
+
+        print_table(
+            "/admin/devices/all query",
+            ["query", "median_ms", "best_ms", "max_plan_rows", "result_rows"],
+            table,
+        )
+
+        if len(results) == 2:
+            old_rows, new_rows = results.values()
+            key = lambda row: str(row["id"])
+            same = sorted(map(dict, old_rows), key=key) == sorted(map(dict, new_rows), key=key)
+            print(f"\nResults identical: {same}")
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: CPU-bound hot paths in app.core and app.services
+
+Times authorization signing and hashing, UUID validation, JWT create/verify,
+bcrypt hash/verify and response-model validation. Saves results as a JSON
+baseline and compares later runs against it:
+
+    cd backend
+    python -m benchmarks.bench_hot_paths --save-baseline      # writes .benchmarks/hot_paths.json
+    python -m benchmarks.bench_hot_paths --baseline           # exits 1 on regression
+    python -m benchmarks.bench_hot_paths -k uuid -k token     # subset
+
+Baselines are machine-specific; compare runs from the same host only.
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks._harness import ROOT_DIR, measure, print_table
+
+DEFAULT_BASELINE = ROOT_DIR / ".benchmarks" / "hot_paths.json"
+
+DEVICE_ID = "d1111111-1111-1111-1111-111111111111"
+ORDER_ID = "0b6f5a2e-4c1d-4e8a-9f3b-7d2c1a0e9b84"
+SERVICE_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def build_cases() -> List[Tuple[str, Callable[[], object], int, int]]:
+    """(name, func, repeat, number) for every benchmarked call"""
+    # Imported here so --help works without the app's dependencies
+    from fastapi import HTTPException
+
+    from app.core import auth
+    from app.core.validators import validate_uuid
+    from app.models.schemas import AuthorizationResponse, OrderResponse
+    from app.services.crypto import crypto_service
+
+    payload = crypto_service.create_payload(DEVICE_ID, ORDER_ID, "FIXED", 2400)
+    now = datetime.now(timezone.utc)
+    order_row = {
+        "id": ORDER_ID, "device_id": DEVICE_ID, "service_id": SERVICE_ID, "amount_cents": 250,
+        "authorized_minutes": 40, "status": "PAID", "created_at": now, "updated_at": now,
+    }
+    authorization_row = {
+        "id": "5f0c9d7e-2b3a-4c8d-9e1f-0a2b3c4d5e6f", "order_id": ORDER_ID, "device_id": DEVICE_ID,
+        "payload": payload, "signature_hex": crypto_service.sign_payload(payload),
+        "expires_at": now, "created_at": now,
+    }
+    token = auth.create_access_token("admin@remoteled.com", "a1111111-1111-1111-1111-111111111111")
+    password_hash = auth.hash_password("password123")
+
+    def validate_invalid_uuid():
+        try:
+            validate_uuid("not-a-uuid", "Device ID")
+        except HTTPException:
+            pass
+
+    return [
+        ("crypto.sign_payload", lambda: crypto_service.sign_payload(payload), 7, 200),
+        ("crypto._serialize_payload", lambda: crypto_service._serialize_payload(payload), 7, 20_000),
+        ("crypto.hash_payload", lambda: crypto_service.hash_payload(payload), 7, 20_000),
+        ("validators.validate_uuid", lambda: validate_uuid(DEVICE_ID, "Device ID"), 7, 20_000),
+        ("validators.validate_uuid (invalid)", validate_invalid_uuid, 7, 5_000),
+        ("auth.create_access_token", lambda: auth.create_access_token("admin@remoteled.com", ORDER_ID), 7, 2_000),
+        ("auth.verify_token", lambda: auth.verify_token(token), 7, 2_000),
+        ("auth.hash_password", lambda: auth.hash_password("password123"), 3, 2),
+        ("auth.verify_password", lambda: auth.verify_password("password123", password_hash), 3, 2),
+        ("OrderResponse.model_validate", lambda: OrderResponse.model_validate(order_row), 7, 20_000),
+        ("AuthorizationResponse.model_validate",
+         lambda: AuthorizationResponse.model_validate(authorization_row), 7, 20_000),
+    ]
+
+
+def run(selected: List[str], scale: float) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, func, repeat, number in build_cases():
+        if selected and not any(s.lower() in name.lower() for s in selected):
+            continue
+        results[name] = measure(func, repeat=repeat, number=max(1, int(number * scale)))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict, threshold: float) -> List[str]:
+    """Print median deltas against the baseline and return the regressed names"""
+    regressions = []
+    rows = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            rows.append([name, "-", current["median_ms"] * 1000, "new", ""])
+            continue
+        change = current["median_ms"] / previous["median_ms"] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        rows.append([name, previous["median_ms"] * 1000, current["median_ms"] * 1000, f"{change:+.1%}",
+                     "REGRESSED" if regressed else ""])
+    print_table(
+        f"Against baseline from {baseline.get('created_at', '?')} (threshold {threshold:.0%})",
+        ["function", "base_median_us", "median_us", "change", ""],
+        rows,
+    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="selected", action="append", default=[],
+                        help="Only run functions whose name contains this (repeatable)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply calls per round (0.1 for a quick run)")
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH")
+    parser.add_argument("--baseline", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed median slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = run(args.selected, args.scale)
+    print_table(
+        "Hot paths (per call)",
+        ["function", "best_us", "median_us", "mean_us"],
+        [[name, r["best_ms"] * 1000, r["median_ms"] * 1000, r["mean_ms"] * 1000] for name, r in results.items()],
+    )
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "results": results,
+        }, indent=2))
+        print(f"\nSaved baseline to {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: rendering 500-row admin list responses
+
+Compares FastAPI's default path (jsonable_encoder + stdlib json via
+JSONResponse) with FastJSONResponse (orjson) on payloads shaped like
+/admin/devices/all, /admin/orders/recent, /admin/logs/recent and
+/admin/services/all.
+
+    cd backend
+    python -m benchmarks.bench_json_responses [--rows 500]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from benchmarks._harness import measure, print_table
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from psycopg2.extras import RealDictRow
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+
+
+def _uuid(rng: random.Random) -> str:
+    # psycopg2 returns uuid columns as str unless register_uuid() is used
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def _row(**fields) -> RealDictRow:
+    row = RealDictRow()
+    row.update(fields)
+    return row
+
+
+def make_payloads(rows: int, seed: int = 42):
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    stamp = lambda: base + timedelta(seconds=rng.randint(0, 10_000_000), microseconds=rng.randint(0, 999_999))
+    statuses = ["CREATED", "PAID", "RUNNING", "DONE", "FAILED"]
+
+    return {
+        "devices/all": [
+            _row(id=_uuid(rng), label=f"Laundry {i}", model="RL-100", location=f"Building {i % 12}",
+                 gpio_pin=17, status="active", created_at=stamp(), service_count=3,
+                 active_service_count=2, total_orders=rng.randint(0, 5000),
+                 completed_orders=rng.randint(0, 5000))
+            for i in range(rows)
+        ],
+        "orders/recent": [
+            _row(id=_uuid(rng), amount_cents=rng.choice([100, 250, 500]), authorized_minutes=40,
+                 status=rng.choice(statuses), created_at=stamp(), updated_at=stamp(),
+                 device_label=f"Laundry {i % 50}", device_id=_uuid(rng), service_type="FIXED",
+                 service_id=_uuid(rng))
+            for i in range(rows)
+        ],
+        "logs/recent": [
+            _row(id=_uuid(rng), direction="PI_TO_SRV", ok=rng.random() > 0.1,
+                 details="STARTED event received", created_at=stamp(),
+                 device_label=f"Laundry {i % 50}", device_id=_uuid(rng))
+            for i in range(rows)
+        ],
+        "services/all": [
+            _row(id=_uuid(rng), type="VARIABLE", price_cents=25, fixed_minutes=None,
+                 minutes_per_25c=Decimal("7.5"), active=True, created_at=stamp(),
+                 assigned_device_count=4, device_labels=[f"Laundry {j}" for j in range(4)])
+            for _ in range(rows)
+        ],
+    }
+
+
+def render_default(rows) -> bytes:
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def render_fast(rows) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    if responses.orjson is None:
+        print("orjson is not installed; FastJSONResponse is using the stdlib fallback")
+
+    table = []
+    for name, rows in make_payloads(args.rows).items():
+        default_body = render_default(rows)
+        fast_body = render_fast(rows)
+        default = measure(lambda: render_default(rows))
+        fast = measure(lambda: render_fast(rows))
+        table.append([
+            f"/admin/{name}",
+            default["median_ms"],
+            fast["median_ms"],
+            f"{default['median_ms'] / fast['median_ms']:.1f}x",
+            len(default_body),
+            len(fast_body),
+        ])
+
+    print_table(
+        f"JSON rendering, {args.rows} rows (median ms per response)",
+        ["endpoint", "default_ms", "fast_ms", "speedup", "default_bytes", "fast_bytes"],
+        table,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Synthetic data generator for performance testing
+
+Fills the RemoteLED schema (database/schema.sql) with production-scale data:
+admins, devices, services, device_services, orders (realistic status mix
+spread over months), authorizations, telemetry logs and admin_logs.
+Rows are streamed into PostgreSQL with COPY in chunks, inside one
+transaction. Output is deterministic for a given --seed and --end.
+
+    cd backend
+    python -m benchmarks.datagen --truncate --devices 1000 --orders-per-device 1000
+    python -m benchmarks.datagen --dry-run          # generate and count only, no database
+
+All admins get the seed.sql password ('password123').
+"""
+import argparse
+import hashlib
+import io
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from benchmarks._harness import print_table
+
+# bcrypt('password123'), same hash as database/seed.sql
+PASSWORD_HASH = "$2b$12$jIK7wrS49hEcFqJ194tuZ.Of1Xco2ENclslsc3XXCzztp4bLIXQrO"
+
+TABLE_COLUMNS = {
+    "admins": ("id", "email", "password_hash", "role", "last_login", "created_at"),
+    "devices": ("id", "label", "public_key", "model", "location", "gpio_pin", "status", "created_at", "updated_at"),
+    "services": ("id", "type", "price_cents", "fixed_minutes", "minutes_per_25c", "active", "created_at", "updated_at"),
+    "device_services": ("id", "device_id", "service_id", "created_at"),
+    "orders": ("id", "device_id", "service_id", "amount_cents", "authorized_minutes", "status", "created_at", "updated_at"),
+    "authorizations": ("id", "order_id", "device_id", "payload_json", "signature_hex", "expires_at", "created_at"),
+    "logs": ("id", "device_id", "direction", "payload_hash", "ok", "details", "created_at"),
+    "admin_logs": ("id", "admin_id", "admin_email", "action", "entity_type", "entity_id", "details", "ip_address", "created_at"),
+}
+
+# Parents before children, so every COPY chunk satisfies its foreign keys
+LOAD_ORDER = tuple(TABLE_COLUMNS)
+
+DEVICE_MODELS = ["RPi 4 Model B", "RPi Zero 2 W", "RPi 3 Model B+", "RPi 400"]
+DEVICE_STATUSES = [("ACTIVE", 0.85), ("OFFLINE", 0.08), ("MAINTENANCE", 0.05), ("DEACTIVATED", 0.02)]
+ADMIN_ROLES = [("admin", 0.6), ("manager", 0.25), ("device_owner", 0.1), ("super_admin", 0.05)]
+ADMIN_ACTIONS = [
+    ("LOGIN", None, 0.45), ("UPDATE_DEVICE", "device", 0.15), ("CREATE_DEVICE", "device", 0.05),
+    ("UPDATE_SERVICE", "service", 0.12), ("CREATE_SERVICE", "service", 0.05),
+    ("ASSIGN_SERVICE", "device", 0.1), ("DELETE_SERVICE", "service", 0.03), ("LOGOUT", None, 0.05),
+]
+
+# Settled orders (older than a few hours) end DONE or FAILED; recent ones are
+# still moving through the lifecycle.
+SETTLED_STATUSES = [("DONE", 0.86), ("FAILED", 0.14)]
+RECENT_STATUSES = [("CREATED", 0.12), ("PAID", 0.08), ("RUNNING", 0.3), ("DONE", 0.42), ("FAILED", 0.08)]
+RECENT_WINDOW = timedelta(hours=3)
+
+# Relative order volume by hour of day (laundromat-style evening peak)
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 6, 8, 9, 9, 9, 10, 10, 10, 11, 13, 15, 16, 15, 12, 8, 4, 2]
+
+
+@dataclass
+class Config:
+    seed: int = 42
+    end: datetime = datetime(2025, 11, 1, tzinfo=timezone.utc)
+    months: int = 6
+    admins: int = 10
+    devices: int = 200
+    services: int = 30
+    services_per_device: int = 4
+    orders_per_device: int = 200
+    admin_logs: int = 5000
+
+
+class Generator:
+    """Deterministic row generator; every random draw comes from one seeded RNG"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.start = config.end - timedelta(days=30 * config.months)
+        self.admins: List[Tuple[str, str]] = []
+        self.devices: List[Tuple[str, datetime]] = []
+        self.services: Dict[str, Dict] = {}
+        self.assignments: Dict[str, List[str]] = {}
+
+    # ---------------------------------------------------------------- helpers
+
+    def uuid(self) -> str:
+        return str(UUID(int=self.rng.getrandbits(128), version=4))
+
+    def hex(self, nbytes: int) -> str:
+        return "%0*x" % (nbytes * 2, self.rng.getrandbits(nbytes * 8))
+
+    def choice_weighted(self, options):
+        return self.rng.choices([o[0] for o in options], weights=[o[-1] for o in options])[0]
+
+    def timestamp(self, not_before: Optional[datetime] = None) -> datetime:
+        """Time in [not_before, end]; denser towards the end (growth) and in the evening"""
+        lower = max(not_before or self.start, self.start)
+        span_days = (self.config.end - lower).total_seconds() / 86400
+        day = math.floor(span_days * math.sqrt(self.rng.random()))
+        hour = self.rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+        moment = self.config.end - timedelta(days=day + 1) + timedelta(
+            hours=hour, seconds=self.rng.randrange(3600), microseconds=self.rng.randrange(1_000_000)
+        )
+        return min(max(moment, lower), self.config.end)
+
+    # ------------------------------------------------------------- generators
+
+    def gen_admins(self) -> Iterator[tuple]:
+        for i in range(self.config.admins):
+            admin_id, email = self.uuid(), f"admin{i + 1}@example.com"
+            self.admins.append((admin_id, email))
+            created = self.start - timedelta(days=self.rng.randrange(1, 90))
+            last_login = self.timestamp()
+            yield (admin_id, email, PASSWORD_HASH, self.choice_weighted(ADMIN_ROLES), last_login, created)
+
+    def gen_devices(self) -> Iterator[tuple]:
+        for i in range(self.config.devices):
+            device_id = self.uuid()
+            created = self.start + timedelta(days=self.rng.random() * 30 * self.config.months * 0.5)
+            self.devices.append((device_id, created))
+            yield (
+                device_id, f"Device {i + 1:05d}", "04" + self.hex(32),
+                self.rng.choice(DEVICE_MODELS), f"Site {self.rng.randrange(1, max(2, self.config.devices // 10))}",
+                self.rng.choice([17, 19, 27]), self.choice_weighted(DEVICE_STATUSES), created, created,
+            )
+
+    def gen_services(self) -> Iterator[tuple]:
+        for _ in range(self.config.services):
+            service_id = self.uuid()
+            service_type = self.choice_weighted([("FIXED", 0.5), ("VARIABLE", 0.3), ("TRIGGER", 0.2)])
+            fixed_minutes = self.rng.choice([30, 40, 60]) if service_type == "FIXED" else None
+            minutes_per_25c = self.rng.choice([5, 6, 10]) if service_type == "VARIABLE" else None
+            price_cents = {"FIXED": self.rng.choice([200, 250, 300, 400]), "VARIABLE": 25,
+                           "TRIGGER": self.rng.choice([100, 150, 200])}[service_type]
+            active = self.rng.random() < 0.9
+            created = self.start - timedelta(days=self.rng.randrange(1, 30))
+            self.services[service_id] = {
+                "type": service_type, "price_cents": price_cents,
+                "fixed_minutes": fixed_minutes, "minutes_per_25c": minutes_per_25c,
+            }
+            yield (service_id, service_type, price_cents, fixed_minutes, minutes_per_25c, active, created, created)
+
+    def gen_device_services(self) -> Iterator[tuple]:
+        service_ids = list(self.services)
+        per_device = min(self.config.services_per_device, len(service_ids))
+        for device_id, device_created in self.devices:
+            assigned = self.rng.sample(service_ids, per_device)
+            self.assignments[device_id] = assigned
+            for service_id in assigned:
+                yield (self.uuid(), device_id, service_id, device_created)
+
+    def _order_status(self, created: datetime) -> str:
+        if self.config.end - created < RECENT_WINDOW:
+            return self.choice_weighted(RECENT_STATUSES)
+        return self.choice_weighted(SETTLED_STATUSES)
+
+    def _order_terms(self, service: Dict) -> Tuple[int, int]:
+        if service["type"] == "FIXED":
+            return service["price_cents"], service["fixed_minutes"]
+        if service["type"] == "VARIABLE":
+            quarters = self.rng.randint(1, 12)
+            return 25 * quarters, service["minutes_per_25c"] * quarters
+        return service["price_cents"], 0
+
+    def gen_orders(self) -> Iterator[Tuple[str, tuple]]:
+        """Yield ("orders" | "authorizations" | "logs", row), each order before its children"""
+        for device_id, device_created in self.devices:
+            service_ids = self.assignments.get(device_id)
+            if not service_ids:
+                continue
+            # Skewed per-device volume: a few busy sites, a long tail of quiet ones
+            count = max(1, int(self.config.orders_per_device * self.rng.lognormvariate(-0.125, 0.5)))
+            for _ in range(count):
+                service_id = self.rng.choice(service_ids)
+                service = self.services[service_id]
+                amount_cents, minutes = self._order_terms(service)
+                created = self.timestamp(not_before=device_created)
+                status = self._order_status(created)
+                run_time = timedelta(minutes=minutes or 0, seconds=self.rng.randint(20, 90))
+                updated = min(created + (run_time if status == "DONE" else timedelta(seconds=self.rng.randint(5, 60))),
+                              self.config.end)
+                order_id = self.uuid()
+                yield "orders", (order_id, device_id, service_id, amount_cents, minutes, status, created, updated)
+
+                paid = status in ("PAID", "RUNNING", "DONE") or (status == "FAILED" and self.rng.random() < 0.3)
+                if paid:
+                    auth_created = created + timedelta(seconds=self.rng.randint(2, 20))
+                    expires = auth_created + timedelta(minutes=5)
+                    payload = {
+                        "deviceId": device_id, "orderId": order_id, "type": service["type"],
+                        "seconds": minutes * 60 if minutes else 2, "nonce": self.hex(6),
+                        "exp": int(expires.timestamp()),
+                    }
+                    yield "authorizations", (
+                        self.uuid(), order_id, device_id, json.dumps(payload, separators=(",", ":")),
+                        "3045" + self.hex(68), expires, auth_created,
+                    )
+
+                for event, ok, at in self._telemetry(status, created, updated):
+                    yield "logs", (
+                        self.uuid(), device_id, "PI_TO_SRV", f"sha256:{self.hex(6)}", ok,
+                        f"{event} event received", at,
+                    )
+
+    def _telemetry(self, status: str, created: datetime, updated: datetime):
+        started = created + timedelta(seconds=self.rng.randint(20, 60))
+        if status in ("RUNNING", "DONE"):
+            yield "STARTED", True, min(started, self.config.end)
+        if status == "DONE":
+            yield "DONE", True, updated
+        if status == "FAILED" and self.rng.random() < 0.5:
+            yield "ERROR", False, updated
+
+    def gen_admin_logs(self) -> Iterator[tuple]:
+        if not self.admins:
+            return
+        device_ids = [d for d, _ in self.devices]
+        service_ids = list(self.services)
+        for _ in range(self.config.admin_logs):
+            admin_id, email = self.rng.choice(self.admins)
+            action, entity_type, _ = self.rng.choices(ADMIN_ACTIONS, weights=[a[2] for a in ADMIN_ACTIONS])[0]
+            entity_id = None
+            if entity_type == "device" and device_ids:
+                entity_id = self.rng.choice(device_ids)
+            elif entity_type == "service" and service_ids:
+                entity_id = self.rng.choice(service_ids)
+            ip = f"10.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randrange(1, 255)}"
+            yield (self.uuid(), admin_id, email, action, entity_type, entity_id,
+                   f"{action.replace('_', ' ').title()} via admin console", ip, self.timestamp())
+
+    def tables(self) -> Iterator[Tuple[str, tuple]]:
+        """Every row in load order as (table, row)"""
+        for table, generator in (
+            ("admins", self.gen_admins), ("devices", self.gen_devices), ("services", self.gen_services),
+            ("device_services", self.gen_device_services),
+        ):
+            for row in generator():
+                yield table, row
+        yield from self.gen_orders()
+        for row in self.gen_admin_logs():
+            yield "admin_logs", row
+
+
+# ------------------------------------------------------------------- loading
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class CopyBuffer:
+    """Per-table text-format COPY buffers flushed in foreign-key order"""
+
+    def __init__(self, cursor, chunk_rows: int):
+        self.cursor = cursor
+        self.chunk_rows = chunk_rows
+        self.buffers = {table: io.StringIO() for table in LOAD_ORDER}
+        self.pending = {table: 0 for table in LOAD_ORDER}
+        self.counts = {table: 0 for table in LOAD_ORDER}
+        self.digest = hashlib.sha256()
+
+    def add(self, table: str, row: Sequence) -> None:
+        line = "\t".join(_copy_value(v) for v in row) + "\n"
+        self.buffers[table].write(line)
+        self.digest.update(line.encode())
+        self.pending[table] += 1
+        self.counts[table] += 1
+        if self.pending[table] >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        for table in LOAD_ORDER:
+            if not self.pending[table]:
+                continue
+            buffer = self.buffers[table]
+            if self.cursor is not None:
+                buffer.seek(0)
+                columns = ", ".join(TABLE_COLUMNS[table])
+                self.cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT text)", buffer)
+            self.buffers[table] = io.StringIO()
+            self.pending[table] = 0
+
+
+def load(conn, config: Config, truncate: bool = False, chunk_rows: int = 50_000) -> Dict[str, int]:
+    """Generate and COPY all rows in one transaction (conn=None only generates)"""
+    cursor = conn.cursor() if conn is not None else None
+    if cursor is not None:
+        cursor.execute("SET synchronous_commit = off")
+        if truncate:
+            cursor.execute(f"TRUNCATE TABLE {', '.join(LOAD_ORDER)} CASCADE")
+
+    copier = CopyBuffer(cursor, chunk_rows)
+    for table, row in Generator(config).tables():
+        copier.add(table, row)
+    copier.flush()
+
+    if conn is not None:
+        conn.commit()
+        conn.autocommit = True
+        cursor.execute(f"ANALYZE {', '.join(LOAD_ORDER)}")
+        conn.autocommit = False
+
+    counts = dict(copier.counts)
+    counts["_sha256"] = copier.digest.hexdigest()
+    return counts
+
+
+def main() -> None:
+    defaults = Config()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=None, help="Defaults to DATABASE_URL from app settings")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--end", default=defaults.end.date().isoformat(), help="Latest timestamp (UTC date)")
+    parser.add_argument("--months", type=int, default=defaults.months)
+    parser.add_argument("--admins", type=int, default=defaults.admins)
+    parser.add_argument("--devices", type=int, default=defaults.devices)
+    parser.add_argument("--services", type=int, default=defaults.services)
+    parser.add_argument("--services-per-device", type=int, default=defaults.services_per_device)
+    parser.add_argument("--orders-per-device", type=int, default=defaults.orders_per_device)
+    parser.add_argument("--admin-logs", type=int, default=defaults.admin_logs)
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE the generated tables first")
+    parser.add_argument("--dry-run", action="store_true", help="Generate rows without a database")
+    args = parser.parse_args()
+
+    config = Config(
+        seed=args.seed,
+        end=datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc),
+        months=args.months, admins=args.admins, devices=args.devices, services=args.services,
+        services_per_device=args.services_per_device, orders_per_device=args.orders_per_device,
+        admin_logs=args.admin_logs,
+    )
+
+    conn = None
+    if not args.dry_run:
+        import psycopg2
+        from app.core.config import settings
+        conn = psycopg2.connect(args.dsn or settings.DATABASE_URL)
+
+    started = time.perf_counter()
+    try:
+        counts = load(conn, config, truncate=args.truncate, chunk_rows=args.chunk_rows)
+    finally:
+        if conn is not None:
+            conn.close()
+    elapsed = time.perf_counter() - started
+
+    digest = counts.pop("_sha256")
+    total = sum(counts.values())
+    print_table(
+        f"{'Generated' if args.dry_run else 'Loaded'} {total:,} rows in {elapsed:.1f}s "
+        f"({total / elapsed:,.0f} rows/s), seed={config.seed}",
+        ["table", "rows"],
+        [[table, f"{count:,}"] for table, count in counts.items()],
+    )
+    print(f"\nData fingerprint: {digest[:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+End-to-end HTTP load test for the purchase flow
+
+Simulates concurrent kiosk customers running the full flow
+    device lookup -> order create -> payment -> authorization -> telemetry STARTED/DONE
+plus admin dashboard viewers polling the console endpoints, against a running
+backend. Reports throughput, latency percentiles and error rates per step and
+compares against a stored baseline.
+
+    cd backend
+    python -m benchmarks.stripe_standin --latency-ms 120 &
+    STRIPE_SECRET_KEY=sk_test_loadtest STRIPE_API_BASE=http://127.0.0.1:12111 \\
+        uvicorn app.main:app --port 8000 --workers 4 &
+    python -m benchmarks.loadtest --customers 50 --admins 5 --duration 60 --save-baseline baseline.json
+    python -m benchmarks.loadtest --customers 50 --admins 5 --duration 60 --baseline baseline.json
+
+Devices are discovered through /admin/devices/all (ACTIVE devices with active
+services), so load a dataset first (benchmarks.datagen, or database/seed.sql with
+--admin-email admin@remoteled.com). Both give every admin the password 'password123'.
+Exits with status 1 when --baseline is given and a step regressed.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks._harness import print_table
+
+CUSTOMER_STEPS = [
+    "device_lookup", "order_create", "payment", "authorization", "telemetry_started", "telemetry_done",
+]
+ADMIN_ENDPOINTS = {
+    "admin_overview": "/admin/stats/overview",
+    "admin_orders_live": "/admin/orders/live",
+    "admin_devices_all": "/admin/devices/all",
+    "admin_orders_recent": "/admin/orders/recent",
+}
+PERCENTILES = (50, 90, 95, 99)
+
+
+class StepFailed(Exception):
+    """A flow step returned an unexpected status; the rest of the flow is skipped"""
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Latencies, errors and status codes per step"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, step: str, client: httpx.AsyncClient, method: str, url: str,
+                   expect: int = 200, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[step].append((time.perf_counter() - started) * 1000)
+            self.errors[step] += 1
+            self.statuses[step][type(e).__name__] += 1
+            raise StepFailed(f"{step}: {e!r}") from e
+
+        self.latencies[step].append((time.perf_counter() - started) * 1000)
+        self.statuses[step][str(response.status_code)] += 1
+        if response.status_code != expect:
+            self.errors[step] += 1
+            raise StepFailed(f"{step}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    def summary(self, elapsed: float) -> Dict[str, Dict]:
+        steps = {}
+        for step, values in self.latencies.items():
+            values = sorted(values)
+            steps[step] = {
+                "requests": len(values),
+                "errors": self.errors[step],
+                "error_rate": self.errors[step] / len(values),
+                "rps": len(values) / elapsed,
+                **{f"p{p}_ms": percentile(values, p) for p in PERCENTILES},
+                "max_ms": values[-1],
+                "statuses": dict(self.statuses[step]),
+            }
+        return steps
+
+
+async def admin_login(client: httpx.AsyncClient, recorder: Recorder, email: str, password: str) -> Dict[str, str]:
+    response = await recorder.call("admin_login", client, "POST", "/auth/login",
+                                   json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def discover_devices(client: httpx.AsyncClient, headers: Dict[str, str], limit: int) -> List[str]:
+    response = await client.get("/admin/devices/all", headers=headers)
+    response.raise_for_status()
+    devices = [
+        row["id"] for row in response.json()
+        if row.get("status") == "ACTIVE" and row.get("active_service_count", 0) > 0
+    ]
+    return devices[:limit] if limit else devices
+
+
+def order_amount(service: Dict) -> int:
+    if service["type"] == "VARIABLE":
+        return 100  # four quarters
+    return service["price_cents"]
+
+
+async def customer_flow(client: httpx.AsyncClient, recorder: Recorder, device_id: str, rng: random.Random) -> None:
+    """One purchase, as the kiosk app performs it"""
+    full = (await recorder.call("device_lookup", client, "GET", f"/devices/{device_id}/full")).json()
+    services = [s for s in full["services"] if s["active"]]
+    if not services:
+        raise StepFailed(f"device {device_id} has no active services")
+    service = rng.choice(services)
+    amount_cents = order_amount(service)
+
+    order = (await recorder.call("order_create", client, "POST", "/orders", expect=201, json={
+        "device_id": device_id, "service_id": service["id"], "amount_cents": amount_cents,
+    })).json()
+
+    payment = (await recorder.call("payment", client, "POST", "/payments/stripe/payment-and-trigger", json={
+        "amount_cents": amount_cents, "device_id": device_id, "order_id": order["id"], "skip_led": True,
+    })).json()
+    if payment["payment_status"] != "succeeded":
+        raise StepFailed(f"payment: status {payment['payment_status']}")
+
+    await recorder.call("authorization", client, "POST", "/authorizations", expect=201,
+                        json={"order_id": order["id"]})
+
+    for event, step in (("STARTED", "telemetry_started"), ("DONE", "telemetry_done")):
+        await recorder.call(step, client, "POST", f"/devices/{device_id}/telemetry", expect=201,
+                            json={"event": event, "order_id": order["id"]})
+
+
+async def run_customer(client, recorder, devices, deadline, think_time, seed) -> None:
+    rng = random.Random(seed)
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            await customer_flow(client, recorder, rng.choice(devices), rng)
+        except StepFailed:
+            recorder.errors["flow"] += 1
+            recorder.statuses["flow"]["aborted"] += 1
+        recorder.latencies["flow"].append((time.perf_counter() - started) * 1000)
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, 2 * think_time))
+
+
+async def run_admin(client, recorder, headers, deadline, poll_interval, seed) -> None:
+    rng = random.Random(seed)
+    # Spread the first poll so viewers do not arrive in lockstep
+    await asyncio.sleep(rng.uniform(0, poll_interval))
+    while time.monotonic() < deadline:
+        for step, path in ADMIN_ENDPOINTS.items():
+            try:
+                await recorder.call(step, client, "GET", path, headers=headers)
+            except StepFailed:
+                pass
+        await asyncio.sleep(poll_interval)
+
+
+async def run(args) -> Dict:
+    limits = httpx.Limits(max_connections=args.customers + args.admins + 4)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as client:
+        setup = Recorder()
+        headers = await admin_login(client, setup, args.admin_email, args.admin_password)
+        devices = await discover_devices(client, headers, args.device_limit)
+        if not devices:
+            raise SystemExit("No ACTIVE devices with active services found; load seed.sql or run benchmarks.datagen")
+        print(f"Running {args.customers} customers and {args.admins} admin viewers against "
+              f"{len(devices)} devices for {args.duration}s...")
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = time.monotonic() + args.duration
+        tasks = [
+            run_customer(client, recorder, devices, deadline, args.think_time, args.seed + i)
+            for i in range(args.customers)
+        ]
+        for i in range(args.admins):
+            admin_headers = headers if i == 0 else await admin_login(
+                client, recorder, args.admin_email, args.admin_password
+            )
+            tasks.append(run_admin(client, recorder, admin_headers, deadline, args.poll_interval, args.seed + 10_000 + i))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "base_url": args.base_url, "customers": args.customers, "admins": args.admins,
+            "duration": args.duration, "think_time": args.think_time, "poll_interval": args.poll_interval,
+            "devices": len(devices),
+        },
+        "elapsed_seconds": elapsed,
+        "steps": recorder.summary(elapsed),
+    }
+
+
+def report(result: Dict) -> None:
+    order = ["flow"] + CUSTOMER_STEPS + ["admin_login"] + list(ADMIN_ENDPOINTS)
+    steps = result["steps"]
+    rows = []
+    for step in order:
+        if step not in steps:
+            continue
+        s = steps[step]
+        rows.append([step, s["requests"], f"{s['error_rate']:.2%}", s["rps"],
+                     *[s[f"p{p}_ms"] for p in PERCENTILES], s["max_ms"]])
+    print_table(
+        f"Load test: {result['elapsed_seconds']:.1f}s",
+        ["step", "requests", "errors", "req/s", *[f"p{p}_ms" for p in PERCENTILES], "max_ms"],
+        rows,
+    )
+    failing = {step: s["statuses"] for step, s in steps.items() if s["errors"]}
+    if failing:
+        print("\nNon-success responses:")
+        for step, statuses in failing.items():
+            print(f"  {step}: {statuses}")
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print step deltas against a baseline and return the regressions"""
+    regressions = []
+    rows = []
+    for step, current in result["steps"].items():
+        previous = baseline.get("steps", {}).get(step)
+        if previous is None:
+            continue
+        p95_change = current["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0.0
+        rps_change = current["rps"] / previous["rps"] - 1 if previous["rps"] else 0.0
+        error_change = current["error_rate"] - previous["error_rate"]
+        flags = []
+        if p95_change > threshold:
+            flags.append("p95")
+        if rps_change < -threshold:
+            flags.append("throughput")
+        if error_change > 0.01:
+            flags.append("errors")
+        if flags:
+            regressions.append(f"{step}: {', '.join(flags)}")
+        rows.append([step, previous["p95_ms"], current["p95_ms"], f"{p95_change:+.1%}",
+                     f"{rps_change:+.1%}", f"{error_change:+.2%}", ", ".join(flags) or "ok"])
+    print_table(
+        f"Against baseline (threshold {threshold:.0%})",
+        ["step", "base_p95_ms", "p95_ms", "p95", "req/s", "error_rate", "regressed"],
+        rows,
+    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--customers", type=int, default=20, help="Concurrent kiosk customers")
+    parser.add_argument("--admins", type=int, default=2, help="Concurrent admin dashboard viewers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a customer's flows")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Admin dashboard refresh interval")
+    parser.add_argument("--device-limit", type=int, default=0, help="Use at most N devices (0 = all)")
+    parser.add_argument("--admin-email", default="admin1@example.com",
+                        help="Defaults to the first benchmarks.datagen admin; use admin@remoteled.com with seed.sql")
+    parser.add_argument("--admin-password", default="password123")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the full result as JSON")
+    parser.add_argument("--save-baseline", help="Store this run as the baseline")
+    parser.add_argument("--baseline", help="Compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95/throughput change (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    report(result)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print("\nRegressed: " + "; ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Query plan regression harness
+
+Walks the API routes in-process (TestClient) against a disposable database,
+captures every SQL statement the routers issue, then runs each read with
+EXPLAIN (ANALYZE, BUFFERS) inside a rolled-back transaction. INSERT/UPDATE/DELETE
+(also inside WITH) get a plain EXPLAIN: replaying them would hit rows the walk
+already wrote (e.g. unique_order_authorization). Flags sequential scans on
+large tables and, against a saved baseline, plan-shape changes and slowdowns.
+Writes a Markdown report with every plan.
+
+    cd backend
+    python -m benchmarks.datagen --truncate --devices 1000 --orders-per-device 1000
+    python -m benchmarks.query_plans --save-baseline        # .benchmarks/query_plans.json
+    python -m benchmarks.query_plans --baseline             # exits 1 on plan change / slowdown
+
+The route walk creates an order (plus authorization and telemetry) and runs
+one order sweep, so never point it at a database you care about.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import re
+import statistics
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks._harness import ROOT_DIR, print_table
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+DEFAULT_BASELINE = ROOT_DIR / ".benchmarks" / "query_plans.json"
+DEFAULT_REPORT = ROOT_DIR / ".benchmarks" / "query_plans.md"
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# Data-modifying statements; "FOR UPDATE" row locks do not match
+WRITE_PATTERN = re.compile(r"^(INSERT|UPDATE|DELETE)\b|\bINSERT\s+INTO\b|\bDELETE\s+FROM\b|\bUPDATE\s+\S+(\s+(AS\s+)?\w+)?\s+SET\b", re.I)
+SHAPE_KEYS = ("Node Type", "Join Type", "Strategy", "Relation Name", "Index Name", "Parent Relationship")
+
+
+def normalize(query) -> str:
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    return " ".join(query.split())
+
+
+def query_id(template: str) -> str:
+    return hashlib.sha1(template.encode()).hexdigest()[:10]
+
+
+def modifies_data(template: str) -> bool:
+    return bool(WRITE_PATTERN.search(template))
+
+
+# ------------------------------------------------------------------- capture
+
+class Capture:
+    """Records (template, literal SQL) for statements run through TimedCursor"""
+
+    def __init__(self):
+        self.step = "setup"
+        self.statements: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def install(self) -> None:
+        from app.core.database import TimedCursor
+
+        original = TimedCursor.execute
+        capture = self
+
+        def recording_execute(cursor, query, vars=None):
+            template = normalize(query)
+            if template.split(" ", 1)[0].upper() in EXPLAINABLE:
+                entry = capture.statements.setdefault(template, {
+                    "id": query_id(template), "template": template,
+                    "sql": normalize(cursor.mogrify(query, vars)), "steps": [],
+                })
+                if capture.step not in entry["steps"]:
+                    entry["steps"].append(capture.step)
+            return original(cursor, query, vars)
+
+        TimedCursor.execute = recording_execute
+
+
+def sample_ids(conn) -> Dict[str, str]:
+    """Busiest active device plus an assigned service, a DONE order and an authorization"""
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor.execute("""
+        SELECT o.device_id, COUNT(*) AS n FROM orders o
+        JOIN devices d ON d.id = o.device_id AND d.status = 'ACTIVE'
+        GROUP BY o.device_id ORDER BY n DESC LIMIT 1
+    """)
+    row = cursor.fetchone()
+    if row is None:
+        raise SystemExit("No orders found; load data with benchmarks.datagen first")
+    ids = {"device_id": str(row["device_id"])}
+    cursor.execute("""
+        SELECT s.id, s.type, s.price_cents FROM device_services ds
+        JOIN services s ON s.id = ds.service_id AND s.active
+        WHERE ds.device_id = %s ORDER BY s.type = 'TRIGGER', s.id LIMIT 1
+    """, (ids["device_id"],))
+    service = cursor.fetchone()
+    ids["service_id"] = str(service["id"])
+    ids["amount_cents"] = 100 if service["type"] == "VARIABLE" else service["price_cents"]
+    cursor.execute("""
+        SELECT a.id, a.order_id FROM authorizations a
+        WHERE a.device_id = %s ORDER BY a.created_at DESC LIMIT 1
+    """, (ids["device_id"],))
+    auth = cursor.fetchone()
+    ids["authorization_id"] = str(auth["id"]) if auth else ids["device_id"]
+    ids["order_id"] = str(auth["order_id"]) if auth else ids["device_id"]
+    cursor.execute("SELECT id, email FROM admins ORDER BY created_at LIMIT 1")
+    admin = cursor.fetchone()
+    ids["admin_id"], ids["admin_email"] = str(admin["id"]), admin["email"]
+    conn.rollback()
+    return ids
+
+
+def walk_routes(capture: Capture, ids: Dict[str, str], password: str) -> List[Tuple[str, int]]:
+    """Exercise every read route plus the purchase flow; returns (step, status) pairs"""
+    from fastapi.testclient import TestClient
+
+    from app.core.auth import create_access_token
+    from app.main import app
+    from app.services.order_sweeper import order_sweeper
+
+    # No context manager: startup hooks (health checker, sweeper thread) stay off
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(ids['admin_email'], ids['admin_id'])}"}
+    d, o = ids["device_id"], ids["order_id"]
+    statuses = []
+
+    def call(method: str, path: str, **kwargs):
+        capture.step = f"{method} {path.format(**ids)}" if "{" in path else f"{method} {path}"
+        response = client.request(method, path.format(**ids), headers=headers, **kwargs)
+        statuses.append((capture.step, response.status_code))
+        return response
+
+    call("POST", "/auth/login", json={"email": ids["admin_email"], "password": password})
+    call("GET", "/auth/me")
+    for path in (
+        "/devices/{device_id}", "/devices/{device_id}/services", "/devices/{device_id}/full",
+        "/devices/{device_id}/logs", "/orders/{order_id}", "/authorizations/{authorization_id}",
+        "/authorizations/order/{order_id}",
+        "/admin/stats/overview", "/admin/stats/orders-last-7-days", "/admin/stats/device-status",
+        "/admin/devices/all", "/admin/orders/recent?limit=500", "/admin/orders/live",
+        "/admin/orders/stats/realtime", "/admin/services/all", "/admin/logs/recent?limit=500",
+        "/admin/logs/recent?error_only=true&limit=500", "/admin/logs/admin-actions?limit=500",
+        "/admin/devices/{device_id}/services", "/admin/device-models", "/admin/locations",
+        "/admin/service-types",
+    ):
+        call("GET", path)
+
+    order = call("POST", "/orders", json={
+        "device_id": d, "service_id": ids["service_id"], "amount_cents": ids["amount_cents"],
+    })
+    if order.status_code == 201:
+        ids["new_order_id"] = order.json()["id"]
+        call("PATCH", "/orders/{new_order_id}/status", json={"status": "PAID"})
+        call("POST", "/authorizations", json={"order_id": ids["new_order_id"]})
+        call("POST", "/devices/{device_id}/telemetry", json={"event": "STARTED", "order_id": ids["new_order_id"]})
+        call("POST", "/devices/{device_id}/telemetry", json={"event": "DONE", "order_id": ids["new_order_id"]})
+
+    capture.step = "order_sweeper.sweep"
+    order_sweeper.sweep()
+    statuses.append((capture.step, 0))
+    return statuses
+
+
+# ------------------------------------------------------------------- explain
+
+def large_tables(conn, min_rows: int) -> Dict[str, int]:
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.relname, c.reltuples::bigint FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind = 'r' AND n.nspname = current_schema() AND c.reltuples >= %s
+    """, (min_rows,))
+    tables = dict(cursor.fetchall())
+    conn.rollback()
+    return tables
+
+
+def walk_plan(node: Dict, depth: int = 0):
+    yield depth, node
+    for child in node.get("Plans", []):
+        yield from walk_plan(child, depth + 1)
+
+
+def plan_shape(node: Dict) -> str:
+    """Node types, join strategies, relations and indexes; ignores costs and row counts"""
+    label = "/".join(str(node[k]) for k in SHAPE_KEYS if k in node)
+    children = ",".join(plan_shape(child) for child in node.get("Plans", []))
+    return f"{label}({children})" if children else label
+
+
+def render_plan(root: Dict) -> List[str]:
+    lines = []
+    for depth, node in walk_plan(root):
+        label = node["Node Type"]
+        if "Relation Name" in node:
+            label += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+        if "Actual Rows" in node:
+            lines.append(
+                f"{'  ' * depth}-> {label}  (rows={node['Actual Rows']} loops={node.get('Actual Loops', 1)} "
+                f"time={node.get('Actual Total Time', 0):.3f}ms hit={node.get('Shared Hit Blocks', 0)} "
+                f"read={node.get('Shared Read Blocks', 0)})"
+            )
+        else:
+            lines.append(f"{'  ' * depth}-> {label}  (estimated rows={node.get('Plan Rows', 0)} "
+                         f"cost={node.get('Total Cost', 0):.2f})")
+        for key in ("Index Cond", "Hash Cond", "Filter", "Sort Key"):
+            if key in node:
+                value = ", ".join(node[key]) if isinstance(node[key], list) else node[key]
+                lines.append(f"{'  ' * depth}     {key}: {value}")
+    return lines
+
+
+def explain(conn, statement: Dict, runs: int, large: Dict[str, int]) -> Dict:
+    """Median of `runs` EXPLAIN ANALYZE runs; writes are planned once and never executed"""
+    analyze = not modifies_data(statement["template"])
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "SUMMARY, FORMAT JSON"
+    cursor = conn.cursor()
+    timings, planning, plan = [], [], None
+    for _ in range(runs if analyze else 1):
+        try:
+            cursor.execute(f"EXPLAIN ({options}) " + statement["sql"])
+            result = cursor.fetchone()[0]
+        except psycopg2.Error as e:
+            conn.rollback()
+            return {"error": str(e).strip()}
+        finally:
+            if not conn.closed:
+                conn.rollback()
+        plan = json.loads(result) if isinstance(result, str) else result
+        if analyze:
+            timings.append(plan[0]["Execution Time"])
+        planning.append(plan[0]["Planning Time"])
+
+    root = plan[0]["Plan"]
+    seq_scans = sorted({
+        node["Relation Name"] for _, node in walk_plan(root)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in large
+    })
+    return {
+        "analyzed": analyze,
+        "execution_ms": statistics.median(timings) if timings else None,
+        "planning_ms": statistics.median(planning),
+        "shared_hit": root.get("Shared Hit Blocks", 0),
+        "shared_read": root.get("Shared Read Blocks", 0),
+        "seq_scans": seq_scans,
+        "shape": plan_shape(root),
+        "plan": render_plan(root),
+    }
+
+
+# -------------------------------------------------------------------- report
+
+def static_statements() -> List[Tuple[str, str]]:
+    """(location, template) for every literal SQL passed to .execute() in app/"""
+    found = []
+    for path in sorted((ROOT_DIR / "app").rglob("*.py")):
+        tree = ast.parse(path.read_text(), str(path))
+        constants = {
+            target.id: node.value.value
+            for node in ast.walk(tree) if isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+            for target in node.targets if isinstance(target, ast.Name)
+        }
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "execute" and node.args):
+                continue
+            arg = node.args[0]
+            sql = arg.value if isinstance(arg, ast.Constant) else constants.get(getattr(arg, "id", None))
+            if isinstance(sql, str) and normalize(sql).split(" ", 1)[0].upper() in EXPLAINABLE:
+                found.append((f"{path.relative_to(ROOT_DIR)}:{node.lineno}", normalize(sql)))
+    return found
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, threshold: float, min_delta_ms: float) -> None:
+    """Annotate results with plan_changed / slower flags against the baseline"""
+    for qid, result in results.items():
+        previous = baseline["queries"].get(qid)
+        if previous is None or "error" in result or "error" in previous:
+            continue
+        result["plan_changed"] = previous["shape"] != result["shape"]
+        if result["execution_ms"] is None or previous["execution_ms"] is None:
+            continue
+        result["baseline_ms"] = previous["execution_ms"]
+        delta = result["execution_ms"] - previous["execution_ms"]
+        result["slower"] = delta > min_delta_ms and result["execution_ms"] > previous["execution_ms"] * (1 + threshold)
+
+
+def flags(result: Dict) -> List[str]:
+    if "error" in result:
+        return ["error"]
+    out = [f"seq scan: {', '.join(result['seq_scans'])}"] if result["seq_scans"] else []
+    if not result["analyzed"]:
+        out.append("write, not executed")
+    if result.get("plan_changed"):
+        out.append("plan changed")
+    if result.get("slower"):
+        out.append("slower")
+    return out
+
+
+def format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def write_report(path: Path, statements: Dict[str, Dict], results: Dict[str, Dict],
+                 large: Dict[str, int], statuses, unexercised) -> None:
+    lines = ["# Query plan report", ""]
+    lines.append("Large tables: " + ", ".join(f"{t} (~{n:,} rows)" for t, n in sorted(large.items())))
+    lines += ["", "| id | first step | exec ms | baseline ms | flags |", "|---|---|---|---|---|"]
+    for qid, result in results.items():
+        statement = statements[qid]
+        lines.append(
+            f"| `{qid}` | {statement['steps'][0]} | {format_ms(result.get('execution_ms'))} | "
+            f"{result.get('baseline_ms', '')} | {'; '.join(flags(result))} |"
+        )
+    for qid, result in results.items():
+        statement = statements[qid]
+        lines += ["", f"## `{qid}`", "", "Steps: " + ", ".join(statement["steps"]), ""]
+        lines += ["```sql", statement["sql"], "```", ""]
+        if "error" in result:
+            lines.append(f"EXPLAIN failed: {result['error']}")
+            continue
+        lines += [f"Flags: {'; '.join(flags(result)) or 'none'}", "", "```", *result["plan"], "```"]
+    failed = [(step, status) for step, status in statuses if status >= 400]
+    if failed:
+        lines += ["", "## Route walk errors", ""] + [f"- {step}: HTTP {status}" for step, status in failed]
+    if unexercised:
+        lines += ["", "## Statements not exercised by the route walk", ""]
+        lines += [f"- {location}: `{template[:120]}`" for location, template in unexercised]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=None, help="Defaults to DATABASE_URL from app settings")
+    parser.add_argument("--password", default="password123", help="Admin password for the /auth/login step")
+    parser.add_argument("--runs", type=int, default=3, help="EXPLAIN ANALYZE runs per read statement (median)")
+    parser.add_argument("--large-table-rows", type=int, default=10_000, help="Flag seq scans on tables this big")
+    parser.add_argument("--report", default=str(DEFAULT_REPORT))
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH")
+    parser.add_argument("--baseline", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed execution time increase (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--strict", action="store_true", help="Also fail on seq scans of large tables")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.core.database import db
+
+    dsn = args.dsn or settings.DATABASE_URL
+    db.connection_string = dsn
+    conn = psycopg2.connect(dsn)
+
+    try:
+        ids = sample_ids(conn)
+        capture = Capture()
+        capture.install()
+        statuses = walk_routes(capture, ids, args.password)
+        statements = {s["id"]: s for s in capture.statements.values()}
+        large = large_tables(conn, args.large_table_rows)
+        results = {qid: explain(conn, statement, args.runs, large) for qid, statement in statements.items()}
+    finally:
+        conn.close()
+
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text()), args.threshold, args.min_delta_ms)
+
+    captured = {s["template"] for s in statements.values()}
+    unexercised = [(loc, sql) for loc, sql in static_statements() if sql not in captured]
+    write_report(Path(args.report), statements, results, large, statuses, unexercised)
+
+    print_table(
+        f"{len(results)} statements from {len(statuses)} route calls",
+        ["id", "first step", "exec_ms", "hit", "read", "flags"],
+        [[qid, statements[qid]["steps"][0][:48], format_ms(r.get("execution_ms")),
+          r.get("shared_hit", 0), r.get("shared_read", 0), "; ".join(flags(r))] for qid, r in results.items()],
+    )
+    print(f"\nReport: {args.report} ({len(unexercised)} statements in app/ not exercised)")
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"queries": {
+            qid: {k: v for k, v in r.items() if k != "plan"} for qid, r in results.items()
+        }}, indent=2))
+        print(f"Saved baseline to {path}")
+
+    failing = [
+        qid for qid, r in results.items()
+        if "error" in r or r.get("plan_changed") or r.get("slower") or (args.strict and r["seq_scans"])
+    ]
+    if failing:
+        print(f"\nFlagged: {', '.join(failing)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
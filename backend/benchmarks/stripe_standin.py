@@ -0,0 +1,103 @@
+"""
+Local Stripe stand-in for load tests
+
+Implements the PaymentIntent calls made by /payments/stripe/payment-and-trigger
+(create, confirm, retrieve) with configurable latency and decline rate, so load
+tests never hit api.stripe.com. Point the backend at it with:
+
+    STRIPE_SECRET_KEY=sk_test_loadtest STRIPE_API_BASE=http://127.0.0.1:12111
+
+    cd backend
+    python -m benchmarks.stripe_standin --port 12111 --latency-ms 120 --decline-rate 0.02
+"""
+import argparse
+import asyncio
+import random
+import time
+from itertools import count
+from typing import Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0, decline_rate: float = 0.0, seed: int = 0) -> FastAPI:
+    app = FastAPI(title="Stripe stand-in", docs_url=None, redoc_url=None, openapi_url=None)
+    rng = random.Random(seed)
+    ids = count(1)
+    intents: Dict[str, Dict] = {}
+
+    async def simulate_latency() -> None:
+        delay = latency_ms + rng.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def not_found(intent_id: str) -> JSONResponse:
+        return JSONResponse(status_code=404, content={"error": {
+            "type": "invalid_request_error", "code": "resource_missing",
+            "message": f"No such payment_intent: '{intent_id}'", "param": "intent",
+        }})
+
+    @app.post("/v1/payment_intents")
+    async def create_payment_intent(request: Request):
+        await simulate_latency()
+        form = await request.form()
+        intent_id = f"pi_standin_{next(ids):010d}"
+        intents[intent_id] = {
+            "id": intent_id,
+            "object": "payment_intent",
+            "amount": int(form.get("amount", 0)),
+            "currency": form.get("currency", "usd"),
+            "customer": form.get("customer"),
+            "description": form.get("description"),
+            "metadata": {key[9:-1]: value for key, value in form.items() if key.startswith("metadata[")},
+            "status": "requires_payment_method",
+            "client_secret": f"{intent_id}_secret_standin",
+            "created": int(time.time()),
+            "livemode": False,
+        }
+        return intents[intent_id]
+
+    @app.post("/v1/payment_intents/{intent_id}/confirm")
+    async def confirm_payment_intent(intent_id: str):
+        await simulate_latency()
+        intent = intents.get(intent_id)
+        if intent is None:
+            return not_found(intent_id)
+        if rng.random() < decline_rate:
+            intent["status"] = "requires_payment_method"
+            return JSONResponse(status_code=402, content={"error": {
+                "type": "card_error", "code": "card_declined", "decline_code": "generic_decline",
+                "message": "Your card was declined.", "payment_intent": intent,
+            }})
+        intent["status"] = "succeeded"
+        return intent
+
+    @app.get("/v1/payment_intents/{intent_id}")
+    async def retrieve_payment_intent(intent_id: str):
+        await simulate_latency()
+        intent = intents.get(intent_id)
+        return intent if intent is not None else not_found(intent_id)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Mean simulated Stripe latency")
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--decline-rate", type=float, default=0.0, help="Fraction of confirms declined (402)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms, args.decline_rate, args.seed),
+        host=args.host, port=args.port, log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
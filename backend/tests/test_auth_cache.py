@@ -0,0 +1,126 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+import app.core.auth as auth_module
+from app.core.auth import create_access_token, invalidate_admin_cache
+
+
+class FakeCursor:
+    def __init__(self, admins: Dict[str, Dict], queries: List[str]) -> None:
+        self.admins = admins
+        self.queries = queries
+        self._last_row: Optional[Dict] = None
+
+    def execute(self, query: str, params=None) -> None:
+        normalized = " ".join(query.strip().split())
+        self.queries.append(normalized)
+        if normalized.startswith("SELECT id, email, role FROM admins WHERE id = %s"):
+            admin = self.admins.get(params[0])
+            self._last_row = dict(admin) if admin else None
+        else:
+            raise NotImplementedError(f"Unsupported query in fake cursor: {normalized}")
+
+    def fetchone(self) -> Optional[Dict]:
+        return self._last_row
+
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        self.admins: Dict[str, Dict] = {}
+        self.queries: List[str] = []
+
+    @contextmanager
+    def get_cursor(self):
+        yield FakeCursor(self.admins, self.queries)
+
+
+@pytest.fixture
+def fake_db(monkeypatch) -> FakeDatabase:
+    database = FakeDatabase()
+    monkeypatch.setattr(auth_module, "db", database)
+    auth_module._token_cache.clear()
+    invalidate_admin_cache()
+    return database
+
+
+@pytest.fixture
+def client(fake_db: FakeDatabase) -> TestClient:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def add_admin(fake_db: FakeDatabase) -> Dict:
+    admin = {"id": str(uuid4()), "email": "admin@example.com", "role": "admin"}
+    fake_db.admins[admin["id"]] = admin
+    return admin
+
+
+def test_repeated_requests_use_cached_admin(client: TestClient, fake_db: FakeDatabase) -> None:
+    admin = add_admin(fake_db)
+    headers = {"Authorization": f"Bearer {create_access_token(admin['email'], admin['id'])}"}
+
+    for _ in range(5):
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["email"] == admin["email"]
+
+    assert len(fake_db.queries) == 1
+    stats = auth_module.auth_cache_stats()
+    assert stats["tokens"]["hits"] == 4
+    assert stats["admins"]["hits"] == 4
+
+
+def test_deleted_admin_is_rejected_after_invalidation(client: TestClient, fake_db: FakeDatabase) -> None:
+    admin = add_admin(fake_db)
+    headers = {"Authorization": f"Bearer {create_access_token(admin['email'], admin['id'])}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    del fake_db.admins[admin["id"]]
+    invalidate_admin_cache(admin["id"])
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_token_for_other_email_is_rejected(client: TestClient, fake_db: FakeDatabase) -> None:
+    admin = add_admin(fake_db)
+    headers = {"Authorization": f"Bearer {create_access_token('other@example.com', admin['id'])}"}
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert client.get("/auth/me", headers={"Authorization": "Bearer not-a-jwt"}).status_code == 401
+
+
+def test_admin_cache_miss_queries_in_threadpool(
+    client: TestClient, fake_db: FakeDatabase, monkeypatch
+) -> None:
+    offloaded: List[str] = []
+    run_in_threadpool = auth_module.run_in_threadpool
+
+    async def recording_run_in_threadpool(func, *args):
+        offloaded.append(func.__name__)
+        return await run_in_threadpool(func, *args)
+
+    monkeypatch.setattr(auth_module, "run_in_threadpool", recording_run_in_threadpool)
+    admin = add_admin(fake_db)
+    headers = {"Authorization": f"Bearer {create_access_token(admin['email'], admin['id'])}"}
+
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    # Only the miss touches the database, and it does so off the event loop
+    assert offloaded == ["_fetch_admin"]
+    assert len(fake_db.queries) == 1
@@ -0,0 +1,149 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.cache import TTLCache
+from app.core.database import get_db
+import app.api.authorizations as authorizations_module
+
+
+class FakeConnection:
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class FakeCursor:
+    def __init__(self, authorizations: List[Dict], queries: List[str]) -> None:
+        self.authorizations = authorizations
+        self.queries = queries
+        self.connection = FakeConnection()
+        self._last_row: Optional[Dict] = None
+
+    def execute(self, query: str, params: Optional[List] = None) -> None:
+        normalized = " ".join(query.strip().split())
+        self.queries.append(normalized)
+        column = "order_id" if "WHERE order_id = %s" in normalized else "id"
+        self._last_row = next(
+            (row for row in self.authorizations if row[column] == params[0]),
+            None
+        )
+
+    def fetchone(self) -> Optional[Dict]:
+        return dict(self._last_row) if self._last_row else None
+
+
+def make_authorization(expires_in: timedelta) -> Dict:
+    order_id = str(uuid4())
+    device_id = str(uuid4())
+    now = datetime.now(tz=timezone.utc)
+    return {
+        "id": str(uuid4()),
+        "order_id": order_id,
+        "device_id": device_id,
+        "payload_json": {
+            "deviceId": device_id,
+            "orderId": order_id,
+            "type": "FIXED",
+            "seconds": 60,
+            "nonce": "abc123",
+            "exp": int((now + expires_in).timestamp())
+        },
+        "signature_hex": "3045deadbeef",
+        "expires_at": now + expires_in,
+        "created_at": now
+    }
+
+
+@pytest.fixture
+def store() -> Dict[str, List]:
+    return {"authorizations": [], "queries": []}
+
+
+@pytest.fixture
+def client(store: Dict[str, List], monkeypatch) -> TestClient:
+    def override_get_db():
+        yield FakeCursor(store["authorizations"], store["queries"])
+
+    monkeypatch.setattr(
+        authorizations_module,
+        "authorization_cache",
+        TTLCache(max_entries=16, name="authorizations")
+    )
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    app.dependency_overrides.clear()
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl_seconds=60)
+    cache.set("b", 2, ttl_seconds=60)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3, ttl_seconds=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_ttl_cache_skips_expired_entries() -> None:
+    cache = TTLCache(max_entries=4)
+    cache.set("expired", "value", ttl_seconds=0)
+    cache.set("short", "value", ttl_seconds=1e-9)
+
+    assert cache.get("expired") is None
+    assert cache.get("short") is None
+    assert len(cache) == 0
+
+
+def test_order_lookup_is_served_from_cache(client: TestClient, store: Dict[str, List]) -> None:
+    authorization = make_authorization(timedelta(minutes=5))
+    store["authorizations"].append(authorization)
+
+    first = client.get(f"/authorizations/order/{authorization['order_id']}")
+    second = client.get(f"/authorizations/order/{authorization['order_id']}")
+    by_id = client.get(f"/authorizations/{authorization['id']}")
+
+    assert first.status_code == second.status_code == by_id.status_code == 200
+    assert first.json() == second.json() == by_id.json()
+    assert first.json()["payload"]["orderId"] == authorization["order_id"]
+    assert len(store["queries"]) == 1
+
+    stats = client.get("/authorizations/cache/stats").json()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_expired_authorization_is_not_cached(client: TestClient, store: Dict[str, List]) -> None:
+    authorization = make_authorization(timedelta(seconds=-1))
+    store["authorizations"].append(authorization)
+
+    client.get(f"/authorizations/order/{authorization['order_id']}")
+    client.get(f"/authorizations/order/{authorization['order_id']}")
+
+    assert len(store["queries"]) == 2
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+import hashlib
+
+from ecdsa import SECP256k1, SigningKey, VerifyingKey
+from ecdsa.util import sigdecode_der
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.crypto import CryptoService, crypto_service, load_signing_key
+
+
+def test_signing_key_loads_from_hex_and_pem(tmp_path) -> None:
+    key = SigningKey.generate(curve=SECP256k1)
+    pem_file = tmp_path / "auth_key.pem"
+    pem_file.write_bytes(key.to_pem())
+
+    from_hex = CryptoService(load_signing_key(key.to_string().hex()))
+    from_file = CryptoService(load_signing_key("", str(pem_file)))
+
+    assert not from_hex.ephemeral
+    assert from_hex.key_id == from_file.key_id
+    assert load_signing_key("", "") is None
+
+
+def test_public_key_endpoint_verifies_signatures() -> None:
+    payload = crypto_service.create_payload("d1111111-1111-1111-1111-111111111111", "order-1", "FIXED", 2400)
+    signature = bytes.fromhex(crypto_service.sign_payload(payload))
+
+    with TestClient(app) as client:
+        response = client.get("/authorizations/public-key")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["key_id"] == crypto_service.key_id
+    public_key = VerifyingKey.from_pem(body["public_key_pem"])
+    assert public_key.to_string("uncompressed").hex() == body["public_key_hex"]
+
+    canonical = "&".join(f"{k}={payload[k]}" for k in sorted(payload))
+    digest = hashlib.sha256(f"{body['message_prefix']}{canonical}".encode()).digest()
+    assert public_key.verify_digest(signature, digest, sigdecode=sigdecode_der)
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.responses import FastJSONResponse
+
+
+ROWS = [{"id": i, "status": "DONE", "device_label": "Laundry 1"} for i in range(200)]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, offload_size=2048)
+
+    @app.get("/rows")
+    def rows():
+        return FastJSONResponse(ROWS)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/export")
+    def export():
+        def lines():
+            for row in ROWS:
+                yield f"{row['id']},{row['status']},{row['device_label']}\n"
+        return StreamingResponse(lines(), media_type="text/csv")
+
+    @app.get("/binary")
+    def binary():
+        return PlainTextResponse(b"x" * 5000, media_type="application/octet-stream")
+
+    return TestClient(app)
+
+
+def test_choose_encoding() -> None:
+    assert choose_encoding("gzip, deflate", brotli_available=True) == "gzip"
+    assert choose_encoding("gzip, br", brotli_available=True) == "br"
+    assert choose_encoding("gzip, br", brotli_available=False) == "gzip"
+    assert choose_encoding("br;q=0.5, gzip;q=0.8", brotli_available=True) == "gzip"
+    assert choose_encoding("gzip;q=0, identity", brotli_available=True) is None
+    assert choose_encoding("*", brotli_available=False) == "gzip"
+    assert choose_encoding("", brotli_available=True) is None
+
+
+def test_large_json_is_gzipped(client: TestClient) -> None:
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(FastJSONResponse(ROWS).body) / 5
+    assert response.json() == ROWS
+
+
+def test_small_identity_and_binary_bodies_pass_through(client: TestClient) -> None:
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/rows", headers={"Accept-Encoding": "identity"})
+    binary = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == ROWS
+    assert "content-encoding" not in binary.headers
+
+
+def test_streamed_response_is_compressed_incrementally(client: TestClient) -> None:
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode().count("\n") == len(ROWS)
+
+
+def test_large_json_is_brotli_compressed_when_available(client: TestClient) -> None:
+    pytest.importorskip("brotli")
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == ROWS
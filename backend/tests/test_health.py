@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+import app.services.health as health_module
+from app.services.health import health_checker
+
+
+@pytest.fixture
+def checks(monkeypatch):
+    calls = {"database": 0}
+    state = {"database_ok": True}
+
+    def fake_database():
+        calls["database"] += 1
+        if not state["database_ok"]:
+            raise RuntimeError("connection refused")
+        return True, "ok"
+
+    monkeypatch.setitem(health_checker.checks, "database", (fake_database, True))
+    monkeypatch.setitem(health_checker.checks, "stripe", (lambda: (False, "timed out"), False))
+    monkeypatch.setitem(health_checker.checks, "ble_adapter", (lambda: None, False))
+    monkeypatch.setattr(health_module.settings, "STRIPE_SECRET_KEY", "")
+    # Drive checks explicitly instead of racing the background thread
+    monkeypatch.setattr(health_checker, "start", lambda: None)
+    return {"calls": calls, "state": state}
+
+
+@pytest.fixture
+def client(checks) -> TestClient:
+    with TestClient(app) as test_client:
+        health_checker.run_checks()
+        yield test_client
+
+
+def test_probes_are_served_from_cache(client: TestClient, checks) -> None:
+    before = checks["calls"]["database"]
+
+    for _ in range(5):
+        assert client.get("/health/ready").status_code == 200
+        assert client.get("/health").status_code == 200
+
+    assert checks["calls"]["database"] == before
+    assert client.get("/health/live").json()["status"] == "alive"
+
+
+def test_non_critical_failure_is_degraded_but_ready(client: TestClient) -> None:
+    body = client.get("/health/ready").json()
+
+    assert body["ready"] is True
+    assert body["status"] == "degraded"
+    assert body["checks"]["stripe"]["healthy"] is False
+    assert "ble_adapter" not in body["checks"]
+
+
+def test_database_failure_is_not_ready(client: TestClient, checks) -> None:
+    checks["state"]["database_ok"] = False
+    health_checker.run_checks()
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"]["detail"] == "connection refused"
+    assert client.get("/health").json()["database"] == "unhealthy: connection refused"
+    assert client.get("/health/live").status_code == 200
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.metrics import MetricsRegistry
+from app.core.database import _query_operation
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("job_seconds", "Job latency", ("job",), buckets=(0.1, 1.0))
+    latency.observe(0.05, job="a")
+    latency.observe(0.5, job="a")
+    latency.observe(5, job="a")
+
+    text = registry.render()
+
+    assert '# TYPE job_seconds histogram' in text
+    assert 'job_seconds_bucket{job="a",le="0.1"} 1' in text
+    assert 'job_seconds_bucket{job="a",le="1"} 2' in text
+    assert 'job_seconds_bucket{job="a",le="+Inf"} 3' in text
+    assert 'job_seconds_count{job="a"} 3' in text
+
+
+def test_collector_samples_share_one_family_header() -> None:
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: [("items", "gauge", "Items", [({"cache": "a"}, 1)])])
+    registry.register_collector(lambda: [("items", "gauge", "Items", [({"cache": "b"}, 2)])])
+
+    text = registry.render()
+
+    assert text.count("# TYPE items gauge") == 1
+    assert 'items{cache="a"} 1' in text
+    assert 'items{cache="b"} 2' in text
+
+
+def test_query_operation_label_is_bounded() -> None:
+    assert _query_operation("  select 1") == "SELECT"
+    assert _query_operation("WITH target AS (SELECT 1) SELECT 1") == "WITH"
+    assert _query_operation("VACUUM orders") == "OTHER"
+
+
+def test_metrics_endpoint_reports_route_templates() -> None:
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+        client.get("/does-not-exist")
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in response.text
+    assert 'route="unmatched",status="404"' in response.text
+    assert 'cache_hits_total{cache="authorizations"}' in response.text
+    assert "password_hash_pending" in response.text
@@ -0,0 +1,137 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+from contextlib import contextmanager
+from typing import Dict, List
+from uuid import uuid4
+
+import pytest
+
+from app.services import order_sweeper as sweeper_module
+from app.services.order_sweeper import OrderSweeper
+
+
+class FakeCursor:
+    """Emulates EXPIRE_BATCH_SQL: stale rows of one status, oldest first, limited"""
+
+    def __init__(self, orders: Dict[str, Dict], queries: List[tuple]) -> None:
+        self.orders = orders
+        self.queries = queries
+        self._rows: List[Dict] = []
+
+    def execute(self, query: str, params=None) -> None:
+        normalized = " ".join(query.strip().split())
+        self.queries.append((normalized, params))
+        if not normalized.startswith("WITH stale AS"):
+            raise NotImplementedError(f"Unsupported query in fake cursor: {normalized}")
+
+        status, timeout_minutes, limit, new_status, allowed = params
+        stale = sorted(
+            (order for order in self.orders.values()
+             if order["status"] == status and order["age_minutes"] > timeout_minutes),
+            key=lambda order: -order["age_minutes"]
+        )[:limit]
+        self._rows = []
+        for order in stale:
+            if order["status"] in allowed:
+                order["status"] = new_status
+                self._rows.append({"id": order["id"]})
+
+    def fetchall(self) -> List[Dict]:
+        return list(self._rows)
+
+
+class FakeDatabase:
+    def __init__(self, orders: Dict[str, Dict]) -> None:
+        self.orders = orders
+        self.queries: List[tuple] = []
+
+    @contextmanager
+    def get_cursor(self):
+        yield FakeCursor(self.orders, self.queries)
+
+
+def make_orders(status: str, count: int, age_minutes: int) -> Dict[str, Dict]:
+    orders = {}
+    for _ in range(count):
+        order_id = str(uuid4())
+        orders[order_id] = {"id": order_id, "status": status, "age_minutes": age_minutes}
+    return orders
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    orders: Dict[str, Dict] = {}
+    database = FakeDatabase(orders)
+    monkeypatch.setattr(sweeper_module, "db", database)
+    monkeypatch.setattr(sweeper_module.settings, "ORDER_TIMEOUT_CREATED_MINUTES", 30)
+    monkeypatch.setattr(sweeper_module.settings, "ORDER_TIMEOUT_PAID_MINUTES", 60)
+    return database
+
+
+def test_sweep_fails_only_stale_created_and_paid_orders(fake_db):
+    fake_db.orders.update(make_orders("CREATED", 3, age_minutes=45))
+    fake_db.orders.update(make_orders("CREATED", 2, age_minutes=10))
+    fake_db.orders.update(make_orders("PAID", 1, age_minutes=90))
+    fake_db.orders.update(make_orders("PAID", 1, age_minutes=45))
+    fake_db.orders.update(make_orders("RUNNING", 2, age_minutes=500))
+
+    sweeper = OrderSweeper()
+    expired = sweeper.sweep()
+
+    assert expired == {"CREATED": 3, "PAID": 1}
+    statuses = [order["status"] for order in fake_db.orders.values()]
+    assert statuses.count("FAILED") == 4
+    assert statuses.count("RUNNING") == 2
+
+    # The UPDATE is limited to statuses that VALID_TRANSITIONS lets reach FAILED
+    for _, params in fake_db.queries:
+        assert params[3] == "FAILED"
+        assert set(params[4]) == {"CREATED", "PAID", "RUNNING"}
+
+    stats = sweeper.stats()
+    assert stats["runs"] == 1
+    assert stats["total_expired"] == {"CREATED": 3, "PAID": 1}
+
+
+def test_sweep_works_in_bounded_batches(fake_db):
+    fake_db.orders.update(make_orders("CREATED", 7, age_minutes=45))
+
+    sweeper = OrderSweeper()
+    sweeper.batch_size = 3
+    sweeper.max_batches = 2
+
+    assert sweeper.sweep()["CREATED"] == 6
+    created_queries = [params for _, params in fake_db.queries if params[0] == "CREATED"]
+    assert len(created_queries) == 2
+
+    # The remainder is picked up by the next pass
+    assert sweeper.sweep()["CREATED"] == 1
+
+
+def test_disabled_timeout_skips_status(fake_db, monkeypatch):
+    monkeypatch.setattr(sweeper_module.settings, "ORDER_TIMEOUT_PAID_MINUTES", 0)
+    fake_db.orders.update(make_orders("PAID", 2, age_minutes=500))
+
+    assert OrderSweeper().sweep() == {"CREATED": 0}
+    assert all(order["status"] == "PAID" for order in fake_db.orders.values())
+
+
+def test_sweep_records_errors(fake_db, monkeypatch):
+    def broken_cursor():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(fake_db, "get_cursor", broken_cursor)
+    sweeper = OrderSweeper()
+
+    assert sweeper.sweep() == {}
+    stats = sweeper.stats()
+    assert stats["errors"] == 1
+    assert "database unavailable" in stats["last_error"]
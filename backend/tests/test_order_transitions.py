@@ -0,0 +1,143 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.database import get_db
+from app.core.order_transitions import allowed_previous_statuses, transition_order_status
+
+
+class FakeConnection:
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class FakeCursor:
+    """Emulates the single-statement compare-and-set used for order transitions"""
+
+    def __init__(self, orders: Dict[str, Dict], queries: List[str]) -> None:
+        self.orders = orders
+        self.queries = queries
+        self.connection = FakeConnection()
+        self._last_row: Optional[Dict] = None
+
+    def execute(self, query: str, params=None) -> None:
+        normalized = " ".join(query.strip().split())
+        self.queries.append(normalized)
+        self._last_row = None
+
+        if normalized.startswith("WITH target AS"):
+            order = self.orders.get(params["order_id"])
+            if order is None:
+                return
+            if "device_id" in params and order["device_id"] != params["device_id"]:
+                return
+
+            previous_status = order["status"]
+            updated = {key: None for key in order}
+            if previous_status in params["allowed"]:
+                order["status"] = params["new_status"]
+                updated = dict(order)
+            self._last_row = {"previous_status": previous_status, **updated}
+        else:
+            raise NotImplementedError(f"Unsupported query in fake cursor: {normalized}")
+
+    def fetchone(self) -> Optional[Dict]:
+        return dict(self._last_row) if self._last_row else None
+
+
+def make_order(status: str) -> Dict:
+    now = datetime.now(tz=timezone.utc)
+    return {
+        "id": str(uuid4()),
+        "device_id": str(uuid4()),
+        "service_id": str(uuid4()),
+        "amount_cents": 250,
+        "authorized_minutes": 40,
+        "status": status,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+@pytest.fixture
+def store() -> Dict:
+    return {"orders": {}, "queries": []}
+
+
+@pytest.fixture
+def client(store: Dict) -> TestClient:
+    def override_get_db():
+        yield FakeCursor(store["orders"], store["queries"])
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    app.dependency_overrides.clear()
+
+
+def test_allowed_previous_statuses() -> None:
+    assert allowed_previous_statuses("PAID") == ["CREATED"]
+    assert allowed_previous_statuses("RUNNING") == ["PAID"]
+    assert allowed_previous_statuses("DONE") == ["RUNNING"]
+    assert allowed_previous_statuses("FAILED") == ["CREATED", "PAID", "RUNNING"]
+    assert allowed_previous_statuses("CREATED") == []
+
+
+def test_transition_result_outcomes(store: Dict) -> None:
+    order = make_order("PAID")
+    store["orders"][order["id"]] = order
+    cursor = FakeCursor(store["orders"], store["queries"])
+
+    applied = transition_order_status(cursor, order["id"], "RUNNING")
+    assert applied.applied and applied.previous_status == "PAID"
+    assert applied.order["status"] == "RUNNING"
+
+    conflict = transition_order_status(cursor, order["id"], "PAID")
+    assert conflict.conflict and conflict.previous_status == "RUNNING"
+    assert conflict.order is None
+
+    wrong_device = transition_order_status(cursor, order["id"], "DONE", device_id=str(uuid4()))
+    assert not wrong_device.found
+
+
+def test_update_order_status_is_single_round_trip(client: TestClient, store: Dict) -> None:
+    order = make_order("CREATED")
+    store["orders"][order["id"]] = order
+
+    response = client.patch(f"/orders/{order['id']}/status", json={"status": "PAID"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "PAID"
+    assert len(store["queries"]) == 1
+
+
+def test_update_order_status_conflict_and_missing(client: TestClient, store: Dict) -> None:
+    order = make_order("DONE")
+    store["orders"][order["id"]] = order
+
+    conflict = client.patch(f"/orders/{order['id']}/status", json={"status": "RUNNING"})
+    missing = client.patch(f"/orders/{uuid4()}/status", json={"status": "PAID"})
+
+    assert conflict.status_code == 409
+    assert conflict.json()["detail"] == "Invalid status transition from DONE to RUNNING"
+    assert missing.status_code == 404
+    assert store["orders"][order["id"]]["status"] == "DONE"
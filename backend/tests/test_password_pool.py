@@ -0,0 +1,305 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+import anyio
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import auth as auth_api
+from app.core import client_ip as client_ip_module
+from app.core import password_pool as password_pool_module
+from app.core.auth import hash_password
+from app.core.client_ip import get_client_ip
+from app.core.database import get_db
+from app.core.password_pool import PasswordHashPool
+
+
+class FakeConnection:
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class FakeCursor:
+    def __init__(self, admins: Dict[str, Dict]) -> None:
+        self.admins = admins
+        self.connection = FakeConnection()
+        self._last_row: Optional[Dict] = None
+
+    def execute(self, query: str, params=None) -> None:
+        normalized = " ".join(query.strip().split())
+        if normalized.startswith("SELECT id, email, password_hash, role FROM admins WHERE email = %s"):
+            self._last_row = self.admins.get(params[0])
+        else:
+            raise NotImplementedError(f"Unsupported query in fake cursor: {normalized}")
+
+    def fetchone(self) -> Optional[Dict]:
+        return self._last_row
+
+
+def make_pool(monkeypatch, workers: int, max_queue: int, per_key_limit: int) -> PasswordHashPool:
+    monkeypatch.setattr(password_pool_module.settings, "PASSWORD_HASH_WORKERS", workers)
+    monkeypatch.setattr(password_pool_module.settings, "PASSWORD_HASH_MAX_QUEUE", max_queue)
+    monkeypatch.setattr(password_pool_module.settings, "PASSWORD_HASH_PER_KEY_LIMIT", per_key_limit)
+    return PasswordHashPool()
+
+
+class BlockingHash:
+    """Stands in for bcrypt: blocks until released and tracks concurrency"""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.threads: List[str] = []
+
+    def __call__(self, value):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.threads.append(threading.current_thread().name)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+def run(pool: PasswordHashPool, func, *args, keys=()):
+    return asyncio.run(pool.run(func, *args, keys=keys))
+
+
+def start_calls(pool: PasswordHashPool, func, keys_per_call: List[List[str]]):
+    results: List = [None] * len(keys_per_call)
+
+    def call(index: int, keys: List[str]) -> None:
+        try:
+            results[index] = run(pool, func, index, keys=keys)
+        except HTTPException as e:
+            results[index] = e.status_code
+
+    threads = [
+        threading.Thread(target=call, args=(index, keys))
+        for index, keys in enumerate(keys_per_call)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_pending(pool: PasswordHashPool, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while pool.stats()["pending"] < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_pool_bounds_concurrency_and_rejects_when_full(monkeypatch) -> None:
+    pool = make_pool(monkeypatch, workers=2, max_queue=1, per_key_limit=10)
+    blocking = BlockingHash()
+
+    threads, results = start_calls(pool, blocking, [[f"ip:{i}"] for i in range(3)])
+    wait_for_pending(pool, 3)
+
+    # Two running, one queued: the next caller is turned away instead of waiting
+    with pytest.raises(HTTPException) as exc_info:
+        run(pool, blocking, "extra", keys=["ip:extra"])
+    assert exc_info.value.status_code == 503
+
+    blocking.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [0, 1, 2]
+    assert blocking.max_running == 2
+    assert all(name.startswith("password-hash") for name in blocking.threads)
+    stats = pool.stats()
+    assert stats["completed"] == 3
+    assert stats["rejected_queue_full"] == 1
+    assert stats["pending"] == 0
+
+
+def test_pool_limits_calls_per_key(monkeypatch) -> None:
+    pool = make_pool(monkeypatch, workers=4, max_queue=4, per_key_limit=1)
+    blocking = BlockingHash()
+
+    threads, results = start_calls(pool, blocking, [["ip:1.2.3.4", "email:a@example.com"]])
+    wait_for_pending(pool, 1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        run(pool, blocking, "again", keys=["ip:5.6.7.8", "email:a@example.com"])
+    assert exc_info.value.status_code == 429
+    assert run(pool, len, "other", keys=["ip:5.6.7.8", "email:b@example.com"]) == 5
+
+    blocking.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [0]
+    assert pool.stats()["active_keys"] == 0
+
+
+def test_login_verifies_password_on_hashing_pool(monkeypatch) -> None:
+    pool = make_pool(monkeypatch, workers=1, max_queue=1, per_key_limit=1)
+    monkeypatch.setattr(auth_api, "password_pool", pool)
+    monkeypatch.setattr(auth_api, "log_admin_action", lambda **kwargs: None)
+
+    verify_threads: List[str] = []
+    verify_password = auth_api.verify_password
+
+    def recording_verify(plain: str, hashed: str) -> bool:
+        verify_threads.append(threading.current_thread().name)
+        return verify_password(plain, hashed)
+
+    monkeypatch.setattr(auth_api, "verify_password", recording_verify)
+
+    admin = {
+        "id": "a1111111-1111-1111-1111-111111111111",
+        "email": "admin@example.com",
+        "password_hash": hash_password("correct horse"),
+        "role": "admin",
+    }
+    cursor = FakeCursor({admin["email"]: admin})
+    app.dependency_overrides[get_db] = lambda: cursor
+    try:
+        with TestClient(app) as client:
+            ok = client.post("/auth/login", json={"email": admin["email"], "password": "correct horse"})
+            bad = client.post("/auth/login", json={"email": admin["email"], "password": "wrong password"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert ok.status_code == 200
+    assert ok.json()["user"]["email"] == admin["email"]
+    assert bad.status_code == 401
+    assert len(verify_threads) == 2
+    assert all(name.startswith("password-hash") for name in verify_threads)
+    assert pool.stats()["completed"] == 2
+    assert pool.stats()["pending"] == 0
+
+
+class ProxyPeer:
+    """Makes every request arrive from `host`, like the admin console's nginx container"""
+
+    def __init__(self, app, host: str) -> None:
+        self.app = app
+        self.host = host
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope = dict(scope, client=(self.host, 50000))
+        await self.app(scope, receive, send)
+
+
+@pytest.fixture
+def blocked_login(monkeypatch):
+    """Login whose password check blocks on the hashing pool until released"""
+    pool = make_pool(monkeypatch, workers=1, max_queue=4, per_key_limit=1)
+    monkeypatch.setattr(auth_api, "password_pool", pool)
+    monkeypatch.setattr(auth_api, "log_admin_action", lambda **kwargs: None)
+    blocking = BlockingHash()
+    monkeypatch.setattr(auth_api, "verify_password", lambda plain, hashed: blocking(plain) == plain)
+
+    admins = {
+        email: {"id": f"a{i}111111-1111-1111-1111-111111111111", "email": email,
+                "password_hash": "unused", "role": "admin"}
+        for i, email in enumerate(["first@example.com", "second@example.com", "third@example.com"], start=1)
+    }
+    app.dependency_overrides[get_db] = lambda: FakeCursor(admins)
+    yield pool, blocking
+    blocking.release.set()
+    app.dependency_overrides.pop(get_db, None)
+
+
+def post_in_thread(client: TestClient, path: str, results: List, **kwargs) -> threading.Thread:
+    thread = threading.Thread(target=lambda: results.append(client.post(path, **kwargs)))
+    thread.start()
+    return thread
+
+
+def test_waiting_login_holds_no_threadpool_thread(blocked_login) -> None:
+    pool, blocking = blocked_login
+    results: List = []
+
+    with TestClient(app) as client:
+        # One threadpool token: a sync handler blocked on bcrypt would take it
+        def limit_threadpool() -> None:
+            anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+
+        client.portal.call(limit_threadpool)
+        waiting = post_in_thread(client, "/auth/login", results,
+                                 json={"email": "first@example.com", "password": "correct horse"})
+        wait_for_pending(pool, 1)
+
+        # Threadpool work (get_db, the admin query) still runs while bcrypt is busy
+        other: List = []
+        post_in_thread(client, "/auth/login", other,
+                       json={"email": "nobody@example.com", "password": "whatever"}).join(5)
+        assert [response.status_code for response in other] == [401]
+
+        blocking.release.set()
+        waiting.join(5)
+
+    assert [response.status_code for response in results] == [200]
+
+
+def test_client_ip_comes_from_trusted_proxy_header(blocked_login, monkeypatch) -> None:
+    pool, blocking = blocked_login
+    monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_IPS", "172.28.0.0/24")
+    results: List = []
+
+    with TestClient(ProxyPeer(app, "172.28.0.10")) as client:
+        first = post_in_thread(client, "/auth/login", results,
+                               json={"email": "first@example.com", "password": "pw"},
+                               headers={"X-Forwarded-For": "203.0.113.5"})
+        wait_for_pending(pool, 1)
+
+        # Another console user behind the same nginx is not limited by the first one
+        second = post_in_thread(client, "/auth/login", results,
+                                json={"email": "second@example.com", "password": "pw"},
+                                headers={"X-Forwarded-For": "203.0.113.6"})
+        wait_for_pending(pool, 2)
+
+        # The same client again is, even if it prepends a spoofed address
+        spoofed = client.post("/auth/login", json={"email": "third@example.com", "password": "pw"},
+                              headers={"X-Forwarded-For": "198.51.100.1, 203.0.113.5"})
+        assert spoofed.status_code == 429
+
+        blocking.release.set()
+        first.join(5)
+        second.join(5)
+
+    assert [response.status_code for response in results] == [200, 200]
+
+
+def make_request(peer: str, headers: Dict[str, str]) -> Request:
+    return Request({
+        "type": "http",
+        "client": (peer, 50000),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_forwarded_headers_only_trusted_from_proxies(monkeypatch) -> None:
+    monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_IPS", "127.0.0.1, 172.28.0.0/24")
+
+    assert get_client_ip(make_request("198.51.100.7", {"X-Forwarded-For": "203.0.113.5"})) == "198.51.100.7"
+    assert get_client_ip(make_request("172.28.0.10", {"X-Forwarded-For": "203.0.113.5"})) == "203.0.113.5"
+    assert get_client_ip(make_request("172.28.0.10", {"X-Real-IP": "203.0.113.9"})) == "203.0.113.9"
+    assert get_client_ip(make_request(
+        "127.0.0.1", {"X-Forwarded-For": "198.51.100.1, 203.0.113.5, 172.28.0.10"}
+    )) == "203.0.113.5"
+    assert get_client_ip(make_request("172.28.0.10", {})) == "172.28.0.10"
@@ -0,0 +1,219 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+PI_DIR = ROOT_DIR.parent / "pi" / "python"
+if str(PI_DIR) not in sys.path:
+    sys.path.append(str(PI_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+import io
+import json
+import re
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.crypto import CryptoService
+import auth_verifier
+from auth_verifier import AuthorizationError, AuthorizationVerifier
+
+DEVICE_ID = "d1111111-1111-1111-1111-111111111111"
+CLOCK_SKEW = 30
+APP_MODEL = (ROOT_DIR.parent / "android" / "RemoteLedBLE" / "app" / "src" / "main" / "java"
+             / "com" / "example" / "remoteled" / "models" / "Authorization.java")
+
+
+@pytest.fixture
+def crypto() -> CryptoService:
+    return CryptoService()
+
+
+@pytest.fixture
+def make_verifier(crypto, tmp_path, monkeypatch):
+    """Pi-side verifier pinned to the backend key; same paths = same Pi across restarts"""
+    monkeypatch.setenv("AUTH_PUBLIC_KEY", crypto.public_key_hex)
+
+    def make(device_id: str = DEVICE_ID) -> AuthorizationVerifier:
+        return AuthorizationVerifier(
+            device_id,
+            "http://127.0.0.1:1",
+            clock_skew=CLOCK_SKEW,
+            key_cache_path=str(tmp_path / "auth_public_key.json"),
+            nonce_cache_path=str(tmp_path / "auth_nonces.json"),
+        )
+
+    return make
+
+
+@pytest.fixture
+def serve_key(monkeypatch):
+    """Answer GET /authorizations/public-key with the given backend's key"""
+    def serve(crypto: CryptoService) -> None:
+        body = json.dumps({"key_id": crypto.key_id, "public_key_hex": crypto.public_key_hex, "ephemeral": False})
+        monkeypatch.setattr(auth_verifier.urllib.request, "urlopen",
+                            lambda url, timeout=None: io.BytesIO(body.encode()))
+
+    return serve
+
+
+def fetching_verifier(base_url: str, tmp_path) -> AuthorizationVerifier:
+    return AuthorizationVerifier(
+        DEVICE_ID,
+        base_url,
+        key_cache_path=str(tmp_path / "auth_public_key.json"),
+        nonce_cache_path=str(tmp_path / "auth_nonces.json"),
+    )
+
+
+def authorize(crypto: CryptoService, seconds: int = 600) -> dict:
+    payload = crypto.create_payload(DEVICE_ID, "order-1", "FIXED", seconds)
+    return {"payload": payload, "signature_hex": crypto.sign_payload(payload)}
+
+
+def rejection(verifier: AuthorizationVerifier, authorization: dict, now=None) -> str:
+    with pytest.raises(AuthorizationError) as exc_info:
+        verifier.verify(authorization, now=now)
+    return exc_info.value.reason
+
+
+def test_backend_signed_authorization_verifies_on_pi(crypto, make_verifier) -> None:
+    verifier = make_verifier()
+    authorization = authorize(crypto)
+
+    payload = verifier.verify(authorization)
+
+    assert payload["orderId"] == "order-1"
+    assert payload["seconds"] == 600
+    assert len(verifier.nonces) == 1
+
+
+def test_authorization_for_other_device_is_rejected(crypto, make_verifier) -> None:
+    verifier = make_verifier("d2222222-2222-2222-2222-222222222222")
+
+    assert rejection(verifier, authorize(crypto)) == "wrong_device"
+    assert len(verifier.nonces) == 0
+
+
+def test_expiry_allows_clock_skew(crypto, make_verifier) -> None:
+    verifier = make_verifier()
+    late = authorize(crypto)
+    too_late = authorize(crypto)
+    exp = late["payload"]["exp"]
+
+    # A Pi clock running up to CLOCK_SKEW seconds ahead still accepts it
+    assert verifier.verify(late, now=exp + CLOCK_SKEW - 1)["orderId"] == "order-1"
+    assert rejection(verifier, too_late, now=exp + CLOCK_SKEW + 1) == "expired"
+
+
+def test_nonce_replay_is_rejected_across_restart(crypto, make_verifier) -> None:
+    authorization = authorize(crypto)
+    make_verifier().verify(authorization)
+
+    restarted = make_verifier()
+
+    assert len(restarted.nonces) == 1
+    assert rejection(restarted, authorization) == "replayed"
+
+
+def test_tampered_payload_is_rejected(crypto, make_verifier) -> None:
+    verifier = make_verifier()
+    authorization = authorize(crypto, seconds=60)
+    authorization["payload"] = dict(authorization["payload"], seconds=6000)
+
+    assert rejection(verifier, authorization) == "bad_signature"
+
+    foreign = authorize(CryptoService())
+    assert rejection(verifier, foreign) == "bad_signature"
+    assert rejection(verifier, {"payload": foreign["payload"]}) == "malformed"
+    assert len(verifier.nonces) == 0
+
+
+@pytest.fixture
+def non_utc_timezone(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_payload_expiry_is_utc_epoch_seconds(crypto, non_utc_timezone) -> None:
+    before = int(time.time())
+    payload = crypto.create_payload(DEVICE_ID, "order-1", "FIXED", 60)
+    after = int(time.time())
+
+    expiry = settings.AUTH_EXPIRY_MINUTES * 60
+    assert before + expiry <= payload["exp"] <= after + expiry
+
+
+def test_plain_http_keeps_first_fetched_key(crypto, serve_key, tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("AUTH_PUBLIC_KEY", raising=False)
+    verifier = fetching_verifier("http://backend", tmp_path)
+    serve_key(crypto)
+    assert verifier.refresh_key()
+
+    # A different key offered over http (e.g. by a MITM) is not trusted
+    serve_key(CryptoService())
+    assert not verifier.refresh_key()
+    restarted = fetching_verifier("http://backend", tmp_path)
+    assert restarted.key_id == crypto.key_id
+    assert restarted.verify(authorize(crypto))["orderId"] == "order-1"
+
+
+def test_https_key_rotation_replaces_cached_key(crypto, serve_key, tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("AUTH_PUBLIC_KEY", raising=False)
+    verifier = fetching_verifier("https://backend", tmp_path)
+    serve_key(crypto)
+    assert verifier.refresh_key()
+
+    rotated = CryptoService()
+    serve_key(rotated)
+    assert verifier.refresh_key()
+    assert verifier.key_id == rotated.key_id
+    assert rejection(verifier, authorize(crypto)) == "bad_signature"
+
+
+def app_payload_fields() -> list:
+    """(json name, Java type) of Authorization.AuthorizationPayload, in declaration order"""
+    source = APP_MODEL.read_text()
+    body = source[source.index("class AuthorizationPayload"):]
+    return re.findall(r'@SerializedName\("(\w+)"\)\s+private\s+(\w+)\s+\w+;', body)
+
+
+def gson_json(payload: dict) -> str:
+    """What Gson's toJson writes for the app model holding this payload"""
+    encode = {"int": int, "long": int, "double": float, "float": float, "String": str}
+    return json.dumps({name: encode[kind](payload[name]) for name, kind in app_payload_fields()
+                       if payload.get(name) is not None})
+
+
+def test_app_relayed_authorization_verifies_on_pi(crypto, make_verifier) -> None:
+    authorization = authorize(crypto)
+    assert {name for name, _ in app_payload_fields()} == set(authorization["payload"])
+
+    # ProcessingActivity -> RunningActivity as Gson JSON, then BLEConnectionManager.sendCommand
+    command = json.dumps({
+        "command": "ON",
+        "color": "green",
+        "bleKey": "abcd",
+        "authorization": {
+            "payload": json.loads(gson_json(authorization["payload"])),
+            "signature_hex": authorization["signature_hex"],
+        },
+    })
+
+    assert make_verifier().verify(json.loads(command)["authorization"])["orderId"] == "order-1"
+
+
+def test_float_encoded_numbers_break_the_signature(crypto, make_verifier) -> None:
+    authorization = authorize(crypto)
+    # e.g. a model declaring `double seconds`: Gson writes 600.0, the canonical form differs
+    authorization["payload"] = dict(authorization["payload"], seconds=600.0)
+
+    assert rejection(make_verifier(), authorization) == "bad_signature"
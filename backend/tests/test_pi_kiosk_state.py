@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+PI_DIR = Path(__file__).resolve().parents[2] / "pi" / "python"
+if str(PI_DIR) not in sys.path:
+    sys.path.append(str(PI_DIR))
+
+import json
+
+from kiosk_state import KioskStateChannel
+
+
+def test_channel_ignores_timestamp_only_changes() -> None:
+    channel = KioskStateChannel()
+
+    channel.publish({"status": "QR", "qr": "abc", "timestamp": 1000})
+    version, encoded = channel.current()
+    assert version == 1
+
+    # A re-publish of the same state with a fresh timestamp wakes nobody
+    channel.publish({"status": "QR", "qr": "abc", "timestamp": 1001})
+    assert channel.current() == (version, encoded)
+    assert channel.wait_for_change(version, 0.01) is None
+
+    channel.publish({"status": "RUNNING", "qr": "abc", "timestamp": 1002})
+    version, encoded = channel.current()
+    assert version == 2
+    assert json.loads(encoded) == {"status": "RUNNING", "qr": "abc", "timestamp": 1002}
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+PI_DIR = Path(__file__).resolve().parents[2] / "pi" / "python"
+if str(PI_DIR) not in sys.path:
+    sys.path.append(str(PI_DIR))
+
+import pytest
+
+import led_patterns
+from led_patterns import from_spec
+
+
+def test_from_spec_builds_patterns() -> None:
+    assert from_spec({"type": "blink", "color": "red", "times": None}).repeat is None
+    assert from_spec({"type": "blink", "color": "red", "times": 3}).repeat == 3
+    assert from_spec({"type": "sequence", "steps": [{"color": "red", "duration": 0.1}]}).repeat == 1
+    assert from_spec({"type": "breathe", "color": "green", "priority": 2}).priority == 2
+
+
+@pytest.mark.parametrize("spec", [
+    {"type": "blink", "color": "red", "priority": None},
+    {"type": "blink", "color": "red", "priority": "high"},
+    {"type": "blink", "color": "red", "times": 0},
+    {"type": "blink", "color": "red", "times": -1},
+    {"type": "blink", "color": "red", "times": 2.5},
+    {"type": "blink", "color": "red", "times": "forever"},
+    {"type": "breathe", "color": "red", "repeat": 0},
+    {"type": "sequence", "steps": [{"color": "red", "duration": 0.1}], "repeat": 0},
+    {"type": "sequence", "steps": [{"color": "red"}]},
+    {"type": "strobe", "color": "red"},
+])
+def test_from_spec_rejects_invalid_specs(spec) -> None:
+    with pytest.raises(ValueError):
+        from_spec(spec)
+
+
+def test_pattern_rejects_non_integer_repeat() -> None:
+    with pytest.raises(ValueError):
+        led_patterns.blink("red", times="3")
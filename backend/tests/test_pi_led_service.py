@@ -0,0 +1,144 @@
+import sys
+from pathlib import Path
+
+PI_DIR = Path(__file__).resolve().parents[2] / "pi" / "python"
+if str(PI_DIR) not in sys.path:
+    sys.path.append(str(PI_DIR))
+
+import threading
+import time
+
+import pytest
+
+import led_patterns
+from gpio_backend import SimGPIOBackend
+from led_patterns import PatternEngine
+from led_scheduler import LEDScheduler
+from led_service import LEDService
+
+PINS = {"green": 17, "yellow": 19, "red": 27}
+INTERVAL = 0.02
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = LEDScheduler()
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+@pytest.fixture
+def backend() -> SimGPIOBackend:
+    backend = SimGPIOBackend()
+    backend.setup(PINS.values())
+    return backend
+
+
+@pytest.fixture
+def engine(scheduler, backend) -> PatternEngine:
+    return PatternEngine(scheduler, backend, PINS)
+
+
+def wait_until(predicate, timeout=2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_scheduler_repeats_from_due_time_and_stops_on_cancel(scheduler) -> None:
+    calls = []
+    ran_three = threading.Event()
+
+    def step(due):
+        calls.append(due)
+        if len(calls) == 3:
+            ran_three.set()
+        return due + INTERVAL
+
+    start = time.monotonic()
+    task = scheduler.schedule("tick", start, step)
+    assert ran_three.wait(2)
+    scheduler.cancel(task)
+    count = len(calls)
+    time.sleep(INTERVAL * 3)
+
+    # Periods are computed from the previous due time, so they do not drift
+    assert calls[:3] == pytest.approx([start, start + INTERVAL, start + 2 * INTERVAL])
+    assert len(calls) == count
+    assert not task.active
+
+
+def test_blink_produces_expected_edges(engine, backend) -> None:
+    engine.play(led_patterns.blink("green", times=3, interval=INTERVAL))
+    assert engine.wait(2)
+
+    on_edges = backend.edges(PINS["green"], 1.0)
+    off_edges = backend.edges(PINS["green"], 0.0)
+    assert len(on_edges) == 3
+    assert len(off_edges) == 3
+    # On for `interval`, off for `interval`: rising edges one period apart
+    for earlier, later in zip(on_edges, on_edges[1:]):
+        assert later - earlier >= 2 * INTERVAL * 0.9
+    assert engine.levels()["green"] == 0.0
+    assert engine.current() is None
+
+
+def test_higher_priority_preempts_and_lower_resumes(engine, backend) -> None:
+    engine.play(led_patterns.blink("green", times=None, interval=INTERVAL))
+    assert wait_until(lambda: len(backend.edges(PINS["green"], 1.0)) >= 2)
+
+    assert engine.play(led_patterns.solid("red"), priority=1)
+    assert engine.levels() == {"green": 0.0, "yellow": 0.0, "red": 1.0}
+    preempted_at = time.monotonic()
+    time.sleep(INTERVAL * 4)
+    # The suspended blink leaves the pin alone while it is preempted
+    assert backend.edges(PINS["green"], 1.0, since=preempted_at) == []
+
+    # A lower priority pattern queues behind the solid red
+    assert not engine.play(led_patterns.blink("yellow", times=None, interval=INTERVAL), priority=0)
+    assert engine.current() == ("solid-red", 1)
+
+    engine.stop(priority=1)
+    resumed_at = time.monotonic()
+    assert engine.levels()["red"] == 0.0
+    assert engine.current() == ("blink-yellow", 0)
+    assert wait_until(lambda: len(backend.edges(PINS["yellow"], 1.0, since=resumed_at)) >= 2)
+    assert backend.edges(PINS["green"], 1.0, since=preempted_at) == []
+
+
+def test_stop_leaves_no_stray_edges(engine, backend) -> None:
+    engine.play(led_patterns.blink("green", times=None, interval=INTERVAL))
+    assert wait_until(lambda: len(backend.edges(PINS["green"], 1.0)) >= 2)
+
+    engine.stop()
+    stopped_trace = list(backend.trace)
+    time.sleep(INTERVAL * 5)
+
+    assert list(backend.trace) == stopped_trace
+    assert backend.levels[PINS["green"]] == 0.0
+    assert not engine.is_animating()
+
+
+def test_led_service_command_cancels_blink(backend) -> None:
+    service = LEDService(backend=backend)
+    try:
+        assert service.blink("yellow", times=None, interval=INTERVAL)
+        assert wait_until(lambda: len(backend.edges(PINS["yellow"], 1.0)) >= 2)
+        assert service.is_blinking()
+
+        assert service.set_color_exclusive("green")
+        switched_trace = list(backend.trace)
+        time.sleep(INTERVAL * 5)
+
+        assert list(backend.trace) == switched_trace
+        assert backend.levels == {PINS["green"]: 1.0, PINS["yellow"]: 0.0, PINS["red"]: 0.0}
+        assert not service.is_blinking()
+        assert not service.set_color_exclusive("blue")
+        assert not service.play_pattern({"type": "blink", "color": "green", "times": 0})
+    finally:
+        service.cleanup()
+    assert all(level == 0.0 for level in backend.levels.values())
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+PI_DIR = Path(__file__).resolve().parents[2] / "pi" / "python"
+if str(PI_DIR) not in sys.path:
+    sys.path.append(str(PI_DIR))
+
+import threading
+
+from session_manager import SessionManager
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_session_expires_on_the_manager_thread(tmp_path) -> None:
+    clock = FakeClock()
+    expired = []
+    notified = threading.Event()
+
+    def on_expire(session):
+        expired.append(session)
+        notified.set()
+
+    sessions = SessionManager(on_expire, path=str(tmp_path / "session.json"), clock=clock)
+    sessions.start_thread()
+    try:
+        # The thread re-reads the clock after waiting `remaining` real seconds
+        session = sessions.start("order-1", "green", 0.05)
+        assert not notified.wait(0.1)
+        clock.now += 1
+        assert notified.wait(2)
+    finally:
+        sessions.stop()
+
+    assert expired == [session]
+    assert sessions.expire(session)
+    assert sessions.current() is None
+
+
+def test_extension_defers_expiry(tmp_path) -> None:
+    clock = FakeClock()
+    sessions = SessionManager(lambda session: None, path=str(tmp_path / "session.json"), clock=clock)
+
+    session = sessions.start("order-1", "green", 60)
+    clock.now += 50
+    sessions.extend(30)
+    clock.now += 20
+
+    assert sessions.remaining() == 20
+    assert not sessions.expire(session)
+    clock.now += 20
+    assert sessions.expire(session)
+    assert session.duration == 90
+
+
+def test_restore_resumes_or_ends_saved_session(tmp_path) -> None:
+    path = str(tmp_path / "session.json")
+    clock = FakeClock()
+    SessionManager(lambda session: None, path=path, clock=clock).start("order-1", "green", 60)
+
+    clock.now += 30
+    resumed, ended = SessionManager(lambda session: None, path=path, clock=clock).restore()
+    assert ended is None
+    assert resumed.order_id == "order-1"
+
+    clock.now += 60
+    restarted = SessionManager(lambda session: None, path=path, clock=clock)
+    resumed, ended = restarted.restore()
+    assert resumed is None
+    assert ended.order_id == "order-1"
+    assert restarted.restore() == (None, None)
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from psycopg2.extras import RealDictRow
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+
+
+def make_rows():
+    row = RealDictRow()
+    row.update({
+        "id": uuid4(),
+        "label": "Laundry ü",
+        "created_at": datetime(2025, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+        "naive_at": datetime(2025, 3, 1, 12, 30, 5),
+        "day": date(2025, 3, 1),
+        "revenue": Decimal("12.50"),
+        "orders": Decimal("7"),
+        "labels": ["a", "b"],
+        "missing": None,
+    })
+    return [row]
+
+
+def test_fast_response_matches_default_encoding() -> None:
+    rows = make_rows()
+    assert FastJSONResponse(rows).body == JSONResponse(jsonable_encoder(rows)).body
+
+
+def test_stdlib_fallback_matches_default_encoding(monkeypatch) -> None:
+    rows = make_rows()
+    monkeypatch.setattr(responses, "orjson", None)
+    assert FastJSONResponse(rows).body == JSONResponse(jsonable_encoder(rows)).body
@@ -0,0 +1,187 @@
+import sys
+from pathlib import Path
+import types
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+sys.modules.setdefault("stripe", types.SimpleNamespace())
+
+import gzip
+import json
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.database import get_db
+
+
+DEVICE_ID = str(uuid4())
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.commits = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+
+class FakeCursor:
+    """Emulates the device lookup, the batch INSERT ... ON CONFLICT and order transitions"""
+
+    def __init__(self, store: Dict) -> None:
+        self.store = store
+        self.connection = store["connection"]
+        self._rows: List[Dict] = []
+
+    def execute(self, query: str, params=None) -> None:
+        normalized = " ".join(query.strip().split())
+        self.store["queries"].append(normalized)
+        self._rows = []
+
+        if normalized.startswith("SELECT id FROM devices"):
+            if params[0] == DEVICE_ID:
+                self._rows = [{"id": DEVICE_ID}]
+        elif normalized.startswith("INSERT INTO logs"):
+            columns = zip(
+                params["client_event_ids"], params["oks"], params["details"], params["occurred_at"]
+            )
+            for client_event_id, ok, details, occurred_at in columns:
+                key = (params["device_id"], client_event_id)
+                if key in self.store["logs"]:
+                    continue
+                self.store["logs"][key] = {"ok": ok, "details": details, "occurred_at": occurred_at}
+                self._rows.append({"client_event_id": client_event_id})
+        elif normalized.startswith("WITH target AS"):
+            order = self.store["orders"].get(params["order_id"])
+            if order is None or order["device_id"] != params["device_id"]:
+                return
+            previous_status = order["status"]
+            updated = {key: None for key in order}
+            if previous_status in params["allowed"]:
+                order["status"] = params["new_status"]
+                updated = dict(order)
+            self._rows = [{"previous_status": previous_status, **updated}]
+        else:
+            raise NotImplementedError(f"Unsupported query in fake cursor: {normalized}")
+
+    def fetchone(self) -> Optional[Dict]:
+        return dict(self._rows[0]) if self._rows else None
+
+    def fetchall(self) -> List[Dict]:
+        return [dict(row) for row in self._rows]
+
+
+@pytest.fixture
+def store() -> Dict:
+    return {"logs": {}, "orders": {}, "queries": [], "connection": FakeConnection()}
+
+
+@pytest.fixture
+def client(store: Dict) -> TestClient:
+    def override_get_db():
+        yield FakeCursor(store)
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    app.dependency_overrides.clear()
+
+
+def make_order(status: str) -> Dict:
+    return {"id": str(uuid4()), "device_id": DEVICE_ID, "status": status}
+
+
+def post_batch(client: TestClient, events: List[Dict], compress: bool = False):
+    body = json.dumps({"events": events}).encode()
+    headers = {"Content-Type": "application/json"}
+    if compress:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    return client.post(f"/devices/{DEVICE_ID}/telemetry/batch", content=body, headers=headers)
+
+
+def test_batch_stores_events_and_updates_orders(client: TestClient, store: Dict) -> None:
+    order = make_order("PAID")
+    store["orders"][order["id"]] = order
+    events = [
+        {"client_event_id": "1", "event": "INFO", "details": "BLE ON green"},
+        {"client_event_id": "2", "event": "STARTED", "order_id": order["id"], "occurred_at": "2025-11-01T10:00:00Z"},
+        {"client_event_id": "3", "event": "DONE", "order_id": order["id"]},
+    ]
+
+    response = post_batch(client, events, compress=True)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 3 and body["duplicates"] == 0
+    assert body["acked"] == ["1", "2", "3"]
+    assert body["order_status_updates"] == 2
+    assert order["status"] == "DONE"
+    assert store["logs"][(DEVICE_ID, "1")]["ok"] is True
+    # Device lookup, one INSERT for the batch, one transition per status event
+    assert [q.split()[0] for q in store["queries"]] == ["SELECT", "INSERT", "WITH", "WITH"]
+
+
+def test_retried_batch_is_acked_without_duplicates(client: TestClient, store: Dict) -> None:
+    order = make_order("PAID")
+    store["orders"][order["id"]] = order
+    events = [{"client_event_id": "a", "event": "STARTED", "order_id": order["id"]}]
+
+    first = post_batch(client, events)
+    order["status"] = "DONE"
+    retry = post_batch(client, events + events)
+
+    assert first.json()["accepted"] == 1
+    assert retry.json() == {
+        "accepted": 0,
+        "duplicates": 1,
+        "rejected": [],
+        "acked": ["a"],
+        "order_status_updates": 0,
+    }
+    # The duplicate STARTED must not move the order again
+    assert order["status"] == "DONE"
+    assert len(store["logs"]) == 1
+
+
+def test_malformed_order_id_is_rejected_but_acked(client: TestClient, store: Dict) -> None:
+    response = post_batch(client, [
+        {"client_event_id": "x", "event": "DONE", "order_id": "not-a-uuid"},
+        {"client_event_id": "y", "event": "INFO"},
+    ])
+
+    body = response.json()
+    assert body["rejected"] == ["x"]
+    assert body["acked"] == ["x", "y"]
+    assert body["accepted"] == 1
+
+
+def test_batch_limits_and_errors(client: TestClient, monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TELEMETRY_BATCH_MAX_EVENTS", 2)
+    too_many = post_batch(client, [{"client_event_id": str(i), "event": "INFO"} for i in range(3)])
+    monkeypatch.setattr(settings, "TELEMETRY_BATCH_MAX_BYTES", 64)
+    too_big = post_batch(client, [{"client_event_id": "1", "event": "INFO", "details": "x" * 200}], compress=True)
+    invalid = post_batch(client, [{"event": "INFO"}])
+    bad_gzip = client.post(
+        f"/devices/{DEVICE_ID}/telemetry/batch", content=b"not gzip", headers={"Content-Encoding": "gzip"}
+    )
+    missing = client.post(f"/devices/{uuid4()}/telemetry/batch", json={"events": []})
+
+    assert too_many.status_code == 413
+    assert too_big.status_code == 413
+    assert invalid.status_code == 422
+    assert bad_gzip.status_code == 400
+    assert missing.status_code == 404
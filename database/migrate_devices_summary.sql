@@ -0,0 +1,39 @@
+-- Migration Script: Rewrite v_devices_summary without the join fan-out
+-- The old view joined devices x device_services x services x orders and used
+-- COUNT(DISTINCT ...), so each device produced services x orders intermediate rows.
+-- Service and order counts are now aggregated per device and joined once.
+-- Output columns and types are unchanged, so CREATE OR REPLACE is sufficient.
+
+CREATE OR REPLACE VIEW v_devices_summary AS
+SELECT 
+    d.id,
+    d.label,
+    d.model,
+    d.location,
+    d.status,
+    COALESCE(svc.service_count, 0) as service_count,
+    COALESCE(svc.active_service_count, 0) as active_service_count,
+    COALESCE(ord.total_orders, 0) as total_orders,
+    COALESCE(ord.completed_orders, 0) as completed_orders,
+    d.created_at
+FROM devices d
+LEFT JOIN (
+    SELECT
+        ds.device_id,
+        COUNT(*) as service_count,
+        COUNT(*) FILTER (WHERE s.active = true) as active_service_count
+    FROM device_services ds
+    JOIN services s ON ds.service_id = s.id
+    GROUP BY ds.device_id
+) svc ON svc.device_id = d.id
+LEFT JOIN (
+    SELECT
+        device_id,
+        COUNT(*) as total_orders,
+        COUNT(*) FILTER (WHERE status = 'DONE') as completed_orders
+    FROM orders
+    GROUP BY device_id
+) ord ON ord.device_id = d.id;
+
+-- Order counts per device are served by idx_orders_device_status (device_id, status)
+CREATE INDEX IF NOT EXISTS idx_orders_device_status ON orders(device_id, status);
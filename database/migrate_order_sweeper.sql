@@ -0,0 +1,6 @@
+-- Migration Script: Index for the order expiry sweeper
+-- The backend sweeper fails CREATED/PAID orders older than the configured timeouts.
+-- This partial index keeps each sweep batch an index range scan.
+
+CREATE INDEX IF NOT EXISTS idx_orders_pending_updated_at ON orders(status, updated_at)
+    WHERE status IN ('CREATED', 'PAID');
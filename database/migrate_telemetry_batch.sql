@@ -0,0 +1,10 @@
+-- Migration Script: Store-and-forward telemetry from devices
+-- Devices journal events locally and upload them in batches
+-- (POST /devices/{id}/telemetry/batch). A batch may be re-sent after a lost
+-- response, so each event carries a device-assigned id that is stored once.
+
+ALTER TABLE logs ADD COLUMN IF NOT EXISTS client_event_id VARCHAR(64);
+ALTER TABLE logs ADD COLUMN IF NOT EXISTS occurred_at TIMESTAMP WITH TIME ZONE;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_logs_device_client_event ON logs(device_id, client_event_id)
+    WHERE client_event_id IS NOT NULL;
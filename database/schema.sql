@@ -245,6 +245,9 @@ CREATE INDEX idx_orders_service_id ON orders(service_id);
 CREATE INDEX idx_orders_status ON orders(status);
 CREATE INDEX idx_orders_created_at ON orders(created_at DESC);
 CREATE INDEX idx_orders_device_status ON orders(device_id, status);
+-- Supports the order expiry sweeper (stale CREATED/PAID orders by age)
+CREATE INDEX idx_orders_pending_updated_at ON orders(status, updated_at)
+    WHERE status IN ('CREATED', 'PAID');
 
 -- Trigger to auto-update updated_at
 CREATE TRIGGER update_orders_updated_at
@@ -288,6 +291,8 @@ CREATE TABLE logs (
     payload_hash VARCHAR(64),
     ok BOOLEAN DEFAULT true,
     details TEXT,
+    client_event_id VARCHAR(64),  -- Device-assigned id for batched uploads (deduplicates retries)
+    occurred_at TIMESTAMP WITH TIME ZONE,  -- Device clock time for batched uploads
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -297,6 +302,9 @@ CREATE INDEX idx_logs_direction ON logs(direction);
 CREATE INDEX idx_logs_ok ON logs(ok);
 CREATE INDEX idx_logs_created_at ON logs(created_at DESC);
 CREATE INDEX idx_logs_device_created ON logs(device_id, created_at DESC);
+-- Store-and-forward telemetry: one row per (device, client event id)
+CREATE UNIQUE INDEX idx_logs_device_client_event ON logs(device_id, client_event_id)
+    WHERE client_event_id IS NOT NULL;
 
 -- ============================================================
 -- ADMIN LOGS TABLE (Admin Action Audit Trail)
@@ -323,7 +331,7 @@ CREATE INDEX idx_admin_logs_entity ON admin_logs(entity_type, entity_id);
 -- VIEWS (for common queries)
 -- ============================================================
 
--- Active devices with service counts
+-- Active devices with service counts (per-device aggregates joined once, no fan-out)
 CREATE OR REPLACE VIEW v_devices_summary AS
 SELECT 
     d.id,
@@ -331,16 +339,29 @@ SELECT
     d.model,
     d.location,
     d.status,
-    COUNT(DISTINCT ds.service_id) as service_count,
-    COUNT(DISTINCT ds.service_id) FILTER (WHERE s.active = true) as active_service_count,
-    COUNT(DISTINCT o.id) as total_orders,
-    COUNT(DISTINCT o.id) FILTER (WHERE o.status = 'DONE') as completed_orders,
+    COALESCE(svc.service_count, 0) as service_count,
+    COALESCE(svc.active_service_count, 0) as active_service_count,
+    COALESCE(ord.total_orders, 0) as total_orders,
+    COALESCE(ord.completed_orders, 0) as completed_orders,
     d.created_at
 FROM devices d
-LEFT JOIN device_services ds ON d.id = ds.device_id
-LEFT JOIN services s ON ds.service_id = s.id
-LEFT JOIN orders o ON d.id = o.device_id
-GROUP BY d.id, d.label, d.model, d.location, d.status, d.created_at;
+LEFT JOIN (
+    SELECT
+        ds.device_id,
+        COUNT(*) as service_count,
+        COUNT(*) FILTER (WHERE s.active = true) as active_service_count
+    FROM device_services ds
+    JOIN services s ON ds.service_id = s.id
+    GROUP BY ds.device_id
+) svc ON svc.device_id = d.id
+LEFT JOIN (
+    SELECT
+        device_id,
+        COUNT(*) as total_orders,
+        COUNT(*) FILTER (WHERE status = 'DONE') as completed_orders
+    FROM orders
+    GROUP BY device_id
+) ord ON ord.device_id = d.id;
 
 -- Order details with device and service info
 CREATE OR REPLACE VIEW v_orders_detailed AS
@@ -4,6 +4,11 @@ import './App.css'
 
 const POLL_INTERVAL_MS = 1000
 
+// code.py pushes state changes over Server-Sent Events (pi/python/kiosk_state.py);
+// state.json is only polled while the event stream is unavailable
+const STATE_EVENTS_URL =
+  process.env.REACT_APP_STATE_EVENTS_URL || `http://${window.location.hostname || 'localhost'}:8765/events`
+
 const defaultMessages = {
   LOADING: 'Loading status...',
   QR: 'Scan QR Code',
@@ -27,17 +32,36 @@ const computeRemainingSeconds = (data) => {
   return Math.max(data.duration_seconds - elapsed, 0)
 }
 
+const toUiState = (data) => {
+  const normalizedStatus = (data.status || (data.qr_url ? 'QR' : 'IDLE')).toUpperCase()
+  return {
+    status: normalizedStatus,
+    qrUrl: data.qr_url || '',
+    message: data.message || defaultMessages[normalizedStatus] || defaultMessages.IDLE,
+    data,
+    error: ''
+  }
+}
+
 function App() {
   const [uiState, setUiState] = useState({
     status: 'LOADING',
     qrUrl: '',
     message: defaultMessages.LOADING,
-    remaining: null,
+    data: null,
     error: ''
   })
+  const [remaining, setRemaining] = useState(null)
 
   useEffect(() => {
     let isMounted = true
+    let intervalId = null
+    let source = null
+
+    const applyState = (data) => {
+      if (!isMounted) return
+      setUiState(toUiState(data))
+    }
 
     const pollState = async () => {
       try {
@@ -45,21 +69,7 @@ function App() {
         if (!res.ok) {
           throw new Error(`HTTP ${res.status}`)
         }
-
-        const data = await res.json()
-        const normalizedStatus = (data.status || (data.qr_url ? 'QR' : 'IDLE')).toUpperCase()
-        const remainingSeconds = computeRemainingSeconds(data)
-        const message = data.message || defaultMessages[normalizedStatus] || defaultMessages.IDLE
-
-        if (!isMounted) return
-
-        setUiState({
-          status: normalizedStatus,
-          qrUrl: data.qr_url || '',
-          message,
-          remaining: remainingSeconds,
-          error: ''
-        })
+        applyState(await res.json())
       } catch (err) {
         if (!isMounted) return
         setUiState((prev) => ({
@@ -67,21 +77,61 @@ function App() {
           status: 'ERROR',
           message: defaultMessages.ERROR,
           error: err?.message || 'Failed to fetch state.json',
-          remaining: null
+          data: null
         }))
       }
     }
 
-    pollState()
-    const intervalId = setInterval(pollState, POLL_INTERVAL_MS)
+    const startPolling = () => {
+      if (intervalId) return
+      pollState()
+      intervalId = setInterval(pollState, POLL_INTERVAL_MS)
+    }
+
+    const stopPolling = () => {
+      if (!intervalId) return
+      clearInterval(intervalId)
+      intervalId = null
+    }
+
+    if (typeof window.EventSource === 'function') {
+      source = new EventSource(STATE_EVENTS_URL)
+      source.onopen = stopPolling
+      source.onmessage = (event) => {
+        try {
+          applyState(JSON.parse(event.data))
+        } catch (err) {
+          // Ignore a malformed event; the next push replaces it
+        }
+      }
+      // EventSource reconnects by itself; poll until it does
+      source.onerror = startPolling
+    } else {
+      startPolling()
+    }
 
     return () => {
       isMounted = false
-      clearInterval(intervalId)
+      stopPolling()
+      if (source) source.close()
     }
   }, [])
 
-  const { status, qrUrl, message, remaining, error } = uiState
+  // The countdown ticks locally; pushed state only changes on transitions
+  useEffect(() => {
+    const { status, data } = uiState
+    if (status !== 'RUNNING' || !data || !data.duration_seconds) {
+      setRemaining(null)
+      return undefined
+    }
+
+    const tick = () => setRemaining(computeRemainingSeconds(data))
+    tick()
+    const tickId = setInterval(tick, 1000)
+    return () => clearInterval(tickId)
+  }, [uiState])
+
+  const { status, qrUrl, message, error } = uiState
 
   return (
     <div className="App">
@@ -11,23 +11,23 @@ if [ ! -d "build" ]; then
 fi
 
 # IMPORTANT: Link state.json to where code.py writes it
-# code.py writes to /var/www/html/state.json
+# code.py writes to tmpfs (/dev/shm/remoteled/state.json, override with KIOSK_STATE_FILE)
 # React kiosk expects /state.json (relative to build/)
-STATE_SOURCE="/var/www/html/state.json"
+STATE_SOURCE="${KIOSK_STATE_FILE:-/dev/shm/remoteled/state.json}"
 STATE_LINK="build/state.json"
 
-# Create initial state.json in /var/www/html if it doesn't exist
+# Create initial state.json if code.py has not written one yet
 if [ ! -f "$STATE_SOURCE" ]; then
     echo "Creating initial state.json in $STATE_SOURCE..."
-    sudo mkdir -p /var/www/html
-    cat << 'EOF' | sudo tee "$STATE_SOURCE" > /dev/null
+    mkdir -p "$(dirname "$STATE_SOURCE")"
+    cat << 'EOF' > "$STATE_SOURCE"
 {
   "qr_url": "http://loading...",
   "status": "QR",
   "timestamp": 0
 }
 EOF
-    sudo chmod 666 "$STATE_SOURCE"
+    chmod 666 "$STATE_SOURCE"
 fi
 
 # Remove old state.json in build/ and create symlink to the real one
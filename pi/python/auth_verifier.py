@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Authorization Verifier - Offline checks of backend-signed authorizations
+The backend signs sha256("RemoteLED:Authorization:" + "k1=v1&k2=v2...") with
+secp256k1 (keys sorted). The phone relays {"payload": ..., "signature_hex": ...}
+over BLE and the Pi checks it against a cached public key: signature, deviceId,
+exp and a one-time nonce. No backend round-trip happens at the kiosk.
+
+Configuration (env):
+    AUTH_PUBLIC_KEY          PEM or uncompressed hex public key (skips fetching)
+                             Over plain http the first fetched key is kept: a different
+                             key only replaces it when API_BASE_URL is https
+    AUTH_KEY_CACHE_PATH      cached key from GET /authorizations/public-key (default ./data/auth_public_key.json)
+    AUTH_NONCE_CACHE_PATH    nonces already used (default ./data/auth_nonces.json)
+    AUTH_CLOCK_SKEW_SECONDS  grace period after exp for a slow Pi clock (default 30)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from ecdsa import BadSignatureError, SECP256k1, VerifyingKey
+from ecdsa.util import sigdecode_der
+from logger import get_logger
+
+logger = get_logger("auth_verifier")
+
+MESSAGE_PREFIX = "RemoteLED:Authorization:"
+REQUIRED_FIELDS = ("deviceId", "orderId", "seconds", "nonce", "exp")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class AuthorizationError(Exception):
+    """Authorization rejected; `reason` is a short machine-readable code"""
+
+    def __init__(self, reason, message=None):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+def _write_json_atomic(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_file = path + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_file, path)
+
+
+def _parse_public_key(value):
+    value = value.strip()
+    if value.startswith('-----BEGIN'):
+        return VerifyingKey.from_pem(value)
+    return VerifyingKey.from_string(bytes.fromhex(value), curve=SECP256k1)
+
+
+class NonceCache:
+    """
+    Nonces already accepted, kept until their authorization expires.
+
+    Bounded to `max_entries` (oldest dropped first) and saved to disk on every
+    change, so a restart cannot be used to replay a still-valid authorization.
+    """
+
+    def __init__(self, path, max_entries=4096):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+            now = time.time()
+            for nonce, exp in sorted(stored.items(), key=lambda item: item[1]):
+                if exp >= now:
+                    self._entries[nonce] = exp
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable nonce cache %s: %s", path, e)
+
+    def add(self, nonce, expires_at):
+        """Record a nonce; returns False if it was already used"""
+        with self._lock:
+            self._prune(time.time())
+            if nonce in self._entries:
+                return False
+            self._entries[nonce] = expires_at
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            try:
+                _write_json_atomic(self.path, dict(self._entries))
+            except OSError as e:
+                logger.warning("Could not persist nonce cache: %s", e)
+            return True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _prune(self, now):
+        expired = [nonce for nonce, exp in self._entries.items() if exp < now]
+        for nonce in expired:
+            del self._entries[nonce]
+
+
+class AuthorizationVerifier:
+    """
+    Verifies authorizations with a locally cached backend public key.
+
+    The key comes from AUTH_PUBLIC_KEY, else from the cache file, and is
+    refreshed from the backend in the background (start_refresh), so
+    verify() itself never touches the network. A fetched key only replaces
+    the cached one over https; over http anyone on the path could swap it.
+    """
+
+    def __init__(self, device_id, api_base_url, clock_skew=None, key_cache_path=None, nonce_cache_path=None):
+        self.device_id = device_id.lower()
+        self.key_url = f"{api_base_url.rstrip('/')}/authorizations/public-key"
+        self.clock_skew = float(clock_skew if clock_skew is not None else os.getenv('AUTH_CLOCK_SKEW_SECONDS', '30'))
+        self.key_cache_path = key_cache_path or os.getenv(
+            'AUTH_KEY_CACHE_PATH', os.path.join(DATA_DIR, 'auth_public_key.json'))
+        self.nonces = NonceCache(nonce_cache_path or os.getenv(
+            'AUTH_NONCE_CACHE_PATH', os.path.join(DATA_DIR, 'auth_nonces.json')))
+        self.key_id = None
+        self._key = None
+        self._pinned = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._load_key()
+
+    @property
+    def ready(self):
+        return self._key is not None
+
+    def verify(self, authorization, now=None):
+        """
+        Check a relayed authorization and consume its nonce.
+
+        Returns the payload dict; raises AuthorizationError otherwise.
+        """
+        key = self._key
+        if key is None:
+            raise AuthorizationError("no_key", "No server public key cached yet")
+        if not isinstance(authorization, dict):
+            raise AuthorizationError("malformed", "Authorization must be an object")
+        payload = authorization.get("payload")
+        signature_hex = authorization.get("signature_hex") or authorization.get("signature")
+        if not isinstance(payload, dict) or not isinstance(signature_hex, str):
+            raise AuthorizationError("malformed", "Authorization needs payload and signature_hex")
+        missing = [field for field in REQUIRED_FIELDS if field not in payload]
+        if missing:
+            raise AuthorizationError("malformed", f"Payload missing {', '.join(missing)}")
+
+        # Same canonical form as the backend's CryptoService._serialize_payload
+        canonical = "&".join(f"{k}={payload[k]}" for k in sorted(payload))
+        digest = hashlib.sha256(f"{MESSAGE_PREFIX}{canonical}".encode('utf-8')).digest()
+        try:
+            key.verify_digest(bytes.fromhex(signature_hex), digest, sigdecode=sigdecode_der)
+        except (BadSignatureError, ValueError) as e:
+            raise AuthorizationError("bad_signature", f"Signature check failed: {e}")
+
+        if str(payload["deviceId"]).lower() != self.device_id:
+            raise AuthorizationError("wrong_device", f"Authorization is for device {payload['deviceId']}")
+        now = time.time() if now is None else now
+        try:
+            exp = int(payload["exp"])
+            seconds = int(payload["seconds"])
+        except (TypeError, ValueError):
+            raise AuthorizationError("malformed", "exp and seconds must be integers")
+        if now > exp + self.clock_skew:
+            raise AuthorizationError("expired", f"Authorization expired {int(now - exp)}s ago")
+        if seconds <= 0:
+            raise AuthorizationError("malformed", "seconds must be positive")
+        if not self.nonces.add(str(payload["nonce"]), exp + self.clock_skew):
+            raise AuthorizationError("replayed", "Authorization nonce already used")
+        return payload
+
+    def refresh_key(self, timeout=5.0):
+        """Fetch the backend public key; returns True when it changed"""
+        if self._pinned:
+            return False
+        try:
+            with urllib.request.urlopen(self.key_url, timeout=timeout) as response:
+                body = json.loads(response.read())
+            key = _parse_public_key(body["public_key_hex"])
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+            logger.warning("Could not fetch authorization public key: %s", e)
+            return False
+        if body.get("key_id") == self.key_id:
+            return False
+        if self._key is not None and not self.key_url.startswith("https://"):
+            logger.warning("Backend offered a different authorization key over plain http; keeping the cached one",
+                           extra={"key_id": self.key_id, "offered_key_id": body.get("key_id")})
+            return False
+        if body.get("ephemeral"):
+            logger.warning("Backend signing key is ephemeral; authorizations break on its next restart")
+        self._key, self.key_id = key, body.get("key_id")
+        try:
+            _write_json_atomic(self.key_cache_path, {
+                "key_id": self.key_id,
+                "public_key_hex": body["public_key_hex"],
+                "fetched_at": int(time.time()),
+            })
+        except OSError as e:
+            logger.warning("Could not cache authorization public key: %s", e)
+        logger.info("Authorization public key updated", extra={"key_id": self.key_id})
+        return True
+
+    def start_refresh(self, interval=6 * 3600, retry=60):
+        """Refresh the key in the background: retry every `retry` s until one is cached, then every `interval` s"""
+        if self._pinned or (self._thread and self._thread.is_alive()):
+            return
+
+        def run():
+            while not self._stop.is_set():
+                self.refresh_key()
+                self._stop.wait(interval if self.ready else retry)
+
+        self._thread = threading.Thread(target=run, name="auth-key-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _load_key(self):
+        configured = os.getenv('AUTH_PUBLIC_KEY', '')
+        if configured:
+            self._key = _parse_public_key(configured)
+            self._pinned = True
+            self.key_id = "configured"
+            return
+        try:
+            with open(self.key_cache_path) as f:
+                cached = json.load(f)
+            self._key = _parse_public_key(cached["public_key_hex"])
+            self.key_id = cached.get("key_id")
+        except FileNotFoundError:
+            logger.info("No cached authorization public key yet")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable key cache %s: %s", self.key_cache_path, e)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+LED timing benchmark - runs LEDService against simulated pins
+Measures, from the SimGPIOBackend transition trace:
+
+    command   time from a set_color_exclusive()/blink() call to the pin edge
+    period    blink period jitter (edge-to-edge) and lateness vs. the ideal schedule
+    stop      time from stop_blink() to the pin going low, and stray edges afterwards
+
+Runs on any Linux box (no RPi.GPIO needed):
+
+    python bench_led_timing.py
+    python bench_led_timing.py --interval 0.05 --duration 10 --load 2
+    python bench_led_timing.py --json results.json
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+
+from gpio_backend import SimGPIOBackend
+from led_service import LEDService
+
+
+def summarize(values_ms):
+    values = sorted(values_ms)
+    if not values:
+        return {"n": 0}
+    if len(values) > 1:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        p50, p99 = cuts[49], cuts[98]
+    else:
+        p50 = p99 = values[0]
+    return {
+        "n": len(values),
+        "mean": statistics.fmean(values),
+        "p50": p50,
+        "p99": p99,
+        "max": values[-1],
+        "stdev": statistics.pstdev(values),
+    }
+
+
+def bench_command_latency(led, backend, iterations):
+    """Call -> edge for exclusive-on and for the first edge of a blink"""
+    results = {"exclusive_on": [], "blink_start": []}
+    colors = list(led.PINS)
+    for i in range(iterations):
+        color = colors[i % len(colors)]
+        pin = led.PINS[color]
+        led.turn_off_all()
+
+        started = time.monotonic()
+        led.set_color_exclusive(color)
+        edges = backend.edges(pin, 1.0, since=started)
+        results["exclusive_on"].append((edges[0] - started) * 1000)
+
+        led.turn_off_all()
+        started = time.monotonic()
+        led.blink(color, times=1, interval=0.05)
+        edges = backend.edges(pin, 1.0, since=started)
+        results["blink_start"].append((edges[0] - started) * 1000)
+    led.turn_off_all()
+    return {name: summarize(values) for name, values in results.items()}
+
+
+def bench_period_jitter(led, backend, interval, duration):
+    """Continuous blink: edge-to-edge period error and lateness vs. the ideal schedule"""
+    pin = led.PINS["yellow"]
+    led.turn_off_all()
+    started = time.monotonic()
+    led.blink("yellow", times=None, interval=interval)
+    time.sleep(duration)
+    stopped = time.monotonic()
+    led.stop_blink()
+
+    # The stop itself is not a scheduled edge
+    rising = [t for t in backend.edges(pin, 1.0, since=started) if t < stopped]
+    falling = [t for t in backend.edges(pin, 0.0, since=started) if t < stopped]
+    period = interval * 2
+    period_error = [((b - a) - period) * 1000 for a, b in zip(rising, rising[1:])]
+    lateness = []
+    if rising:
+        first = rising[0]
+        lateness = [(t - (first + k * period)) * 1000 for k, t in enumerate(rising)]
+        lateness += [(t - (first + interval + k * period)) * 1000 for k, t in enumerate(falling)]
+    return {
+        "period_error": summarize([abs(e) for e in period_error]),
+        "lateness": summarize(lateness),
+        "cycles": len(rising),
+    }
+
+
+def bench_stop_latency(led, backend, iterations, interval):
+    """stop_blink() -> pin low, and any edge after stop_blink() returned"""
+    pin = led.PINS["green"]
+    latencies, call_times, stray = [], [], 0
+    rng = random.Random(7)
+    for _ in range(iterations):
+        led.turn_off_all()
+        led.blink("green", times=None, interval=interval)
+        # Stop at a random phase, so about half the stops hit an ON phase
+        time.sleep(interval * rng.uniform(0.5, 3.5))
+
+        on = backend.levels[pin] > 0
+        started = time.monotonic()
+        led.stop_blink()
+        returned = time.monotonic()
+        call_times.append((returned - started) * 1000)
+        if on:
+            edges = backend.edges(pin, 0.0, since=started)
+            latencies.append((edges[0] - started) * 1000)
+
+        time.sleep(interval * 2)
+        stray += len([t for t, p, _ in list(backend.trace) if p == pin and t > returned])
+    return {
+        "to_pin_low": summarize(latencies),
+        "call": summarize(call_times),
+        "stray_edges": stray,
+    }
+
+
+def start_load(threads):
+    """Busy Python threads competing for the GIL, like a loaded code.py"""
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+
+    for _ in range(threads):
+        threading.Thread(target=spin, daemon=True).start()
+    return stop
+
+
+def print_row(name, stats):
+    if not stats.get("n"):
+        print(f"  {name:<22} (no samples)")
+        return
+    print(
+        f"  {name:<22} n={stats['n']:<5} mean={stats['mean']:8.3f}  p50={stats['p50']:8.3f}  "
+        f"p99={stats['p99']:8.3f}  max={stats['max']:8.3f}  ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LEDService timing on simulated pins")
+    parser.add_argument("--iterations", type=int, default=200, help="command/stop samples (default: 200)")
+    parser.add_argument("--interval", type=float, default=0.1, help="blink interval in seconds (default: 0.1)")
+    parser.add_argument("--duration", type=float, default=5.0, help="continuous blink duration (default: 5)")
+    parser.add_argument("--load", type=int, default=0, help="busy threads to run alongside (default: 0)")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    backend = SimGPIOBackend(max_trace=200000)
+    led = LEDService(backend=backend)
+    load = start_load(args.load)
+    try:
+        results = {
+            "command": bench_command_latency(led, backend, args.iterations),
+            "period": bench_period_jitter(led, backend, args.interval, args.duration),
+            "stop": bench_stop_latency(led, backend, max(1, args.iterations // 10), args.interval),
+        }
+    finally:
+        load.set()
+        led.cleanup()
+
+    print(f"LEDService timing (interval {args.interval}s, load threads {args.load})")
+    print("command -> pin")
+    print_row("exclusive on", results["command"]["exclusive_on"])
+    print_row("blink first edge", results["command"]["blink_start"])
+    print(f"blink period ({results['period']['cycles']} cycles)")
+    print_row("|period error|", results["period"]["period_error"])
+    print_row("edge lateness", results["period"]["lateness"])
+    print("stop")
+    print_row("stop -> pin low", results["stop"]["to_pin_low"])
+    print_row("stop_blink() call", results["stop"]["call"])
+    print(f"  stray edges after stop: {results['stop']['stray_edges']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,26 @@ import json
 import os
 import threading
 import time
-from bluezero import adapter, peripheral
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from command_worker import CommandWorker
+from kiosk_state import KioskStateServer, kiosk_channel, kiosk_writer, link_legacy_path
+from logger import get_logger, setup_logging
+from session_manager import SessionManager
+from startup_timer import StartupTimer
+
+# bluezero/gi, ecdsa (auth_verifier) and the telemetry uploader are imported
+# where they are first used, so the QR and advertising are not held up by them
+startup_timer = StartupTimer()
+
+# Load environment variables from .env file (systemd installs pass them in the unit instead)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+# Structured logging (LOG_LEVEL / LOG_FORMAT), written by a background thread
+setup_logging()
+logger = get_logger("remoteled")
 
 # LED service will be initialized lazily in main()
 led_service = None
@@ -25,40 +40,61 @@ MACHINE_ID = os.getenv('MACHINE_ID', 'UNKNOWN')
 DEVICE_ID = os.getenv('DEVICE_ID', 'd1111111-1111-1111-1111-111111111111')
 API_BASE_URL = os.getenv('API_BASE_URL', '')
 if not API_BASE_URL:
-    print("[CONFIG] ⚠️ API_BASE_URL not set - using localhost:9999 as fallback")
+    logger.warning("API_BASE_URL not set - using localhost:9999 as fallback")
     API_BASE_URL = 'http://localhost:9999'
+# Refuse ON commands that carry no signed authorization (verified offline, see auth_verifier)
+AUTH_REQUIRED = os.getenv('AUTH_REQUIRED', 'false').lower() in ('1', 'true', 'yes')
 
 # Global state for the LED and BLE characteristics
 led_state = 'off'
 trigger = threading.Event()
 current_peripheral = None
 led_peripheral = None
+kiosk_server = None
 WEB_MESSAGE = "Loading Bluetooth..."
-STATE_FILE = os.getenv('KIOSK_STATE_FILE', '/var/www/html/state.json')
-QR_DATA_FILE = '/var/www/html/qr_data.json'  # Legacy file used by old static kiosk
+# Kiosk state files live on tmpfs (no SD-card writes); the old fixed paths
+# under /var/www/html are symlinked to them for nginx and the legacy kiosk
+STATE_DIR = os.getenv('KIOSK_STATE_DIR', '/dev/shm/remoteled')
+STATE_FILE = os.getenv('KIOSK_STATE_FILE', os.path.join(STATE_DIR, 'state.json'))
+QR_DATA_FILE = os.getenv('KIOSK_QR_DATA_FILE', os.path.join(STATE_DIR, 'qr_data.json'))  # Legacy static kiosk
+LEGACY_WEB_DIR = os.getenv('KIOSK_LEGACY_DIR', '/var/www/html')
 DETAIL_URL = None  # Store detail URL to show QR code again after service ends
-
-
-def _write_json_atomic(path, data):
-    """Write JSON to a file atomically and ensure world-readable permissions."""
+# Last adapter address, so the QR can be published before the adapter is queried
+ADAPTER_CACHE_FILE = os.getenv('ADAPTER_CACHE_FILE', os.path.join(DATA_DIR, 'adapter.json'))
+STARTUP_REPORT_FILE = os.path.join(STATE_DIR, 'startup.json')
+
+# BLE write/disconnect handling runs here, off the GLib mainloop
+command_worker = CommandWorker()
+
+# Session events are journaled locally and uploaded by the Pi itself (set up in main)
+telemetry_journal = None
+telemetry_uploader = None
+
+# Authorization checks for ON/EXTEND commands (set up in main)
+auth_verifier = None
+
+# RUNNING sessions with a duration are timed by the Pi itself and outlive BLE
+# disconnects and code.py restarts; expiry is handled on the command worker
+session_manager = SessionManager(
+    on_expire=lambda session: command_worker.submit(LEDController._expire_session, session, label="expire")
+)
+
+def record_event(event, details=None, order_id=None):
+    """Journal a telemetry event (STARTED/DONE/ERROR are uploaded right away)"""
+    if telemetry_journal is None:
+        return
     try:
-        target_dir = os.path.dirname(path)
-        if target_dir and not os.path.exists(target_dir):
-            os.makedirs(target_dir, exist_ok=True)
-
-        temp_file = path + '.tmp'
-        with open(temp_file, 'w') as f:
-            json.dump(data, f)
-        os.replace(temp_file, path)
-        os.chmod(path, 0o666)
-    except PermissionError as e:
-        print(f"[STATE] ❌ Permission denied writing to {path}: {e}")
+        telemetry_journal.record(event, order_id=order_id, details=details)
     except Exception as e:
-        print(f"[STATE] ❌ Error writing {path}: {e}")
+        logger.warning("Could not journal %s event: %s", event, e)
+        return
+    from telemetry_journal import SESSION_EVENTS
+    if telemetry_uploader and event in SESSION_EVENTS:
+        telemetry_uploader.notify()
 
 
 def update_kiosk_state(status, qr_url=None, message=None, duration_seconds=None, started_at=None, extra=None):
-    """Publish kiosk state.json so the React kiosk can render the correct view."""
+    """Push kiosk state to subscribed kiosks (SSE) and state.json (polling fallback)."""
     payload = {
         'status': status,
         'timestamp': int(time.time() * 1000)
@@ -75,61 +111,76 @@ def update_kiosk_state(status, qr_url=None, message=None, duration_seconds=None,
     if extra:
         payload.update(extra)
 
-    _write_json_atomic(STATE_FILE, payload)
+    kiosk_channel.publish(payload)
+    kiosk_writer.publish(STATE_FILE, payload)
 
 
 def publish_qr_code(deep_link):
-    """Write QR data to both legacy kiosk file and new React kiosk state.json."""
+    """Queue QR data for both the legacy kiosk file and the React kiosk state."""
     global WEB_MESSAGE
     WEB_MESSAGE = deep_link
     data = {'message': deep_link, 'timestamp': int(time.time() * 1000)}
 
     # Legacy support for the old static kiosk
-    _write_json_atomic(QR_DATA_FILE, data)
+    kiosk_writer.publish(QR_DATA_FILE, data)
 
     # New React kiosk state
     update_kiosk_state(status='QR', qr_url=deep_link, message='Scan QR Code')
 
     display_link = deep_link[:60] + "..." if len(deep_link) > 60 else deep_link
-    print(f"[QR] ✅ Published: {display_link}")
+    logger.info("QR published: %s", display_link)
 
 
 def init_led_service():
-    """Initialize LED service with error handling"""
+    """
+    Initialize LED service; without GPIO it drives simulated pins (LED_GPIO_BACKEND=sim).
+    If the service cannot start at all, LED commands become no-ops instead of
+    taking BLE and the kiosk down with them.
+    """
     global led_service
     try:
         from led_service import LEDService
         led_service = LEDService()
-        print("[LED] ✅ LEDService initialized successfully")
-        return True
-    except Exception as e:
-        print(f"[LED] ⚠️  LEDService initialization failed: {e}")
-        print("[LED] ⚠️  LED control will be disabled")
-        # Create a mock LED service that does nothing
+    except Exception:
+        logger.exception("LEDService initialization failed, LED control disabled")
         led_service = MockLEDService()
         return False
+    logger.info("LEDService initialized", extra={"backend": led_service.backend.name})
+    return led_service.backend.name != "sim"
 
 
 class MockLEDService:
-    """Mock LED service for when GPIO is not available"""
+    """Accepts every LEDService command and does nothing, for when the LED service cannot start"""
+
     def set_led(self, color, state):
-        print(f"[MockLED] set_led({color}, {state})")
+        logger.debug("MockLED set_led(%s, %s)", color, state)
         return True
-    
+
     def turn_off_all(self):
-        print("[MockLED] turn_off_all()")
-    
-    def blink(self, color, times=3, interval=0.3):
-        print(f"[MockLED] blink({color}, times={times})")
+        logger.debug("MockLED turn_off_all()")
+
+    def blink(self, color, times=3, interval=0.3, duty=0.5):
+        logger.debug("MockLED blink(%s, times=%s)", color, times)
         return True
-    
+
+    def play_pattern(self, pattern, priority=None):
+        logger.debug("MockLED play_pattern(%s)", pattern)
+        return True
+
+    def stop_pattern(self, priority=None):
+        pass
+
     def set_color_exclusive(self, color):
-        print(f"[MockLED] set_color_exclusive({color})")
+        logger.debug("MockLED set_color_exclusive(%s)", color)
         return True
-    
+
     def is_blinking(self):
         return False
-    
+
+    def get_pin(self, color):
+        # No real pins: every color is accepted
+        return 0
+
     def stop_blink(self):
         pass
 
@@ -139,40 +190,137 @@ class LEDController:
 
     @classmethod
     def on_connect(cls, ble_device):
-        print(f"[BLE] ✅ Device connected: {ble_device}")
+        logger.info("BLE device connected", extra={"device": str(ble_device)})
         # Inform kiosk that device is connected - stay on this until service ends
-        update_kiosk_state(status='CONNECTED', qr_url=DETAIL_URL, message='Device Connected')
+        # (a phone reconnecting mid-session leaves the countdown on screen)
+        if session_manager.current() is None:
+            update_kiosk_state(status='CONNECTED', qr_url=DETAIL_URL, message='Device Connected')
 
     @classmethod
     def on_disconnect(cls, adapter_address, device_address):
+        started = time.perf_counter()
+        logger.info("BLE device disconnected", extra={"device": device_address})
+        command_worker.submit(cls._handle_disconnect, device_address, label="disconnect")
+        command_worker.record_callback(started)
+
+    @classmethod
+    def _handle_disconnect(cls, device_address):
         global led_service, led_state, DETAIL_URL
-        print(f"[BLE] Device disconnected: {device_address}")
-        
+
         # Give the app a brief moment in case it's sending final commands
+        # (sleeps on the command worker; the mainloop keeps serving GATT requests)
         time.sleep(0.3)
-        
+
+        # A timed session keeps running; the Pi ends it at expiry even if the phone never returns
+        session = session_manager.current()
+        if session is not None:
+            remaining = session_manager.remaining(session)
+            logger.info("Disconnected during session, %.0fs left", remaining)
+            record_event("INFO", f"BLE disconnected, session continues ({remaining:.0f}s left)", session.order_id)
+            return
+
         # Failsafe: Reset to idle state after any disconnect
         # This ensures the kiosk is scannable again even if app didn't send OFF/RESET
-        print("[BLE] 🔄 Disconnect cleanup - restoring idle state...")
-        
+        logger.debug("Disconnect cleanup - restoring idle state")
+
         if led_service:
             led_service.stop_blink()
             led_service.turn_off_all()
             led_service.set_color_exclusive("red")
             led_state = 'red_on'
-        
+        record_event("INFO", f"BLE disconnected, LED {led_state}")
+
+        # Restore QR code for next user
+        if DETAIL_URL:
+            publish_qr_code(DETAIL_URL)
+            logger.debug("QR code restored for next user")
+
+        logger.debug("BLE command latency", extra=command_worker.stats())
+
+    @classmethod
+    def _verify_authorization(cls, command, authorization):
+        """Payload of a valid authorization, or None (refusal is logged and journaled)"""
+        if authorization is None:
+            reason = "missing"
+        elif auth_verifier is None:
+            reason = "verifier_unavailable"
+        else:
+            from auth_verifier import AuthorizationError
+            try:
+                return auth_verifier.verify(authorization)
+            except AuthorizationError as e:
+                reason = e.reason
+                logger.warning("Authorization rejected: %s", e)
+        payload = authorization.get("payload") if isinstance(authorization, dict) else None
+        order_id = payload.get("orderId") if isinstance(payload, dict) else None
+        record_event("INFO", f"{command} rejected: authorization {reason}", order_id)
+        return None
+
+    @classmethod
+    def _end_session(cls, reason, order_id=None):
+        """Turn off all LEDs, set back to RED (idle state) and restore the QR code"""
+        global led_state
+        led_service.turn_off_all()
+        time.sleep(0.1)  # Brief pause before setting RED
+        led_service.set_color_exclusive("red")
+        led_state = 'red_idle'
+        logger.debug("Service ended (%s) -> red (idle)", reason)
+        record_event("DONE", f"{reason}: LED {led_state}", order_id)
+
         # Restore QR code for next user
         if DETAIL_URL:
             publish_qr_code(DETAIL_URL)
-            print("[BLE] ✅ QR code restored for next user")
+            logger.debug("QR code restored for next user")
+
+    @classmethod
+    def _expire_session(cls, session):
+        # An OFF/RESET/ON/EXTEND handled before this ran already ended, replaced or extended it
+        if not session_manager.expire(session):
+            return
+        logger.info("Session time is up", extra={"order_id": session.order_id, "duration": session.duration})
+        cls._end_session("EXPIRED", session.order_id)
+
+    @classmethod
+    def _show_session(cls, session):
+        update_kiosk_state(
+            status='RUNNING',
+            qr_url=DETAIL_URL,
+            message='Service Active',
+            duration_seconds=session.duration,
+            started_at=session.started_at
+        )
+
+    @classmethod
+    def resume_session(cls, resumed, ended):
+        """After a restart: pick the saved session back up, or close the one that ran out meanwhile"""
+        global led_state
+        if ended is not None:
+            logger.info("Session ended while code.py was down", extra={"order_id": ended.order_id})
+            record_event("DONE", "EXPIRED while restarting", ended.order_id)
+        if resumed is None or not led_service:
+            return
+        if led_service.set_color_exclusive(resumed.color):
+            led_state = f'{resumed.color}_on'
+        cls._show_session(resumed)
+        logger.info("Session resumed", extra={
+            "order_id": resumed.order_id,
+            "remaining": round(session_manager.remaining(resumed)),
+        })
 
     @classmethod
     def on_read(cls, options):
-        print(f"[BLE] Read request - current state: {led_state}")
+        logger.debug("Read request", extra={"led_state": led_state})
         return led_state.encode()
 
     @classmethod
     def on_write(cls, value, options):
+        # Return to the mainloop at once; commands run in arrival order on the worker
+        started = time.perf_counter()
+        command_worker.submit(cls._handle_write, bytes(value), label="write")
+        command_worker.record_callback(started)
+
+    @classmethod
+    def _handle_write(cls, value):
         global led_state, led_service
         try:
             value_str = value.decode("utf-8")
@@ -180,79 +328,145 @@ class LEDController:
             command = data.get("command", "").upper()
             color = data.get("color", "green").lower()
             request_key = data.get("bleKey", "")
+            # The app sends "orderId" once it has an order (BLEConnectionManager.setOrderId);
+            # otherwise commands belong to the running session, if any
+            session = session_manager.current()
+            order_id = data.get("orderId") or (session.order_id if session else None)
 
-            print(f"\n[BLE] ▶ Received: {command} color={color}")
+            logger.info("BLE command received", extra={"command": command, "color": color})
             
             # Log if a blink is currently running
             if led_service and led_service.is_blinking():
-                print(f"[BLE] ⚠️  Interrupting ongoing blink...")
+                logger.debug("Interrupting ongoing blink")
 
             if request_key != BLE_KEY:
-                print(f"[BLE] ❌ Invalid BLE key")
+                logger.warning("Invalid BLE key", extra={"command": command})
+                record_event("INFO", f"{command} rejected: invalid BLE key")
                 return
 
             if command == "ON":
-                # Solid ON - device is running
+                # Solid ON - device is running; a signed authorization sets order and duration
+                duration_seconds = data.get("duration_seconds") or data.get("duration")
+                authorization = data.get("authorization")
+                if led_service.get_pin(color) is None:
+                    # Checked first: verifying the authorization spends its one-time nonce
+                    logger.warning("Unknown color: %s", color)
+                    record_event("INFO", f"{command} rejected: unknown color {color}", order_id)
+                    return
+                if authorization is not None or AUTH_REQUIRED:
+                    payload = cls._verify_authorization(command, authorization)
+                    if payload is None:
+                        return
+                    order_id = payload["orderId"]
+                    duration_seconds = int(payload["seconds"])
                 if led_service.set_color_exclusive(color):
                     led_state = f'{color}_on'
-                    print(f"[LED] ✅ {color.upper()} SOLID ON")
-                    update_kiosk_state(
-                        status='RUNNING',
-                        qr_url=DETAIL_URL,
-                        message='Service Active',
-                        duration_seconds=data.get("duration_seconds") or data.get("duration"),
-                        started_at=data.get("started_at") or int(time.time() * 1000)
-                    )
+                    logger.debug("%s solid on", color)
+                    if duration_seconds:
+                        # The Pi owns the countdown and turns the LED off when it runs out
+                        cls._show_session(session_manager.start(order_id, color, int(duration_seconds)))
+                    else:
+                        # No duration: runs until OFF or disconnect, as before
+                        session_manager.end()
+                        update_kiosk_state(
+                            status='RUNNING',
+                            qr_url=DETAIL_URL,
+                            message='Service Active',
+                            started_at=data.get("started_at") or int(time.time() * 1000)
+                        )
+                    record_event("STARTED", f"LED {led_state}, duration {duration_seconds}s", order_id)
                 else:
-                    print(f"[LED] ❌ Unknown color: {color}")
+                    logger.warning("Unknown color: %s", color)
 
             elif command == "BLINK":
-                # Blink mode - payment processing (non-blocking)
+                # Blink mode - payment processing (non-blocking), "times": null blinks until the next command
                 times = data.get("times", 5)
                 interval = data.get("interval", 0.5)
                 if led_service.blink(color, times=times, interval=interval):
                     led_state = f'{color}_blinking'
-                    print(f"[LED] ✅ {color.upper()} BLINKING ({times}x)")
+                    logger.debug("%s blinking (%sx)", color, times)
                     update_kiosk_state(status='SCANNED', qr_url=DETAIL_URL, message='Processing...')
+                    record_event("INFO", f"BLINK: LED {led_state}", order_id)
                 else:
-                    print(f"[LED] ❌ Unknown color: {color}")
+                    logger.warning("Unknown color: %s", color)
 
             elif command == "OFF":
-                # Turn off all LEDs and set back to RED (idle state)
-                led_service.turn_off_all()
-                time.sleep(0.1)  # Brief pause before setting RED
-                led_service.set_color_exclusive("red")
-                led_state = 'red_idle'
-                print(f"[LED] ✅ Service ended → RED (idle)")
-
-                # Restore QR code for next user
-                if DETAIL_URL:
-                    publish_qr_code(DETAIL_URL)
-                    print("[Status] QR code restored for next user")
+                session = session_manager.end()
+                cls._end_session("OFF", session.order_id if session else order_id)
+
+            elif command == "EXTEND":
+                # Add time to the running session; a signed authorization's `seconds` is the extension
+                seconds = data.get("seconds")
+                authorization = data.get("authorization")
+                if session is not None and (authorization is not None or AUTH_REQUIRED):
+                    # Only with a session to extend, so a stray EXTEND does not spend the nonce
+                    payload = cls._verify_authorization(command, authorization)
+                    if payload is None:
+                        return
+                    seconds = int(payload["seconds"])
+                if session is None or not seconds or int(seconds) <= 0:
+                    logger.warning("EXTEND ignored", extra={"session": bool(session), "seconds": seconds})
+                    record_event("INFO", "EXTEND rejected: no running session" if session is None
+                                 else f"EXTEND rejected: invalid seconds {seconds}", order_id)
+                else:
+                    session = session_manager.extend(int(seconds))
+                    cls._show_session(session)
+                    record_event("INFO", f"EXTEND +{int(seconds)}s, duration {session.duration}s", session.order_id)
+
+            elif command == "STATUS":
+                # A reconnecting phone asks what is running; answered on the notify characteristic
+                session = session_manager.current()
+                status = {"led_state": led_state, "session": None}
+                if session is not None:
+                    status["session"] = {
+                        "order_id": session.order_id,
+                        "duration_seconds": session.duration,
+                        "started_at": session.started_at,
+                        "remaining_seconds": round(session_manager.remaining(session)),
+                    }
+                value = json.dumps(status).encode("utf-8")
+
+            elif command == "PATTERN":
+                # Declarative pattern (blink forever, breathe, sequences), see led_patterns.from_spec
+                spec = data.get("pattern") or {}
+                if not isinstance(spec, dict):
+                    logger.warning("PATTERN ignored: pattern is not an object", extra={"pattern": spec})
+                    record_event("INFO", f"PATTERN rejected: pattern must be an object, not {type(spec).__name__}",
+                                 order_id)
+                elif spec.get("stop"):
+                    led_service.stop_pattern(spec.get("priority"))
+                elif led_service.play_pattern(spec):
+                    led_state = f'pattern_{str(spec.get("type", "")).lower()}'
+                    logger.debug("Pattern %s playing", spec.get("type"))
+                    record_event("INFO", f"PATTERN: LED {led_state}", order_id)
+                else:
+                    record_event("INFO", f"PATTERN rejected: invalid {spec.get('type')} pattern", order_id)
 
             elif command == "CONNECT":
-                print("[BLE] ✅ CONNECT command received")
+                logger.debug("CONNECT command received")
                 update_kiosk_state(status='CONNECTED', qr_url=DETAIL_URL, message='Device Connected')
+                record_event("INFO", "CONNECT", order_id)
 
             elif command == "RESET":
                 # Fresh start - stop everything, set red on, restore QR
-                print("[BLE] 🔄 RESET command - fresh start")
+                logger.info("RESET command - fresh start")
+                session_manager.end()
                 led_service.stop_blink()
                 led_service.turn_off_all()
                 led_service.set_color_exclusive("red")
                 led_state = 'red_on'
                 if DETAIL_URL:
                     publish_qr_code(DETAIL_URL)
-                print("[BLE] ✅ Reset complete - red on, QR restored")
+                logger.debug("Reset complete - red on, QR restored")
+                record_event("INFO", f"RESET: LED {led_state}", order_id)
             else:
-                print(f"[BLE] ❓ Unknown command: {command}")
+                logger.warning("Unknown command: %s", command)
 
-            # Update BLE characteristic value
-            if cls.tx_obj:
-                cls.tx_obj.set_value(value)
+            # Update BLE characteristic value (D-Bus signals belong on the mainloop)
+            cls.update_tx(value)
 
         except (json.JSONDecodeError, ValueError) as e:
-            print(f"[BLE] ❌ Error parsing command: {e}")
+            logger.error("Error parsing command: %s", e)
 
     @classmethod
     def on_notify(cls, notifying, characteristic):
@@ -263,30 +477,68 @@ class LEDController:
 
     @classmethod
     def update_tx(cls, value):
-        if cls.tx_obj:
-            cls.tx_obj.set_value(value)
+        tx_obj = cls.tx_obj
+        if not tx_obj:
+            return
 
+        def set_value():
+            tx_obj.set_value(value)
+            return False  # run once
 
-def generate_deep_link(adapter_address, service_uuid, char_uuid, ble_key, device_id=None):
-    """Generate cloud API URL for QR code"""
+        from gi.repository import GLib
+        GLib.idle_add(set_value)
+
+
+def generate_deep_link(adapter_address, service_uuid, char_uuid, ble_key, device_id=None, publish=True):
+    """Generate cloud API URL for QR code (published again only when it changed)"""
     global WEB_MESSAGE, DETAIL_URL
 
     detail_url = f"{API_BASE_URL}/detail?machineId={device_id or MACHINE_ID}&mac={adapter_address}&service={service_uuid}&char={char_uuid}&key={ble_key}"
+    if detail_url == DETAIL_URL:
+        return
 
     WEB_MESSAGE = detail_url
     DETAIL_URL = detail_url
-    print(f"\n[QR] ✅ Generated Detail URL:")
-    print(f"     {detail_url}")
-    publish_qr_code(detail_url)
+    logger.info("Generated detail URL: %s", detail_url)
+    if publish:
+        publish_qr_code(detail_url)
+
+
+def load_cached_adapter():
+    try:
+        with open(ADAPTER_CACHE_FILE) as f:
+            return json.load(f).get('address')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def save_cached_adapter(address):
+    """Remember the adapter address for the next start (written only when it changes)"""
+    if address == load_cached_adapter():
+        return
+    try:
+        os.makedirs(os.path.dirname(ADAPTER_CACHE_FILE), exist_ok=True)
+        temp_file = ADAPTER_CACHE_FILE + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump({'address': address}, f)
+        os.replace(temp_file, ADAPTER_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Could not cache adapter address: %s", e)
+
+
+def discover_adapter_address():
+    from bluezero import adapter
+    return list(adapter.Adapter.available())[0].address
 
 
 def setup_peripheral(adapter_address, just_char=True):
     """Setup the BLE peripheral"""
-    print(f"[BLE] Setting up peripheral with adapter: {adapter_address}")
+    logger.info("Setting up peripheral with adapter %s", adapter_address)
     global led_peripheral
     
     if not just_char:
-        print("[BLE] Initializing adapter...")
+        from bluezero import peripheral
+        logger.debug("Initializing adapter")
         led_peripheral = peripheral.Peripheral(adapter_address, local_name='Remote LED')
         led_peripheral.add_service(srv_id=1, uuid=SERVICE_UUID, primary=True)
     
@@ -311,62 +563,133 @@ def setup_peripheral(adapter_address, just_char=True):
 
 def run_ble_peripheral(current_peripheral):
     """Run the BLE mainloop in a separate thread"""
+    from gi.repository import GLib
+    # Runs once the mainloop is up, i.e. after the GATT application and advertisement are registered
+    GLib.idle_add(report_startup)
     try:
         current_peripheral.publish()
     except Exception as e:
-        print(f"[BLE] ❌ Error in peripheral: {e}")
+        logger.exception("Error in peripheral: %s", e)
 
 
-def main(adapter_address, device_id=None):
-    global current_peripheral
+def report_startup():
+    startup_timer.mark("advertising")
+    kiosk_writer.publish(STARTUP_REPORT_FILE, startup_timer.report())
+    return False  # run once
 
-    print("\n" + "=" * 60)
-    print("RemoteLED BLE Peripheral Starting")
-    print("=" * 60)
 
-    # Step 1: Clear stale QR data immediately
-    print("\n[1/5] Clearing stale QR data...")
-    publish_qr_code("Initializing...")
+def init_startup_led(color):
+    """LED service and the initial colour; runs alongside the BLE adapter setup"""
+    try:
+        init_led_service()
+        led_service.set_color_exclusive(color)
+        logger.info("Initial LED state: %s", color)
+    except Exception:
+        logger.exception("LED service failed to start")
+    startup_timer.mark("led")
+
+
+def finish_startup(device_id, resumed, ended):
+    """Services not needed for a scannable QR; runs on the command worker ahead of any BLE command"""
+    start_telemetry(device_id)
+    start_auth_verifier(device_id)
+    LEDController.resume_session(resumed, ended)
+    session_manager.start_thread()
+    startup_timer.mark("services")
+
+
+def start_telemetry(device_id):
+    """Open the local event journal and start uploading it"""
+    global telemetry_journal, telemetry_uploader
+    from telemetry_journal import TelemetryJournal, TelemetryUploader
+    try:
+        telemetry_journal = TelemetryJournal()
+    except Exception as e:
+        logger.warning("Telemetry journal disabled: %s", e)
+        return
+    telemetry_uploader = TelemetryUploader(telemetry_journal, API_BASE_URL, device_id or DEVICE_ID)
+    telemetry_uploader.start()
+
+
+def start_auth_verifier(device_id):
+    """Load the cached backend public key and keep it fresh in the background"""
+    global auth_verifier
+    try:
+        from auth_verifier import AuthorizationVerifier
+        auth_verifier = AuthorizationVerifier(device_id or DEVICE_ID, API_BASE_URL)
+    except Exception as e:
+        logger.warning("Authorization verifier disabled: %s", e)
+        return
+    auth_verifier.start_refresh()
+    if AUTH_REQUIRED and not auth_verifier.ready:
+        logger.warning("AUTH_REQUIRED is set but no public key is cached yet; ON is refused until one is fetched")
 
-    # Step 2: Initialize LED service (with error handling)
-    print("\n[2/5] Initializing LED service...")
-    init_led_service()
-    
-    # Set initial LED state: RED (idle/ready)
-    if led_service:
-        led_service.set_color_exclusive("red")
-        print("[LED] 🔴 Initial state: RED (ready/idle)")
 
-    # Step 3: Get device ID
-    print("\n[3/5] Loading configuration...")
+def stop_telemetry():
+    if telemetry_uploader:
+        telemetry_uploader.stop()
+    if telemetry_journal is not None:
+        telemetry_journal.close()
+
+
+def main(adapter_address=None, device_id=None):
+    global current_peripheral, kiosk_server
+
+    startup_timer.mark("main")
+    logger.info("RemoteLED BLE peripheral starting")
     if device_id is None:
         device_id = os.getenv("DEVICE_ID")
-    
-    print(f"[BLE Config] Service UUID: {SERVICE_UUID}")
-    print(f"[BLE Config] Char UUID: {CHAR_UUID}")
-    print(f"[BLE Config] BLE Key: {BLE_KEY}")
-    print(f"[Machine Config] Machine ID: {MACHINE_ID}")
-    print(f"[Machine Config] Device ID: {device_id}")
-    print(f"[Machine Config] API Base URL: {API_BASE_URL}")
-
-    # Step 4: Setup BLE peripheral
-    print("\n[4/5] Setting up BLE peripheral...")
+    logger.debug("Configuration", extra={
+        "service_uuid": SERVICE_UUID,
+        "char_uuid": CHAR_UUID,
+        "machine_id": MACHINE_ID,
+        "device_id": device_id,
+        "api_base_url": API_BASE_URL
+    })
+
+    # Push kiosk state changes over SSE (kiosk falls back to polling state.json)
+    kiosk_server = KioskStateServer(kiosk_channel)
+    kiosk_server.start()
+    kiosk_writer.start()
+    command_worker.start()
+    for path in (STATE_FILE, QR_DATA_FILE):
+        link_legacy_path(os.path.join(LEGACY_WEB_DIR, os.path.basename(path)), path)
+
+    # A session that was running before a restart keeps its deadline, LED and countdown screen
+    resumed, ended = session_manager.restore()
+    show_qr = resumed is None
+
+    # The QR only depends on the configuration and the adapter address, so publish it
+    # from the last known address before touching GPIO or D-Bus
+    cached_address = adapter_address or load_cached_adapter()
+    if cached_address:
+        generate_deep_link(cached_address, SHORT_SERVICE_UUID, SHORT_CHAR_UUID, BLE_KEY, device_id, publish=show_qr)
+        startup_timer.mark("qr")
+
+    # LED init (GPIO) and BLE adapter setup (D-Bus) do not depend on each other
+    led_thread = threading.Thread(target=init_startup_led, args=(resumed.color if resumed else "red",),
+                                  name="led-init", daemon=True)
+    led_thread.start()
+
+    if adapter_address is None:
+        adapter_address = discover_adapter_address()
     current_peripheral = setup_peripheral(adapter_address, False)
+    startup_timer.mark("peripheral")
+
+    # No-op unless the adapter changed since the cached QR was published
+    generate_deep_link(adapter_address, SHORT_SERVICE_UUID, SHORT_CHAR_UUID, BLE_KEY, device_id, publish=show_qr)
+    if not cached_address:
+        startup_timer.mark("qr")
+    save_cached_adapter(adapter_address)
+    led_thread.join()
 
-    # Step 5: Generate QR code URL BEFORE starting BLE
-    print("\n[5/5] Generating QR code...")
-    generate_deep_link(adapter_address, SHORT_SERVICE_UUID, SHORT_CHAR_UUID, BLE_KEY, device_id)
+    # Journal, key cache and session timer come up on the worker, before any command it runs
+    command_worker.submit(finish_startup, device_id, resumed, ended, label="startup")
 
     # Start BLE in background thread
-    print("\n" + "=" * 60)
-    print("[BLE] Starting BLE peripheral...")
     ble_thread = threading.Thread(target=run_ble_peripheral, args=(current_peripheral,))
     ble_thread.start()
-    print(f"[BLE] ✅ Peripheral published")
-    print(f"[BLE] Service UUID: {SERVICE_UUID}")
-    print("=" * 60)
-    print("\n🟢 Ready! Waiting for connections...")
-    print("   Press Ctrl+C to stop\n")
+    logger.info("Ready, waiting for connections (Ctrl+C to stop)")
 
     # Keep running until interrupted
     try:
@@ -374,10 +697,16 @@ def main(adapter_address, device_id=None):
             time.sleep(0.1)
         current_peripheral.mainloop.quit()
     except KeyboardInterrupt:
-        print("\n[BLE] Shutting down...")
+        logger.info("Shutting down")
         if led_service:
             led_service.turn_off_all()
+    finally:
+        session_manager.stop()
+        command_worker.stop()
+        stop_telemetry()
+        kiosk_server.stop()
+        kiosk_writer.stop()
 
 
 if __name__ == '__main__':
-    main(list(adapter.Adapter.available())[0].address)
+    main()
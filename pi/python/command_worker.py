@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Command Worker - Ordered background execution for BLE callbacks
+bluezero runs GATT callbacks on the GLib mainloop; anything slow there (GPIO,
+sleeps, file I/O) delays every other read/write from the phone. Callbacks
+submit work here and return immediately; one thread runs it in arrival order.
+"""
+import queue
+import threading
+import time
+from logger import get_logger
+
+logger = get_logger("command_worker")
+
+
+class CommandWorker:
+    """
+    Single-threaded FIFO executor with latency accounting.
+
+    Usage:
+        worker = CommandWorker()
+        worker.start()
+
+        def on_write(value, options):          # D-Bus callback
+            started = time.perf_counter()
+            worker.submit(handle_write, bytes(value), label="write")
+            worker.record_callback(started)
+
+        worker.stop()                          # drains queued commands first
+    """
+
+    def __init__(self, name="ble-commands", max_queue=64):
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "callbacks": 0,
+            "callback_ms_total": 0.0,
+            "callback_ms_max": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "handle_ms_max": 0.0,
+        }
+
+    def start(self):
+        """Start the worker thread (no-op if running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Run everything already queued, then stop the thread"""
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, func, *args, label=None):
+        """
+        Queue func(*args) behind earlier commands.
+
+        Never blocks: if the queue is full (worker stuck) the command is dropped
+        and logged rather than stalling the mainloop.
+        """
+        try:
+            self._queue.put_nowait((label or func.__name__, func, args, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            logger.warning("Command queue full, dropping %s", label or func.__name__)
+            return False
+        with self._lock:
+            self._stats["submitted"] += 1
+        return True
+
+    def record_callback(self, started):
+        """Record how long a D-Bus callback took, given its perf_counter() start"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["callbacks"] += 1
+            self._stats["callback_ms_total"] += elapsed_ms
+            self._stats["callback_ms_max"] = max(self._stats["callback_ms_max"], elapsed_ms)
+
+    def stats(self):
+        """Snapshot of counters and latencies (milliseconds)"""
+        with self._lock:
+            stats = dict(self._stats)
+        callbacks = stats.pop("callbacks")
+        total = stats.pop("callback_ms_total")
+        stats["callback_ms_avg"] = total / callbacks if callbacks else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            label, func, args, enqueued = item
+            started = time.perf_counter()
+            try:
+                func(*args)
+                outcome = "completed"
+            except Exception:
+                outcome = "failed"
+                logger.exception("Command %s failed", label)
+            finished = time.perf_counter()
+
+            wait_ms = (started - enqueued) * 1000
+            handle_ms = (finished - started) * 1000
+            with self._lock:
+                self._stats[outcome] += 1
+                self._stats["queue_wait_ms_max"] = max(self._stats["queue_wait_ms_max"], wait_ms)
+                self._stats["handle_ms_max"] = max(self._stats["handle_ms_max"], handle_ms)
+            logger.debug("Command %s %s", label, outcome, extra={
+                "queue_wait_ms": round(wait_ms, 2),
+                "handle_ms": round(handle_ms, 2),
+            })
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+GPIO Backend - Pin output drivers for the LED service
+Levels are floats from 0.0 (off) to 1.0 (fully on). Fractional levels use PWM
+when the backend supports it and are rounded to on/off otherwise.
+
+Configuration (env):
+    LED_GPIO_BACKEND    auto (default), rpi or sim (simulated pins with a timing trace)
+"""
+import os
+import time
+from collections import deque
+from logger import get_logger
+
+logger = get_logger("gpio_backend")
+
+try:
+    import RPi.GPIO as GPIO
+    GPIO_AVAILABLE = True
+except ImportError:
+    GPIO = None
+    GPIO_AVAILABLE = False
+
+
+class GPIOBackend:
+    """Interface the LED service and pattern engine drive pins through"""
+
+    name = "base"
+    supports_pwm = False
+
+    def setup(self, pins):
+        """Configure `pins` (BCM numbers) as outputs, initially off"""
+        raise NotImplementedError
+
+    def write(self, pin, level):
+        """Drive `pin` to `level` (0.0 - 1.0)"""
+        raise NotImplementedError
+
+    def cleanup(self):
+        """Release the pins"""
+
+
+class RPiGPIOBackend(GPIOBackend):
+    """
+    RPi.GPIO outputs.
+
+    Pins are plain digital outputs until they first get a fractional level;
+    from then on they are driven by RPi.GPIO PWM at `pwm_frequency` Hz.
+    """
+
+    name = "rpi"
+
+    def __init__(self, pwm_frequency=200, use_pwm=True):
+        if not GPIO_AVAILABLE:
+            raise RuntimeError("RPi.GPIO not available")
+        self.pwm_frequency = pwm_frequency
+        self.supports_pwm = use_pwm
+        self._pwm = {}
+
+    def setup(self, pins):
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        for pin in pins:
+            GPIO.setup(pin, GPIO.OUT)
+            GPIO.output(pin, GPIO.LOW)
+
+    def write(self, pin, level):
+        pwm = self._pwm.get(pin)
+        if pwm is None and self.supports_pwm and 0.0 < level < 1.0:
+            pwm = GPIO.PWM(pin, self.pwm_frequency)
+            pwm.start(0)
+            self._pwm[pin] = pwm
+        if pwm is not None:
+            pwm.ChangeDutyCycle(level * 100)
+        else:
+            GPIO.output(pin, GPIO.HIGH if level >= 0.5 else GPIO.LOW)
+
+    def cleanup(self):
+        for pwm in self._pwm.values():
+            pwm.stop()
+        self._pwm.clear()
+        GPIO.cleanup()
+
+
+class SimGPIOBackend(GPIOBackend):
+    """
+    Simulated pins that record every transition, for tests and benchmarks.
+
+    `trace` holds (monotonic_time, pin, level) tuples for each change of level,
+    oldest first, capped at `max_trace` entries. Writes that do not change the
+    level are counted in `writes` but not traced.
+    """
+
+    name = "sim"
+    supports_pwm = True
+
+    def __init__(self, max_trace=10000, clock=time.monotonic):
+        self.clock = clock
+        self.levels = {}
+        self.writes = 0
+        self.trace = deque(maxlen=max_trace)
+
+    def setup(self, pins):
+        for pin in pins:
+            self.levels[pin] = 0.0
+
+    def write(self, pin, level):
+        self.writes += 1
+        if self.levels.get(pin) == level:
+            return
+        self.levels[pin] = level
+        self.trace.append((self.clock(), pin, level))
+
+    def edges(self, pin, level, since=None):
+        """Times at which `pin` changed to `level` (optionally at or after `since`)"""
+        return [
+            t for t, p, value in list(self.trace)
+            if p == pin and value == level and (since is None or t >= since)
+        ]
+
+    def clear_trace(self):
+        self.trace.clear()
+
+
+BACKENDS = {
+    "rpi": RPiGPIOBackend,
+    "sim": SimGPIOBackend,
+}
+
+
+def create_backend(name=None):
+    """
+    Build the backend named by `name` or LED_GPIO_BACKEND.
+
+    "auto" (default) uses RPi.GPIO when it can be imported and the simulator
+    otherwise; "rpi" and "sim" force one.
+    """
+    name = (name or os.getenv('LED_GPIO_BACKEND', 'auto')).lower()
+    if name == "auto":
+        name = "rpi" if GPIO_AVAILABLE else "sim"
+    if name not in BACKENDS:
+        raise ValueError("Unknown LED_GPIO_BACKEND %r (expected auto, %s)" % (name, ", ".join(BACKENDS)))
+    return BACKENDS[name]()
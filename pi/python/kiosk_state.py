@@ -0,0 +1,304 @@
+"""
+Kiosk state channel for the React kiosk
+
+Keeps the latest kiosk state in memory and pushes it to the kiosk over
+Server-Sent Events, so QR -> CONNECTED -> RUNNING transitions reach the screen
+as soon as they happen instead of on the next 1 s poll of state.json.
+
+    GET /events      text/event-stream; current state, then one event per change
+    GET /state.json  current state (polling fallback)
+
+The state files themselves (state.json, legacy qr_data.json) are written by
+KioskStatePublisher on a background thread: callers only enqueue, bursts are
+coalesced, unchanged content is never rewritten, and files live on tmpfs.
+
+Configuration (env):
+    KIOSK_EVENTS_HOST       bind address (default 127.0.0.1, the kiosk browser runs on the Pi)
+    KIOSK_EVENTS_PORT       port (default 8765)
+    KIOSK_STATE_DIR         directory for the state files (default /dev/shm/remoteled, tmpfs)
+    KIOSK_STATE_DEBOUNCE_MS how long to collect updates before writing (default 50)
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from logger import get_logger
+
+logger = get_logger("kiosk_state")
+
+HEARTBEAT_SECONDS = 15.0
+
+
+class KioskStateChannel:
+    """Latest kiosk state plus a condition variable subscribers wait on"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._encoded = None
+        self._comparable = None
+        self._version = 0
+        self._closed = False
+
+    def publish(self, state):
+        """Replace the current state and wake every subscriber (a new "timestamp" alone is not a change)"""
+        comparable = json.dumps({k: v for k, v in state.items() if k != 'timestamp'}, sort_keys=True)
+        with self._condition:
+            if comparable == self._comparable:
+                return
+            self._comparable = comparable
+            self._encoded = json.dumps(state, separators=(',', ':'))
+            self._version += 1
+            self._condition.notify_all()
+
+    def current(self):
+        """Return (version, encoded JSON or None)"""
+        with self._condition:
+            return self._version, self._encoded
+
+    def wait_for_change(self, version, timeout):
+        """
+        Block until the state is newer than `version`.
+
+        Returns (version, encoded) for the latest state (intermediate states are
+        skipped), or None on timeout or when the channel is closed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._version != version or self._closed, timeout)
+            if self._closed or self._version == version:
+                return None
+            return self._version, self._encoded
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class _KioskStateHandler(BaseHTTPRequestHandler):
+    server_version = "RemoteLEDKiosk/1.0"
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/events':
+            self._stream_events()
+        elif path == '/state.json':
+            self._send_state()
+        else:
+            self.send_error(404)
+
+    def _send_common_headers(self, content_type):
+        self.send_header('Content-Type', content_type)
+        self.send_header('Cache-Control', 'no-cache')
+        # The kiosk is served from another port (http.server on :3000)
+        self.send_header('Access-Control-Allow-Origin', '*')
+
+    def _send_state(self):
+        _, encoded = self.server.channel.current()
+        body = (encoded or '{}').encode('utf-8')
+        self.send_response(200)
+        self._send_common_headers('application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self):
+        channel = self.server.channel
+        self.send_response(200)
+        self._send_common_headers('text/event-stream')
+        self.send_header('Connection', 'keep-alive')
+        self.end_headers()
+        logger.debug("Kiosk subscribed", extra={"client": self.client_address[0]})
+
+        try:
+            # Reconnect quickly if code.py restarts
+            self.wfile.write(b'retry: 1000\n\n')
+            version, encoded = channel.current()
+            if encoded is not None:
+                self.wfile.write(f'data: {encoded}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+
+            while not channel.closed:
+                change = channel.wait_for_change(version, HEARTBEAT_SECONDS)
+                if change is None:
+                    # Comment line keeps idle connections (and proxies) alive
+                    self.wfile.write(b': ping\n\n')
+                else:
+                    version, encoded = change
+                    self.wfile.write(f'data: {encoded}\n\n'.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Kiosk unsubscribed", extra={"client": self.client_address[0]})
+
+    def log_message(self, format, *args):
+        logger.debug("Kiosk HTTP: " + format, *args)
+
+
+class KioskStateServer:
+    """Serves a KioskStateChannel over HTTP on a daemon thread"""
+
+    def __init__(self, channel, host=None, port=None):
+        self.channel = channel
+        self.host = host or os.getenv('KIOSK_EVENTS_HOST', '127.0.0.1')
+        self.port = int(port if port is not None else os.getenv('KIOSK_EVENTS_PORT', '8765'))
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Bind and serve in the background; returns False if the port is unavailable"""
+        if self._thread and self._thread.is_alive():
+            return True
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _KioskStateHandler)
+        except OSError as e:
+            logger.warning("Kiosk state server disabled, kiosk will poll state.json: %s", e)
+            return False
+        self._server.daemon_threads = True
+        self._server.channel = self.channel
+        self._thread = threading.Thread(target=self._server.serve_forever, name="kiosk-state-server", daemon=True)
+        self._thread.start()
+        logger.info("Kiosk state events on http://%s:%s/events", self.host, self.port)
+        return True
+
+    def stop(self):
+        self.channel.close()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._thread = None
+
+
+class KioskStatePublisher:
+    """
+    Writes the latest JSON document per file from a background thread.
+
+    publish() only stores the document and returns. The writer waits
+    `debounce_seconds` after the first pending update so a burst (BLINK -> ON,
+    or the two files written by publish_qr_code) becomes one write per file.
+    Documents that differ from the last written one only in "timestamp" are
+    skipped.
+    """
+
+    def __init__(self, debounce_seconds=None):
+        if debounce_seconds is None:
+            debounce_seconds = int(os.getenv('KIOSK_STATE_DEBOUNCE_MS', '50')) / 1000
+        self.debounce_seconds = debounce_seconds
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._written = {}
+        self._known_dirs = set()
+        self._busy = False
+        self._stopping = False
+        self._thread = None
+        self.stats = {'published': 0, 'coalesced': 0, 'written': 0, 'unchanged': 0, 'errors': 0}
+
+    def publish(self, path, data):
+        """Queue `data` as the next content of `path` (latest wins)"""
+        with self._condition:
+            self.stats['published'] += 1
+            if path in self._pending:
+                self.stats['coalesced'] += 1
+            self._pending[path] = data
+            self._condition.notify()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="kiosk-state-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Write whatever is pending, then stop the writer thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def flush(self, timeout=2.0):
+        """Block until every queued document has been written (or skipped)"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if self._stopping and not self._pending:
+                    return
+                stopping = self._stopping
+            if not stopping and self.debounce_seconds > 0:
+                time.sleep(self.debounce_seconds)
+            with self._condition:
+                batch, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                for path, data in batch.items():
+                    self._write(path, data)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write(self, path, data):
+        comparable = json.dumps({k: v for k, v in data.items() if k != 'timestamp'}, sort_keys=True)
+        if self._written.get(path) == comparable:
+            self.stats['unchanged'] += 1
+            return
+        try:
+            target_dir = os.path.dirname(path)
+            if target_dir and target_dir not in self._known_dirs:
+                os.makedirs(target_dir, exist_ok=True)
+                self._known_dirs.add(target_dir)
+
+            temp_file = path + '.tmp'
+            with open(temp_file, 'w') as f:
+                os.fchmod(f.fileno(), 0o666)
+                json.dump(data, f)
+            os.replace(temp_file, path)
+            self._written[path] = comparable
+            self.stats['written'] += 1
+        except PermissionError as e:
+            self.stats['errors'] += 1
+            logger.error("Permission denied writing %s: %s", path, e)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error("Error writing %s: %s", path, e)
+
+
+def link_legacy_path(legacy_path, target):
+    """Point an old fixed location (e.g. /var/www/html/state.json) at the tmpfs file"""
+    if not legacy_path or os.path.abspath(legacy_path) == os.path.abspath(target):
+        return
+    try:
+        if os.path.islink(legacy_path) and os.readlink(legacy_path) == target:
+            return
+        temp_link = legacy_path + '.link'
+        if os.path.lexists(temp_link):
+            os.remove(temp_link)
+        os.symlink(target, temp_link)
+        os.replace(temp_link, legacy_path)
+        logger.info("Linked %s -> %s", legacy_path, target)
+    except OSError as e:
+        logger.warning("Could not link %s -> %s: %s", legacy_path, target, e)
+
+
+# Shared channel: code.py publishes, the server streams
+kiosk_channel = KioskStateChannel()
+
+# Shared state file writer
+kiosk_writer = KioskStatePublisher()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+LED Patterns - Declarative LED patterns and the engine that plays them
+A pattern is a list of frames (LED levels held for a duration) repeated a
+number of times or forever. Patterns run on the shared LEDScheduler; each one
+has a priority, and a higher priority pattern preempts (suspends) a lower one
+until it finishes or is stopped.
+
+Usage:
+    engine = PatternEngine(scheduler, backend, {"green": 17, "red": 27})
+    engine.play(blink("green", times=None))            # blink forever
+    engine.play(breathe("red", period=2.0), priority=1) # preempts the blink
+    engine.stop(priority=1)                             # blink resumes
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from logger import get_logger
+
+logger = get_logger("led_patterns")
+
+
+@dataclass(frozen=True)
+class Frame:
+    """Levels (0.0 - 1.0) per color, held for `duration` seconds (None = until preempted)"""
+    levels: Dict[str, float]
+    duration: Optional[float]
+
+
+@dataclass
+class Pattern:
+    """
+    Frames played in order, `repeat` times (None = forever).
+
+    The pattern controls the colors in `colors` (default: every color named in
+    a frame); controlled colors missing from a frame are off, and they are
+    switched off when the pattern ends. Other LEDs are left alone.
+    """
+    name: str
+    frames: List[Frame]
+    repeat: Optional[int] = 1
+    priority: int = 0
+    colors: frozenset = field(default=None)
+
+    def __post_init__(self):
+        if not self.frames:
+            raise ValueError("Pattern %r has no frames" % self.name)
+        for frame in self.frames[:-1]:
+            if frame.duration is None:
+                raise ValueError("Only the last frame of %r can hold" % self.name)
+        if self.repeat is not None and (
+                isinstance(self.repeat, bool) or not isinstance(self.repeat, int) or self.repeat < 1):
+            raise ValueError("Pattern %r repeat must be an integer of at least 1" % self.name)
+        named = set()
+        for frame in self.frames:
+            named.update(frame.levels)
+        self.colors = frozenset(named) | frozenset(self.colors or ())
+
+
+def solid(color, level=1.0, controls=(), priority=0):
+    """Hold one LED at `level`; colors in `controls` are held off"""
+    return Pattern("solid-%s" % color, [Frame({color: level}, None)], priority=priority, colors=frozenset(controls))
+
+
+def blink(color, times=None, interval=0.3, duty=0.5, priority=0):
+    """
+    Square wave with period 2 * interval, on for `duty` of each period.
+    `times=None` blinks until preempted or stopped.
+    """
+    if interval <= 0 or not 0 < duty <= 1:
+        raise ValueError("blink needs interval > 0 and 0 < duty <= 1")
+    period = interval * 2
+    frames = [Frame({color: 1.0}, period * duty)]
+    if duty < 1:
+        frames.append(Frame({color: 0.0}, period * (1 - duty)))
+    return Pattern("blink-%s" % color, frames, repeat=times, priority=priority)
+
+
+def breathe(color, period=2.0, steps=32, repeat=None, low=0.0, high=1.0, priority=0):
+    """Raised-cosine fade low -> high -> low over `period` seconds (needs PWM for the in-between levels)"""
+    if period <= 0 or steps < 2:
+        raise ValueError("breathe needs period > 0 and at least 2 steps")
+    frames = []
+    for i in range(steps):
+        level = low + (high - low) * (1 - math.cos(2 * math.pi * i / steps)) / 2
+        frames.append(Frame({color: round(level, 4)}, period / steps))
+    return Pattern("breathe-%s" % color, frames, repeat=repeat, priority=priority)
+
+
+def sequence(steps, repeat=1, name="sequence", priority=0):
+    """
+    Play (target, duration) steps in order. `target` is a color name (that LED
+    on, the others used by the sequence off), a {color: level} dict, or None
+    for all off.
+    """
+    frames = []
+    for target, duration in steps:
+        if target is None:
+            levels = {}
+        elif isinstance(target, str):
+            levels = {target: 1.0}
+        else:
+            levels = dict(target)
+        frames.append(Frame(levels, duration))
+    return Pattern(name, frames, repeat=repeat, priority=priority)
+
+
+def _count(spec, key, default=None):
+    """Optional repeat count from a spec: None means forever, otherwise an int >= 1"""
+    value = spec.get(key, default)
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 1 and float(value).is_integer():
+        return int(value)
+    raise ValueError("%s must be a whole number >= 1 or null, got %r" % (key, value))
+
+
+def from_spec(spec):
+    """
+    Build a pattern from a JSON-style dict, e.g. from a BLE command:
+
+        {"type": "blink", "color": "yellow", "times": null, "interval": 0.5, "duty": 0.5}
+        {"type": "breathe", "color": "green", "period": 2.0}
+        {"type": "sequence", "steps": [{"color": "red", "duration": 0.2}, ...], "repeat": null}
+        {"type": "solid", "color": "green", "level": 0.3}
+
+    Every type also takes an integer "priority". "times" and "repeat" are
+    whole numbers >= 1, or null for forever. Raises ValueError for invalid specs.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Pattern spec must be an object")
+    kind = str(spec.get("type", "")).lower()
+    priority = spec.get("priority", 0)
+    if isinstance(priority, bool) or not isinstance(priority, int):
+        raise ValueError("priority must be an integer, got %r" % (priority,))
+    try:
+        if kind == "solid":
+            return solid(spec["color"], level=float(spec.get("level", 1.0)), priority=priority)
+        if kind == "blink":
+            return blink(
+                spec["color"],
+                times=_count(spec, "times"),
+                interval=float(spec.get("interval", 0.3)),
+                duty=float(spec.get("duty", 0.5)),
+                priority=priority,
+            )
+        if kind == "breathe":
+            return breathe(
+                spec["color"],
+                period=float(spec.get("period", 2.0)),
+                steps=int(spec.get("steps", 32)),
+                repeat=_count(spec, "repeat"),
+                low=float(spec.get("low", 0.0)),
+                high=float(spec.get("high", 1.0)),
+                priority=priority,
+            )
+        if kind == "sequence":
+            steps = [
+                (step.get("levels") or step.get("color"), float(step["duration"]))
+                for step in spec["steps"]
+            ]
+            return sequence(steps, repeat=_count(spec, "repeat", 1), name=spec.get("name", "sequence"), priority=priority)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError("Invalid %s pattern: %s" % (kind or "LED", e))
+    raise ValueError("Unknown pattern type %r" % spec.get("type"))
+
+
+class _Run:
+    """A pattern being played at a priority"""
+
+    def __init__(self, pattern, priority):
+        self.pattern = pattern
+        self.priority = priority
+        self.task = None
+        self.frame = 0
+        self.cycle = 0
+
+
+class PatternEngine:
+    """
+    Plays patterns on an LEDScheduler, one priority level at a time.
+
+    play() at the same or a higher priority than the current pattern takes
+    over immediately; a lower priority pattern waits until everything above it
+    has finished or been stopped, then starts from its first frame. Playing at
+    an occupied priority replaces that pattern. All state is guarded by the
+    scheduler lock, so commands take effect before they return.
+    """
+
+    def __init__(self, scheduler, backend, pins):
+        self._scheduler = scheduler
+        self._backend = backend
+        self._pins = dict(pins)
+        self._levels = {color: 0.0 for color in self._pins}
+        self._runs = {}
+        self._current = None
+
+    def play(self, pattern, priority=None):
+        """Start or queue `pattern`; returns True if it is now the one playing"""
+        if priority is None:
+            priority = pattern.priority
+        unknown = pattern.colors - set(self._pins)
+        if unknown:
+            raise ValueError("Unknown LED color(s): %s" % ", ".join(sorted(unknown)))
+
+        with self._scheduler.lock:
+            previous = self._runs.pop(priority, None)
+            if previous is not None:
+                self._scheduler.cancel(previous.task)
+            run = _Run(pattern, priority)
+            self._runs[priority] = run
+
+            current = self._current
+            if current is None or current is previous or priority >= current.priority:
+                self._activate(run)
+                return True
+            logger.debug("Pattern %s queued behind %s", pattern.name, current.pattern.name)
+            return False
+
+    def stop(self, priority=None):
+        """Stop the pattern at `priority` (or every pattern) and switch its LEDs off"""
+        with self._scheduler.lock:
+            if priority is None:
+                stopped = list(self._runs.values())
+                self._runs.clear()
+            else:
+                run = self._runs.pop(priority, None)
+                stopped = [run] if run else []
+            for run in stopped:
+                self._scheduler.cancel(run.task)
+            if self._current in stopped:
+                self._release(self._current)
+                self._current = None
+                self._resume_next()
+
+    def write(self, color, level):
+        """Set one LED directly (outside any pattern)"""
+        with self._scheduler.lock:
+            self._set(color, level)
+
+    def current(self):
+        """(pattern name, priority) of the playing pattern, or None"""
+        run = self._current
+        return (run.pattern.name, run.priority) if run else None
+
+    def is_animating(self):
+        """True while the playing pattern still has transitions pending"""
+        run = self._current
+        return run is not None and run.task is not None and run.task.active
+
+    def wait(self, timeout=None):
+        """Block until the playing pattern finishes, holds or is replaced"""
+        run = self._current
+        if run is not None and run.task is not None:
+            return run.task.done.wait(timeout)
+        return True
+
+    def levels(self):
+        return dict(self._levels)
+
+    def _set(self, color, level):
+        if self._levels.get(color) == level:
+            return
+        self._levels[color] = level
+        self._backend.write(self._pins[color], level)
+
+    def _activate(self, run):
+        old = self._current
+        if old is not None and old is not run:
+            self._scheduler.cancel(old.task)
+            old.task = None
+            for color in old.pattern.colors - run.pattern.colors:
+                self._set(color, 0.0)
+        self._current = run
+        run.frame = 0
+        run.cycle = 0
+        run.task = None
+        next_due = self._apply_frame(run, time.monotonic())
+        if next_due is not None:
+            run.task = self._scheduler.schedule(run.pattern.name, next_due, lambda due: self._advance(run, due))
+
+    def _apply_frame(self, run, due):
+        frame = run.pattern.frames[run.frame]
+        for color in run.pattern.colors:
+            self._set(color, frame.levels.get(color, 0.0))
+        return None if frame.duration is None else due + frame.duration
+
+    def _advance(self, run, due):
+        """Scheduler callback (lock held): move to the next frame"""
+        if run is not self._current:
+            return None
+        run.frame += 1
+        if run.frame >= len(run.pattern.frames):
+            run.cycle += 1
+            if run.pattern.repeat is not None and run.cycle >= run.pattern.repeat:
+                logger.debug("Pattern %s completed (%d cycles)", run.pattern.name, run.cycle)
+                self._runs.pop(run.priority, None)
+                self._release(run)
+                self._current = None
+                self._resume_next()
+                return None
+            run.frame = 0
+        return self._apply_frame(run, due)
+
+    def _release(self, run):
+        for color in run.pattern.colors:
+            self._set(color, 0.0)
+
+    def _resume_next(self):
+        if self._runs:
+            self._activate(self._runs[max(self._runs)])
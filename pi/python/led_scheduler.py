@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+LED Scheduler - Single-threaded timer heap for LED transitions
+One long-lived thread sleeps on Event.wait(timeout) until the next due
+transition, so blink patterns need no thread per command and no polling.
+"""
+import heapq
+import itertools
+import threading
+import time
+from logger import get_logger
+
+logger = get_logger("led_scheduler")
+
+
+class ScheduledTask:
+    """Handle for a (possibly repeating) scheduled callback"""
+
+    def __init__(self, name):
+        self.name = name
+        self.cancelled = False
+        self.done = threading.Event()
+
+    @property
+    def active(self):
+        return not self.done.is_set()
+
+
+class LEDScheduler:
+    """
+    Runs callbacks at absolute monotonic times on one background thread.
+
+    A callback receives the time it was due and returns the next due time to
+    repeat (computed from the previous due time, so periods do not drift) or
+    None to finish. Callbacks run while holding `lock`; code that changes pins
+    directly takes the same lock, and cancel() marks the task under it, so a
+    cancelled task can never touch a pin again.
+
+    Usage:
+        scheduler = LEDScheduler()
+        scheduler.start()
+        task = scheduler.schedule("blink", time.monotonic(), step)
+        scheduler.cancel(task)
+        scheduler.stop()
+    """
+
+    def __init__(self, name="led-scheduler"):
+        self.name = name
+        self.lock = threading.RLock()
+        self._heap = []
+        self._heap_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sequence = itertools.count()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        """Start the scheduler thread (no-op if running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Cancel everything pending and stop the thread"""
+        with self._heap_lock:
+            self._stopping = True
+            pending, self._heap = self._heap, []
+        with self.lock:
+            for _, _, task, _ in pending:
+                task.cancelled = True
+                task.done.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def schedule(self, name, due, callback):
+        """Run callback(due) at monotonic time `due`; returns a ScheduledTask"""
+        task = ScheduledTask(name)
+        self._push(due, task, callback)
+        return task
+
+    def cancel(self, task):
+        """Cancel a task; once this returns its callback will not run again"""
+        if task is None:
+            return
+        with self.lock:
+            task.cancelled = True
+            task.done.set()
+
+    def _push(self, due, task, callback):
+        with self._heap_lock:
+            heapq.heappush(self._heap, (due, next(self._sequence), task, callback))
+            is_next = self._heap[0][2] is task
+        if is_next:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            # Clear before reading the heap: a push after the read sets it again
+            self._wakeup.clear()
+            with self._heap_lock:
+                if self._stopping:
+                    return
+                # Drop cancelled entries lazily
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    timeout = None
+                else:
+                    due = self._heap[0][0]
+                    timeout = due - time.monotonic()
+                    if timeout <= 0:
+                        _, _, task, callback = heapq.heappop(self._heap)
+                        timeout = 0
+
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+                continue
+
+            with self.lock:
+                if task.cancelled:
+                    continue
+                try:
+                    next_due = callback(due)
+                except Exception:
+                    logger.exception("LED task %s failed", task.name)
+                    next_due = None
+                if next_due is None:
+                    task.done.set()
+            if next_due is not None:
+                self._push(next_due, task, callback)
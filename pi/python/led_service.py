@@ -4,25 +4,32 @@ LED Service - Unified LED control for RemoteLED
 Provides a single, consistent interface for controlling GPIO LEDs across all implementations.
 """
 import time
-import threading
+import led_patterns as patterns
+from gpio_backend import GPIO_AVAILABLE, SimGPIOBackend, create_backend
+from led_patterns import PatternEngine
+from led_scheduler import LEDScheduler
+from logger import get_logger
 
-# Try to import RPi.GPIO, fail gracefully if not available
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-except ImportError:
-    GPIO_AVAILABLE = False
-    print("[LEDService] WARNING: RPi.GPIO not available - running in mock mode")
+logger = get_logger("led_service")
+
+if not GPIO_AVAILABLE:
+    logger.warning("RPi.GPIO not available - LEDs will use simulated pins")
 
 
 class LEDService:
     """
     Unified LED control service with non-blocking blink support.
 
+    Blinks and other patterns run on a single LED scheduler thread (see
+    led_patterns); every command cancels pending transitions and takes effect
+    immediately.
+
     Usage:
         led_service = LEDService()
         led_service.set_led("green", "on")
         led_service.blink("yellow", times=3)  # Non-blocking
+        led_service.blink("yellow", times=None)  # Until the next command
+        led_service.play_pattern({"type": "breathe", "color": "green"}, priority=1)
         led_service.stop_blink()              # Stop any ongoing blink
         led_service.turn_off_all()
     """
@@ -35,48 +42,45 @@ class LEDService:
         "red": 27      # Failed
     }
 
-    def __init__(self):
-        """Initialize GPIO pins and threading controls"""
-        # Threading controls for non-blocking blink
-        self._blink_thread = None
-        self._stop_blink_flag = threading.Event()
-        self._blink_lock = threading.Lock()
-        self._gpio_available = GPIO_AVAILABLE
-
-        if not GPIO_AVAILABLE:
-            print("[LEDService] Running in mock mode (no GPIO)")
-            return
+    def __init__(self, backend=None):
+        """
+        Initialize GPIO pins, the LED scheduler and the pattern engine.
 
+        Args:
+            backend: gpio_backend.GPIOBackend to drive; default is chosen by
+                LED_GPIO_BACKEND (RPi.GPIO if available, else simulated pins)
+        """
         try:
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setwarnings(False)
+            if backend is None:
+                backend = create_backend()
+            backend.setup(self.PINS.values())
+        except Exception as e:
+            logger.warning("GPIO setup failed, using simulated pins: %s", e)
+            backend = SimGPIOBackend()
+            backend.setup(self.PINS.values())
+        self._backend = backend
 
-            # Setup all LED pins as outputs, initially LOW
-            for color, pin in self.PINS.items():
-                GPIO.setup(pin, GPIO.OUT)
-                GPIO.output(pin, GPIO.LOW)
+        # All timed transitions run on one long-lived scheduler thread
+        self._scheduler = LEDScheduler()
+        self._scheduler.start()
+        self._engine = PatternEngine(self._scheduler, backend, self.PINS)
 
-            print(f"[LEDService] ✅ Initialized GPIO pins: {self.PINS}")
-        except Exception as e:
-            print(f"[LEDService] ⚠️ GPIO setup failed: {e}")
-            self._gpio_available = False
+        logger.info("Initialized LED pins", extra={"pins": self.PINS, "backend": backend.name})
+
+    @property
+    def backend(self):
+        """GPIO backend in use (SimGPIOBackend exposes the transition trace)"""
+        return self._backend
 
     def stop_blink(self):
         """
-        Stop any ongoing blink operation.
+        Stop any ongoing blink or pattern and switch its LEDs off.
         This is called automatically before any LED state change.
         """
-        # Signal the blink thread to stop
-        self._stop_blink_flag.set()
-
-        # Wait for the blink thread to finish (with timeout)
-        if self._blink_thread and self._blink_thread.is_alive():
-            self._blink_thread.join(timeout=1.0)
-            print("[LEDService] Stopped ongoing blink operation")
-
-        # Clear the flag for next use
-        self._stop_blink_flag.clear()
-        self._blink_thread = None
+        with self._scheduler.lock:
+            if self._engine.is_animating():
+                logger.debug("Stopped ongoing blink operation")
+            self._engine.stop()
 
     def set_led(self, color: str, state: str) -> bool:
         """
@@ -93,98 +97,44 @@ class LEDService:
         state = state.lower()
 
         if color not in self.PINS:
-            print(f"[LEDService] ERROR: Unknown color '{color}'")
+            logger.error("Unknown LED color %r", color)
             return False
 
-        # Stop any ongoing blink first
-        self.stop_blink()
-
-        pin = self.PINS[color]
-
-        if not self._gpio_available:
-            print(f"[LEDService] [MOCK] {color.upper()} LED {state.upper()}")
-            return True
-
-        if state == "on":
-            GPIO.output(pin, GPIO.HIGH)
-            print(f"[LEDService] {color.upper()} LED (GPIO {pin}) turned ON")
-        elif state == "off":
-            GPIO.output(pin, GPIO.LOW)
-            print(f"[LEDService] {color.upper()} LED (GPIO {pin}) turned OFF")
-        else:
-            print(f"[LEDService] ERROR: Unknown state '{state}'")
+        if state not in ("on", "off"):
+            logger.error("Unknown LED state %r", state)
             return False
 
+        with self._scheduler.lock:
+            # Stop any ongoing blink first
+            self.stop_blink()
+            self._engine.write(color, 1.0 if state == "on" else 0.0)
+        logger.debug("%s LED (GPIO %s) %s", color, self.PINS[color], state)
+
         return True
 
     def turn_off_all(self):
         """Turn off all LEDs and stop any blinking"""
-        # Stop any ongoing blink first
-        self.stop_blink()
-
-        if not self._gpio_available:
-            print("[LEDService] [MOCK] All LEDs OFF")
-            return
-
-        for color, pin in self.PINS.items():
-            GPIO.output(pin, GPIO.LOW)
-        print("[LEDService] All LEDs turned OFF")
-
-    def _blink_worker(self, color: str, times: int, interval: float):
-        """
-        Worker function for blinking LED in a separate thread.
-        Checks stop flag between each blink cycle.
-        """
-        if color not in self.PINS:
-            return
-
-        pin = self.PINS[color]
-
-        for i in range(times):
-            # Check if we should stop
-            if self._stop_blink_flag.is_set():
-                print(f"[LEDService] Blink interrupted at iteration {i}/{times}")
-                if self._gpio_available:
-                    GPIO.output(pin, GPIO.LOW)
-                return
-
-            if self._gpio_available:
-                GPIO.output(pin, GPIO.HIGH)
-            
-            # Use short sleep intervals to check stop flag more frequently
-            for _ in range(int(interval * 20)):  # Check every 50ms
-                if self._stop_blink_flag.is_set():
-                    if self._gpio_available:
-                        GPIO.output(pin, GPIO.LOW)
-                    print(f"[LEDService] Blink interrupted during ON phase")
-                    return
-                time.sleep(0.05)
-
-            if self._gpio_available:
-                GPIO.output(pin, GPIO.LOW)
-
-            # Check stop flag during OFF phase too
-            for _ in range(int(interval * 20)):
-                if self._stop_blink_flag.is_set():
-                    print(f"[LEDService] Blink interrupted during OFF phase")
-                    return
-                time.sleep(0.05)
-
-        print(f"[LEDService] {color.upper()} LED blink completed ({times} times)")
-
-    def blink(self, color: str, times: int = 3, interval: float = 0.3) -> bool:
+        with self._scheduler.lock:
+            # Stop any ongoing blink first
+            self.stop_blink()
+            for color in self.PINS:
+                self._engine.write(color, 0.0)
+        logger.debug("All LEDs off")
+
+    def blink(self, color: str, times: int = 3, interval: float = 0.3, duty: float = 0.5) -> bool:
         """
         Blink a specific LED (non-blocking).
-        
-        The blink runs in a background thread and can be interrupted by:
+
+        The blink runs on the LED scheduler thread and can be interrupted by:
         - Calling stop_blink()
         - Calling turn_off_all()
         - Starting a new LED operation (set_led, set_color_exclusive, etc.)
 
         Args:
             color: LED color ('green', 'yellow', 'red')
-            times: Number of blinks (default: 3)
+            times: Number of blinks (default: 3), None to blink until interrupted
             interval: Time between blinks in seconds (default: 0.3)
+            duty: Fraction of each period the LED is on (default: 0.5)
 
         Returns:
             bool: True if blink started successfully, False if invalid color
@@ -192,22 +142,20 @@ class LEDService:
         color = color.lower()
 
         if color not in self.PINS:
-            print(f"[LEDService] ERROR: Unknown color '{color}'")
+            logger.error("Unknown LED color %r", color)
             return False
 
-        # Stop any ongoing blink first
-        self.stop_blink()
-
-        pin = self.PINS[color]
-        print(f"[LEDService] {color.upper()} LED (GPIO {pin}) starting blink ({times} times, {interval}s interval)")
+        try:
+            pattern = patterns.blink(color, times=times, interval=interval, duty=duty)
+        except ValueError as e:
+            logger.error("Invalid blink: %s", e)
+            return False
 
-        # Start blink in a background thread
-        self._blink_thread = threading.Thread(
-            target=self._blink_worker,
-            args=(color, times, interval),
-            daemon=True
-        )
-        self._blink_thread.start()
+        with self._scheduler.lock:
+            # Stop any ongoing blink first
+            self.stop_blink()
+            self._engine.play(pattern)
+        logger.debug("%s LED (GPIO %s) starting blink (%s times, %ss interval)", color, self.PINS[color], times, interval)
 
         return True
 
@@ -215,6 +163,7 @@ class LEDService:
         """
         Blink a specific LED (blocking/synchronous version).
         Use this only when you specifically need blocking behavior.
+        Returns early if the blink is interrupted by another LED operation.
 
         Args:
             color: LED color ('green', 'yellow', 'red')
@@ -224,37 +173,43 @@ class LEDService:
         Returns:
             bool: True if successful, False if invalid color
         """
-        color = color.lower()
-
-        if color not in self.PINS:
-            print(f"[LEDService] ERROR: Unknown color '{color}'")
+        if not times:
+            return color.lower() in self.PINS
+        if not self.blink(color, times=times, interval=interval):
             return False
+        logger.debug("%s LED blinking %s times (sync)", color, times)
+        self._engine.wait()
+        return True
 
-        # Stop any ongoing blink first
-        self.stop_blink()
-
-        pin = self.PINS[color]
-        print(f"[LEDService] {color.upper()} LED blinking {times} times (sync)")
-
-        if not self._gpio_available:
-            # In mock mode, just sleep
-            for i in range(times):
-                if self._stop_blink_flag.is_set():
-                    return True
-                time.sleep(interval * 2)
-            return True
-
-        for i in range(times):
-            if self._stop_blink_flag.is_set():
-                GPIO.output(pin, GPIO.LOW)
-                return True
-            GPIO.output(pin, GPIO.HIGH)
-            time.sleep(interval)
-            GPIO.output(pin, GPIO.LOW)
-            time.sleep(interval)
+    def play_pattern(self, pattern, priority=None) -> bool:
+        """
+        Play a declarative pattern (non-blocking).
 
+        Unlike blink(), this does not stop other patterns: a pattern at the same
+        or a higher priority takes over, a lower one waits until the higher
+        ones finish or are stopped.
+
+        Args:
+            pattern: led_patterns.Pattern or a spec dict (see led_patterns.from_spec)
+            priority: Overrides the pattern's own priority
+
+        Returns:
+            bool: True if the pattern was accepted, False if it is invalid
+        """
+        try:
+            if isinstance(pattern, dict):
+                pattern = patterns.from_spec(pattern)
+            started = self._engine.play(pattern, priority)
+        except ValueError as e:
+            logger.error("Invalid LED pattern: %s", e)
+            return False
+        logger.debug("Pattern %s %s", pattern.name, "started" if started else "queued")
         return True
 
+    def stop_pattern(self, priority=None):
+        """Stop the pattern at `priority` (or all patterns); a lower one resumes"""
+        self._engine.stop(priority)
+
     def set_color_exclusive(self, color: str) -> bool:
         """
         Turn on a specific LED and turn off all others.
@@ -269,37 +224,28 @@ class LEDService:
         color = color.lower()
 
         if color not in self.PINS:
-            print(f"[LEDService] ERROR: Unknown color '{color}'")
+            logger.error("Unknown LED color %r", color)
             return False
 
-        # Stop any ongoing blink first
-        self.stop_blink()
-
-        pin = self.PINS[color]
-
-        if not self._gpio_available:
-            print(f"[LEDService] [MOCK] {color.upper()} LED ON (exclusive)")
-            return True
+        with self._scheduler.lock:
+            # Stop any ongoing blink first
+            self.stop_blink()
 
-        # Turn off all LEDs first
-        for c, p in self.PINS.items():
-            GPIO.output(p, GPIO.LOW)
-
-        # Turn on the requested LED
-        GPIO.output(pin, GPIO.HIGH)
-        print(f"[LEDService] {color.upper()} LED (GPIO {pin}) turned ON (exclusive)")
+            # Turn off all other LEDs, then turn on the requested one
+            for c in self.PINS:
+                if c != color:
+                    self._engine.write(c, 0.0)
+            self._engine.write(color, 1.0)
+        logger.debug("%s LED (GPIO %s) on (exclusive)", color, self.PINS[color])
 
         return True
 
     def cleanup(self):
-        """Clean up GPIO resources"""
-        self.stop_blink()
+        """Clean up GPIO resources and stop the scheduler thread"""
         self.turn_off_all()
-        if self._gpio_available:
-            GPIO.cleanup()
-            print("[LEDService] GPIO cleaned up")
-        else:
-            print("[LEDService] [MOCK] Cleanup complete")
+        self._scheduler.stop()
+        self._backend.cleanup()
+        logger.info("LED pins cleaned up", extra={"backend": self._backend.name})
 
     def get_pin(self, color: str) -> int:
         """
@@ -315,13 +261,15 @@ class LEDService:
 
     def is_blinking(self) -> bool:
         """Check if a blink operation is currently running"""
-        return self._blink_thread is not None and self._blink_thread.is_alive()
+        return self._engine.is_animating()
 
 
 # Example usage
 if __name__ == "__main__":
     import sys
+    from logger import setup_logging
 
+    setup_logging()
     led = LEDService()
 
     try:
@@ -342,7 +290,11 @@ if __name__ == "__main__":
         led.blink("red", times=5, interval=0.3)
         time.sleep(1)
 
-        print("\n4. Turning off all LEDs...")
+        print("\n4. Breathing green over the red blink (priority 1)...")
+        led.play_pattern({"type": "breathe", "color": "green", "period": 1.0, "repeat": 2}, priority=1)
+        time.sleep(2.5)
+
+        print("\n5. Turning off all LEDs...")
         led.turn_off_all()
         time.sleep(0.5)
 
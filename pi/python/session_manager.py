@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Session Manager - Pi-owned countdown for RUNNING sessions
+The Pi, not the phone, decides when a session ends: the deadline is kept on the
+monotonic clock, a background thread calls on_expire when it passes, and the
+session is saved to disk on every change so a code.py restart (start.sh loop)
+picks it up again. CLOCK_MONOTONIC keeps counting across process restarts but
+not across reboots, so a session found after a reboot is ended instead of
+trusting a wall clock the Pi may not have synced yet.
+
+Configuration (env):
+    SESSION_STATE_PATH   saved session (default ./data/session.json next to this script)
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from logger import get_logger
+
+logger = get_logger("session")
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'session.json')
+BOOT_ID_PATH = '/proc/sys/kernel/random/boot_id'
+
+
+def read_boot_id():
+    try:
+        with open(BOOT_ID_PATH) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+@dataclass
+class Session:
+    """One RUNNING session; `deadline` is on the monotonic clock of `boot_id`"""
+    order_id: str
+    color: str
+    duration: int           # seconds, including extensions
+    started_at: int         # epoch ms, for the kiosk countdown
+    deadline: float
+    boot_id: str = None
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+class SessionManager:
+    """
+    Owns the current session and its deadline.
+
+    on_expire(session) is called once from the manager thread when the
+    deadline passes; the caller confirms with expire(session), which ends the
+    session unless it was replaced or extended in the meantime.
+
+    Usage:
+        sessions = SessionManager(on_expire=lambda s: worker.submit(handle_expiry, s))
+        resumed, ended = sessions.restore()
+        sessions.start_thread()
+        sessions.start(order_id, "green", 300)
+        sessions.extend(60)
+        sessions.end()
+    """
+
+    def __init__(self, on_expire, path=None, clock=time.monotonic):
+        self.path = path or os.getenv('SESSION_STATE_PATH', DEFAULT_STATE_PATH)
+        self._on_expire = on_expire
+        self._clock = clock
+        self._boot_id = read_boot_id()
+        self._session = None
+        self._notified = None
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+
+    def current(self):
+        return self._session
+
+    def remaining(self, session=None):
+        """Seconds left in `session` (default: the current one), or None"""
+        session = session or self._session
+        if session is None:
+            return None
+        return max(0.0, session.deadline - self._clock())
+
+    def start(self, order_id, color, duration):
+        """Begin a session of `duration` seconds, replacing any current one"""
+        session = Session(
+            order_id=order_id,
+            color=color,
+            duration=int(duration),
+            started_at=int(time.time() * 1000),
+            deadline=self._clock() + duration,
+            boot_id=self._boot_id,
+        )
+        with self._cond:
+            self._session = session
+            self._save()
+            self._cond.notify()
+        logger.info("Session started", extra={"order_id": order_id, "duration": session.duration})
+        return session
+
+    def extend(self, seconds):
+        """Add `seconds` to the current session; returns it, or None if there is none"""
+        with self._cond:
+            session = self._session
+            if session is None:
+                return None
+            session.deadline = max(session.deadline, self._clock()) + seconds
+            session.duration += int(seconds)
+            self._notified = None
+            self._save()
+            self._cond.notify()
+        logger.info("Session extended", extra={"order_id": session.order_id, "seconds": seconds,
+                                               "remaining": round(self.remaining(session))})
+        return session
+
+    def end(self):
+        """End the current session (OFF/RESET); returns it, or None"""
+        with self._cond:
+            session, self._session = self._session, None
+            if session is not None:
+                self._save()
+                self._cond.notify()
+        return session
+
+    def expire(self, session):
+        """End `session` if it is still current and its time is really up"""
+        with self._cond:
+            if self._session is not session or session.deadline > self._clock():
+                return False
+            self._session = None
+            self._save()
+            self._cond.notify()
+        return True
+
+    def restore(self):
+        """
+        Load the saved session after a restart.
+
+        Returns (resumed, ended): the session that is still running, or the one
+        that ran out (or was cut off by a reboot) while code.py was down.
+        """
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable session file %s: %s", self.path, e)
+            return None, None
+        if not saved:
+            return None, None
+        try:
+            session = Session(**saved)
+        except TypeError as e:
+            logger.warning("Ignoring session file %s: %s", self.path, e)
+            return None, None
+
+        with self._cond:
+            if session.boot_id != self._boot_id or session.deadline <= self._clock():
+                self._session = None
+                self._save()
+                return None, session
+            self._session = session
+            self._cond.notify()
+        return session, None
+
+    def start_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="session-timer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    session = self._session
+                    if session is None or self._notified is session:
+                        self._cond.wait()
+                        continue
+                    remaining = session.deadline - self._clock()
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                        continue
+                    self._notified = session
+                    break
+            try:
+                self._on_expire(session)
+            except Exception:
+                logger.exception("Session expiry handler failed")
+
+    def _save(self):
+        # Called with the lock held; only on start/extend/end, so SD-card writes stay rare
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_file = self.path + '.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump(asdict(self._session) if self._session else {}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.path)
+        except OSError as e:
+            logger.warning("Could not save session: %s", e)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Startup Timer - How long code.py takes to get scannable and advertising
+Milestones are taken on CLOCK_BOOTTIME and reported relative to the process
+start (read from /proc/self/stat, so interpreter start-up and imports count)
+and to boot. The report is one log line plus a JSON document for tooling.
+"""
+import os
+import threading
+import time
+from logger import get_logger
+
+logger = get_logger("startup")
+
+
+def _boottime():
+    try:
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+    except (AttributeError, OSError):
+        return time.monotonic()
+
+
+def _process_start():
+    """Process start in CLOCK_BOOTTIME seconds, or now if /proc is unavailable"""
+    try:
+        with open('/proc/self/stat') as f:
+            stat = f.read()
+        # Field 22 (starttime); the command name in field 2 may contain spaces
+        ticks = int(stat.rsplit(')', 1)[1].split()[19])
+        return ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return _boottime()
+
+
+class StartupTimer:
+    """
+    Thread-safe milestone recorder.
+
+    Usage:
+        timer = StartupTimer()
+        timer.mark("qr")
+        timer.mark("advertising")
+        report = timer.report()     # logs and returns {"since_start_ms": {...}, ...}
+    """
+
+    def __init__(self):
+        self.process_start = _process_start()
+        self._marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name):
+        with self._lock:
+            self._marks.append((name, _boottime()))
+
+    def elapsed_ms(self, name):
+        for mark, at in self._marks:
+            if mark == name:
+                return round((at - self.process_start) * 1000, 1)
+        return None
+
+    def report(self):
+        with self._lock:
+            marks = sorted(self._marks, key=lambda item: item[1])
+        since_start = {name: round((at - self.process_start) * 1000, 1) for name, at in marks}
+        report = {
+            "since_start_ms": since_start,
+            "since_boot_ms": {name: round(at * 1000) for name, at in marks},
+            "process_start_after_boot_ms": round(self.process_start * 1000),
+        }
+        logger.info("Startup timing: %s", ", ".join(f"{name} {ms:.0f}ms" for name, ms in since_start.items()),
+                    extra={"since_start_ms": since_start})
+        return report
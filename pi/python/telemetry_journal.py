@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Telemetry Journal - Store-and-forward session events from the Pi
+Events (BLE commands, LED states, STARTED/DONE) are appended to a local SQLite
+journal in WAL mode and uploaded in gzip batches to
+POST {API_BASE_URL}/devices/{id}/telemetry/batch. Rows are deleted once the
+backend acknowledges them, so nothing is lost when the phone leaves or the
+network drops, and the journal stays bounded.
+
+Configuration (env):
+    TELEMETRY_JOURNAL_PATH      SQLite file (default ./data/telemetry.db next to this script)
+    TELEMETRY_JOURNAL_MAX_EVENTS  rows kept while offline; oldest INFO rows go first (default 5000)
+    TELEMETRY_UPLOAD_INTERVAL   seconds between uploads when idle (default 30)
+    TELEMETRY_UPLOAD_BATCH      events per request (default 100)
+"""
+import gzip
+import json
+import os
+import random
+import sqlite3
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from logger import get_logger
+
+logger = get_logger("telemetry")
+
+# Events that move an order; uploaded right away instead of on the next interval
+SESSION_EVENTS = ("STARTED", "DONE", "ERROR")
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'telemetry.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    client_event_id TEXT NOT NULL UNIQUE,
+    event TEXT NOT NULL,
+    order_id TEXT,
+    details TEXT,
+    occurred_at TEXT NOT NULL
+)
+"""
+
+
+class TelemetryJournal:
+    """
+    Append-only event journal in SQLite (WAL, synchronous=NORMAL).
+
+    Thread-safe: one connection guarded by a lock. When more than
+    `max_events` rows are waiting, the oldest INFO rows are dropped first,
+    then the oldest session events.
+    """
+
+    def __init__(self, path=None, max_events=None):
+        self.path = path or os.getenv('TELEMETRY_JOURNAL_PATH', DEFAULT_JOURNAL_PATH)
+        self.max_events = int(max_events or os.getenv('TELEMETRY_JOURNAL_MAX_EVENTS', '5000'))
+        self._lock = threading.Lock()
+        self._acked_since_compact = 0
+        self.stats = {'recorded': 0, 'acked': 0, 'evicted': 0}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # auto_vacuum only takes effect before the first table is created
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA journal_size_limit=1048576")
+        self._conn.execute(SCHEMA)
+        self._count = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        if self._count:
+            logger.info("Telemetry journal has %d unsent events", self._count)
+
+    def record(self, event, order_id=None, details=None):
+        """Append an event; returns its client_event_id"""
+        client_event_id = uuid.uuid4().hex
+        occurred_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO events (client_event_id, event, order_id, details, occurred_at) VALUES (?, ?, ?, ?, ?)",
+                (client_event_id, event, order_id, details, occurred_at)
+            )
+            self._count += 1
+            self.stats['recorded'] += 1
+            if self._count > self.max_events:
+                # Evict a tenth at a time so a long outage does not delete on every insert
+                self._evict(self._count - self.max_events + self.max_events // 10)
+        return client_event_id
+
+    def pending(self, limit):
+        """Oldest unacknowledged events, as dicts ready for the batch endpoint"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT client_event_id, event, order_id, details, occurred_at FROM events ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        events = []
+        for client_event_id, event, order_id, details, occurred_at in rows:
+            item = {'client_event_id': client_event_id, 'event': event, 'occurred_at': occurred_at}
+            if order_id:
+                item['order_id'] = order_id
+            if details:
+                item['details'] = details
+            events.append(item)
+        return events
+
+    def ack(self, client_event_ids):
+        """Delete acknowledged events and reclaim space every so often"""
+        if not client_event_ids:
+            return
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "DELETE FROM events WHERE client_event_id = ?",
+                [(client_event_id,) for client_event_id in client_event_ids]
+            )
+            removed = self._conn.total_changes - before
+            self._count -= removed
+            self.stats['acked'] += removed
+            self._acked_since_compact += removed
+            if self._count == 0 or self._acked_since_compact >= 500:
+                self._compact()
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        with self._lock:
+            self._compact()
+            self._conn.close()
+
+    def _evict(self, excess):
+        self._conn.execute(
+            "DELETE FROM events WHERE id IN ("
+            "SELECT id FROM events ORDER BY (event = 'INFO') DESC, id LIMIT ?)",
+            (excess,)
+        )
+        self._count -= excess
+        self.stats['evicted'] += excess
+        logger.warning("Telemetry journal full, dropped %d oldest events", excess)
+
+    def _compact(self):
+        self._acked_since_compact = 0
+        try:
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            logger.debug("Journal compaction skipped: %s", e)
+
+
+class _RetryableUploadError(Exception):
+    pass
+
+
+class TelemetryUploader:
+    """
+    Uploads the journal from a background thread.
+
+    Idle uploads run every `interval` seconds and notify() triggers one early
+    (used for STARTED/DONE). Network errors, timeouts, 5xx and 429 back off
+    exponentially with jitter, up to `max_backoff`. Batches the backend
+    rejects as malformed (400/422) are dropped so they cannot block the
+    journal; a 413 halves the batch size.
+    """
+
+    def __init__(self, journal, api_base_url, device_id, batch_size=None, interval=None,
+                 timeout=10.0, max_backoff=300.0):
+        self.journal = journal
+        self.url = f"{api_base_url.rstrip('/')}/devices/{device_id}/telemetry/batch"
+        self.batch_size = int(batch_size or os.getenv('TELEMETRY_UPLOAD_BATCH', '100'))
+        self.interval = float(interval or os.getenv('TELEMETRY_UPLOAD_INTERVAL', '30'))
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self._wake = threading.Event()
+        self._stopping = False
+        self._failures = 0
+        self._thread = None
+        self.stats = {'batches': 0, 'uploaded': 0, 'dropped': 0, 'failures': 0}
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="telemetry-uploader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self):
+        """Upload soon (ignored while backing off after failures)"""
+        if not self._failures:
+            self._wake.set()
+
+    def upload_pending(self):
+        """Send batches until the journal is empty; raises _RetryableUploadError on transient failure"""
+        while not self._stopping:
+            batch = self.journal.pending(self.batch_size)
+            if not batch:
+                return
+            status, body = self._post(batch)
+            ids = [event['client_event_id'] for event in batch]
+            if status == 200:
+                self.journal.ack(body.get('acked', ids))
+                self.stats['batches'] += 1
+                self.stats['uploaded'] += body.get('accepted', 0)
+            elif status == 413 and self.batch_size > 1:
+                self.batch_size = max(1, self.batch_size // 2)
+                logger.warning("Telemetry batch too large, batch size now %d", self.batch_size)
+                continue
+            elif status in (400, 413, 415, 422):
+                logger.error("Telemetry batch rejected (%s), dropping %d events: %s", status, len(batch), body)
+                self.journal.ack(ids)
+                self.stats['dropped'] += len(batch)
+            else:
+                raise _RetryableUploadError(f"HTTP {status}")
+            if len(batch) < self.batch_size:
+                return
+
+    def _post(self, batch):
+        data = gzip.compress(json.dumps({'events': batch}, separators=(',', ':')).encode('utf-8'))
+        request = urllib.request.Request(self.url, data=data, method='POST', headers={
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip',
+        })
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b'{}')
+        except urllib.error.HTTPError as e:
+            try:
+                detail = json.loads(e.read() or b'{}')
+            except ValueError:
+                detail = {}
+            return e.code, detail
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise _RetryableUploadError(str(e))
+
+    def _run(self):
+        delay = 0
+        while True:
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                self.upload_pending()
+                if self._failures:
+                    logger.info("Telemetry upload recovered after %d failures", self._failures)
+                self._failures = 0
+                delay = self.interval
+            except _RetryableUploadError as e:
+                self._failures += 1
+                self.stats['failures'] += 1
+                backoff = min(self.max_backoff, 2 ** self._failures)
+                delay = backoff * random.uniform(0.5, 1.0)
+                logger.warning("Telemetry upload failed (%s), %d events queued, retry in %.0fs",
+                               e, len(self.journal), delay)
+            except Exception:
+                logger.exception("Telemetry upload crashed")
+                delay = self.interval